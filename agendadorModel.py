@@ -0,0 +1,104 @@
+import threading
+import time
+
+# Cadência de cada coletor: (intervalo mínimo, inicial, máximo) em segundos
+CADENCIAS_PADRAO = {
+    "cpu": (1.0, 2.0, 10.0),
+    "memoria": (1.0, 5.0, 30.0),
+    "io": (1.0, 2.0, 10.0),           # taxas de disco e rede
+    "processos": (2.0, 5.0, 60.0),
+    "recursos": (5.0, 10.0, 300.0),   # inventário de FDs e sockets (o mais caro)
+}
+ORCAMENTO_CPU = 0.05     # fração de um núcleo que os coletores podem consumir juntos
+LIMIAR_RAPIDO = 5.0      # variação (pontos percentuais) acima da qual o coletor acelera
+LIMIAR_LENTO = 1.0       # ... e abaixo da qual relaxa
+FATOR_ACELERAR = 0.5
+FATOR_RELAXAR = 1.25
+PESO_MEDIA = 0.3         # média móvel exponencial do custo por ciclo
+
+
+# MARK: Estado de um coletor
+
+class Cadencia:
+    """Intervalo atual de um coletor e o custo médio (CPU da thread) de cada ciclo."""
+
+    def __init__(self, minimo, inicial, maximo):
+        self.minimo = minimo
+        self.maximo = maximo
+        self.intervalo = inicial
+        self.custo_s = 0.0
+        self.ciclos = 0
+
+    def participacao(self):
+        """Fração de um núcleo consumida no intervalo atual."""
+        return self.custo_s / self.intervalo
+
+
+# MARK: Agendador
+
+class AgendadorAdaptativo:
+    """
+    Dá a cada coletor a própria cadência. Depois de cada ciclo o coletor informa o custo (CPU da
+    thread) e quanto os valores variaram: variação alta acelera, variação baixa relaxa. Se a soma
+    custo/intervalo de todos passar do orçamento de CPU, o coletor de maior participação recua até
+    caber, de modo que os caros (FDs, sockets) desaceleram antes dos baratos.
+    """
+
+    def __init__(self, cadencias=CADENCIAS_PADRAO, orcamento=ORCAMENTO_CPU):
+        self.orcamento = orcamento
+        self._lock = threading.Lock()
+        self.coletores = {nome: Cadencia(*limites) for nome, limites in cadencias.items()}
+
+    def concluir(self, nome, custo_s, variacao=None):
+        """Registra um ciclo e devolve o próximo intervalo do coletor."""
+        with self._lock:
+            c = self.coletores[nome]
+            c.custo_s = custo_s if c.ciclos == 0 else (1 - PESO_MEDIA) * c.custo_s + PESO_MEDIA * custo_s
+            c.ciclos += 1
+
+            if variacao is not None:
+                if variacao >= LIMIAR_RAPIDO:
+                    c.intervalo *= FATOR_ACELERAR
+                elif variacao <= LIMIAR_LENTO:
+                    c.intervalo *= FATOR_RELAXAR
+            c.intervalo = min(max(c.intervalo, c.minimo), c.maximo)
+
+            # orçamento: se estourou e este é o mais caro, recua o suficiente para caber
+            total = sum(o.participacao() for o in self.coletores.values())
+            if total > self.orcamento and c is max(self.coletores.values(), key=Cadencia.participacao):
+                restante = self.orcamento - (total - c.participacao())
+                c.intervalo = c.maximo if restante <= 0 else min(max(c.custo_s / restante, c.intervalo), c.maximo)
+
+            return c.intervalo
+
+    def intervalo(self, nome):
+        with self._lock:
+            return self.coletores[nome].intervalo
+
+    def resumo(self):
+        """{nome: {"intervalo_s", "custo_ms", "participacao"}} mais a participação total."""
+        with self._lock:
+            coletores = {
+                nome: {"intervalo_s": round(c.intervalo, 2), "custo_ms": round(c.custo_s * 1000, 2),
+                       "participacao": round(c.participacao(), 4)}
+                for nome, c in self.coletores.items()
+            }
+            return {"coletores": coletores, "orcamento": self.orcamento,
+                    "participacao_total": round(sum(c.participacao() for c in self.coletores.values()), 4)}
+
+
+def executar_periodicamente(agendador, nome, ciclo):
+
+    """
+    Laço de um coletor: roda `ciclo()` (que informa custo e variação com agendador.concluir)
+    e dorme o intervalo decidido pelo agendador, descontado do tempo que o ciclo levou.
+    Um erro num ciclo é registrado e o laço continua: a thread do coletor não pode morrer.
+    """
+
+    while True:
+        inicio = time.monotonic()
+        try:
+            ciclo()
+        except Exception as e:
+            print(f"Erro no coletor '{nome}': {e!r}")
+        time.sleep(max(0.0, agendador.intervalo(nome) - (time.monotonic() - inicio)))
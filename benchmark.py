@@ -0,0 +1,203 @@
+# Benchmark da coleta de processos: tempo de ciclo x número de trabalhadores e,
+# com --suite, cada etapa do ciclo sobre procfs sintéticos de 1k, 10k e 100k processos
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import processModel
+import procfsModel
+from procfsFalso import gerar_procfs
+
+BASE_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_base.json")
+ESCALAS_PADRAO = (1000, 10000, 100000)
+TOLERANCIA_PADRAO = 0.25   # mais de 25% acima da base conta como regressão
+LEITURAS_REFERENCIA = 20000 # tamanho da carga de referência que normaliza os tempos
+DIFERENCA_MINIMA = 0.02     # em unidades da referência (~2 ms): abaixo disso é ruído, não regressão
+
+
+# MARK: Mede o ciclo completo de coleta para uma configuração
+
+def medir_ciclo(trabalhadores, modo, repeticoes):
+    """Roda `repeticoes` ciclos (após um de aquecimento) e retorna as durações em segundos."""
+    # inclui o inventário de FDs em todos os PIDs, a etapa que mais se beneficia das faixas paralelas
+    processModel.coletar_snapshot_processos(trabalhadores, modo, varrer_recursos=True) # aquecimento: popula o cache de FDs e os pools
+    duracoes = []
+    for _ in range(repeticoes):
+        snapshot = processModel.coletar_snapshot_processos(trabalhadores, modo, varrer_recursos=True)
+        duracoes.append(snapshot["duracao_ciclo_s"])
+    return duracoes
+
+
+def escala_trabalhadores(maximo):
+    """1, 2, 4, ... até `maximo` (inclusive)."""
+    valores = []
+    n = 1
+    while n < maximo:
+        valores.append(n)
+        n *= 2
+    valores.append(maximo)
+    return valores
+
+
+# MARK: Tabela de escalabilidade
+
+def benchmark_paralelismo(maximo, modos, repeticoes):
+    print(f"{'modo':<10} {'trab.':>5} {'mediana (ms)':>13} {'min (ms)':>9} {'speedup':>8}")
+    for modo in modos:
+        base = None
+        for trabalhadores in escala_trabalhadores(maximo):
+            duracoes = medir_ciclo(trabalhadores, modo, repeticoes)
+            mediana = statistics.median(duracoes)
+            base = base or mediana
+            print(f"{modo:<10} {trabalhadores:>5} {mediana * 1000:>13.1f} {min(duracoes) * 1000:>9.1f} {base / mediana:>7.2f}x")
+
+
+# MARK: Suíte por etapa sobre procfs sintético
+
+def _cronometrar(funcao, repeticoes):
+    """Menor tempo de `repeticoes` execuções (após uma de aquecimento) e o último resultado; o mínimo
+    oscila bem menos que a mediana entre execuções da suíte, o que importa ao comparar com a base.
+    O coletor de lixo fica desligado durante as medidas (como no timeit): as pausas dele dependem
+    do que o processo alocou antes, não da etapa medida."""
+    resultado = funcao()
+    duracoes = []
+    gc_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeticoes):
+            gc.collect()
+            inicio = time.perf_counter()
+            resultado = funcao()
+            duracoes.append(time.perf_counter() - inicio)
+    finally:
+        if gc_ativo:
+            gc.enable()
+    return min(duracoes), resultado
+
+
+def medir_etapas(processos, fds, sockets, repeticoes, diretorio):
+    """Menor tempo (s) de cada etapa da coleta e do ciclo completo de atualizar_processos."""
+    import dashController # importa tkinter/view; só necessário para o ciclo completo
+
+    raiz = gerar_procfs(os.path.join(diretorio, f"procfs-{processos}-{fds}-{sockets}"), processos, fds, sockets)
+    procfsModel.definir_raiz_proc(raiz)
+    # estado entre ciclos de outra escala não pode contaminar a medição
+    processModel.podar_cache_fds(set())
+    processModel.previo_processo_CPU.podar(set())
+
+    etapas = {}
+    etapas["sockets"], info_sockets = _cronometrar(processModel._ler_info_sockets_rede_global, repeticoes)
+    etapas["listar"], pids = _cronometrar(processModel.processosTodos, repeticoes)
+    etapas["basico"], (linhas, _) = _cronometrar(lambda: processModel._ler_basico_faixa(pids), repeticoes)
+    etapas["recursos"], (recursos, _) = _cronometrar(lambda: processModel._ler_recursos_faixa(linhas, info_sockets), repeticoes)
+
+    def montar_tabela():
+        tabela = processModel.TabelaProcessos()
+        for (pid, status, tempo_cpu, paginas), rec in zip(linhas, recursos):
+            tabela.adicionar(pid, status, tempo_cpu, paginas, rec)
+        tabela.calcular_uso_cpu(processModel.previo_processo_CPU, processModel.delta_cpu_total)
+        return tabela.para_dicionario(tabela.ordem_por_cpu(dashController.LIMITE_PROCESSOS))
+
+    etapas["tabela"], _ = _cronometrar(montar_tabela, repeticoes)
+    etapas["ciclo"], _ = _cronometrar(dashController.ciclo_processos, repeticoes)
+    return etapas
+
+
+def medir_referencia(diretorio, repeticoes):
+    """
+    Tempo (s) de uma carga fixa parecida com a coleta: abrir, ler e interpretar um arquivo pequeno
+    e montar um dicionário, LEITURAS_REFERENCIA vezes. A base guarda as etapas em múltiplos dessa
+    referência, então ela vale entre máquinas mais rápidas ou mais lentas.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    caminho = os.path.join(diretorio, "referencia")
+    with open(caminho, "w") as f:
+        f.write("1 (referencia) S " + " ".join(str(n * 7919) for n in range(50)) + "\n")
+
+    def carga():
+        for _ in range(LEITURAS_REFERENCIA):
+            fd = os.open(caminho, os.O_RDONLY)
+            try:
+                campos = os.read(fd, 4096).split()
+            finally:
+                os.close(fd)
+            {"utime": int(campos[13]), "stime": int(campos[14]), "starttime": int(campos[21])}
+
+    return _cronometrar(carga, repeticoes)[0]
+
+
+def comparar_com_base(resultados, base, tolerancia):
+    """Lista de (escala, etapa, base, atual) que passaram de base * (1 + tolerancia) (em unidades da referência)."""
+    regressoes = []
+    for escala, etapas in resultados.items():
+        for etapa, atual in etapas.items():
+            anterior = base.get("resultados", {}).get(escala, {}).get(etapa)
+            if anterior and atual > anterior * (1 + tolerancia) and atual - anterior > DIFERENCA_MINIMA:
+                regressoes.append((escala, etapa, anterior, atual))
+    return regressoes
+
+
+def benchmark_suite(escalas, fds, sockets, repeticoes, diretorio, caminho_base, salvar_base, tolerancia):
+    referencia = medir_referencia(diretorio, repeticoes)
+    print(f"referência: {referencia * 1000:.1f} ms")
+    resultados = {}
+    print(f"{'processos':>9} " + " ".join(f"{etapa:>10}" for etapa in ("sockets", "listar", "basico", "recursos", "tabela", "ciclo")) + "   (ms)")
+    for processos in escalas:
+        etapas = medir_etapas(processos, fds, sockets, repeticoes, diretorio)
+        print(f"{processos:>9} " + " ".join(f"{duracao * 1000:>10.1f}" for duracao in etapas.values()))
+        # a base guarda múltiplos da referência, não segundos desta máquina
+        resultados[str(processos)] = {etapa: duracao / referencia for etapa, duracao in etapas.items()}
+
+    if salvar_base:
+        with open(caminho_base, "w") as f:
+            json.dump({"python": platform.python_version(), "unidade": "referencia",
+                       "fds": fds, "sockets": sockets, "resultados": resultados}, f, indent=2)
+        print(f"Base gravada em {caminho_base}")
+        return 0
+
+    try:
+        with open(caminho_base) as f:
+            base = json.load(f)
+    except FileNotFoundError:
+        print(f"Sem base em {caminho_base}; rode com --salvar-base para criar uma.")
+        return 0
+    if base.get("unidade") != "referencia":
+        print(f"Base em {caminho_base} tem tempos absolutos de outra máquina; regrave-a com --salvar-base.")
+        return 0
+
+    regressoes = comparar_com_base(resultados, base, tolerancia)
+    for escala, etapa, anterior, atual in regressoes:
+        print(f"REGRESSÃO {etapa} @ {escala}: {anterior:.2f} -> {atual:.2f} × referência ({atual / anterior - 1:+.0%})")
+    if not regressoes:
+        print(f"Sem regressões (tolerância {tolerancia:.0%})")
+    return 1 if regressoes else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Escalabilidade da coleta de /proc por número de trabalhadores")
+    parser.add_argument("--max-trabalhadores", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--modos", nargs="+", default=["threads", "processos"], choices=["threads", "processos"])
+    parser.add_argument("--repeticoes", type=int, help="padrão: 5 (paralelismo) ou 3 (suíte)")
+    parser.add_argument("--suite", action="store_true",
+                        help="mede cada etapa do ciclo sobre procfs sintéticos e compara com a base gravada")
+    parser.add_argument("--escalas", type=int, nargs="+", default=list(ESCALAS_PADRAO), help="processos por procfs sintético")
+    parser.add_argument("--fds", type=int, default=8, help="FDs por processo no procfs sintético")
+    parser.add_argument("--sockets", type=int, default=1024)
+    parser.add_argument("--dir-procfs", default=os.path.join(tempfile.gettempdir(), "dashboard-so-bench"),
+                        help="onde os procfs sintéticos são gerados (e reaproveitados)")
+    parser.add_argument("--base", default=BASE_PADRAO)
+    parser.add_argument("--salvar-base", action="store_true", help="grava os resultados como nova base")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO)
+    args = parser.parse_args()
+
+    if args.suite:
+        sys.exit(benchmark_suite(args.escalas, args.fds, args.sockets, args.repeticoes or 3,
+                                 args.dir_procfs, args.base, args.salvar_base, args.tolerancia))
+    benchmark_paralelismo(args.max_trabalhadores, args.modos, args.repeticoes or 5)
@@ -0,0 +1,241 @@
+import errno
+import grp
+import json
+import os
+import socket
+import stat
+import struct
+import threading
+import time
+import zlib
+
+# Caminho padrão do socket do coletor (um por usuário). Sem XDG_RUNTIME_DIR ele fica num
+# diretório 0700 do usuário em /tmp, que outro usuário não consegue criar antes nem trocar.
+_DIRETORIO_PRIVADO = os.path.join("/tmp", f"dashboard-so-{os.getuid()}")
+CAMINHO_SOCKET_PADRAO = os.environ.get(
+    "DASHBOARD_SOCKET",
+    os.path.join(os.environ["XDG_RUNTIME_DIR"], f"dashboard-so-{os.getuid()}.sock")
+    if os.environ.get("XDG_RUNTIME_DIR") else os.path.join(_DIRETORIO_PRIVADO, "coletor.sock")
+)
+
+# Socket do coletor compartilhado entre usuários (`--coletor --grupo GRUPO`): legível pelo grupo.
+# Os visualizadores procuram nele quando não há coletor no socket do próprio usuário.
+CAMINHO_SOCKET_COMPARTILHADO = os.environ.get("DASHBOARD_SOCKET_COMPARTILHADO", "/run/dashboard-so/coletor.sock")
+
+# Quadro binário: magic, versão do protocolo, flags, versão do snapshot, instante (epoch), tamanho do payload
+_CABECALHO = struct.Struct("!4sBBQdI")
+_MAGIC = b"DSOS"
+_PROTOCOLO = 1
+_FLAG_ZLIB = 0x1
+
+
+# MARK: Verificação do caminho do socket
+
+def _preparar_diretorio_privado(diretorio):
+    """Cria (0700) ou confere o diretório privado: tem de ser um diretório de verdade, do usuário, fechado aos outros."""
+    try:
+        os.mkdir(diretorio, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(diretorio)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(errno.EPERM, "diretório do socket não pertence ao usuário ou está aberto a outros", diretorio)
+
+
+def _dono_confiavel(caminho):
+    """
+    Num diretório em que outros usuários podem escrever (ex.: /tmp), só confia num socket do
+    próprio usuário ou do root; senão qualquer um poderia ter criado o socket antes.
+    """
+    st_dir = os.stat(os.path.dirname(caminho) or ".")
+    if not st_dir.st_mode & stat.S_IWOTH:
+        return True
+    return os.lstat(caminho).st_uid in (os.getuid(), 0)
+
+
+def _coletor_ativo(caminho):
+    """True se um coletor responde em `caminho`; False se o socket é órfão (ECONNREFUSED) ou não existe."""
+    conexao = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conexao.connect(caminho)
+        return True
+    except (ConnectionRefusedError, FileNotFoundError):
+        return False
+    finally:
+        conexao.close()
+
+
+# MARK: Codificação dos quadros
+
+def codificar_quadro(versao, snapshot):
+    """Serializa o snapshot uma única vez (JSON compacto + zlib) com o cabeçalho binário."""
+    payload = zlib.compress(json.dumps(snapshot, separators=(",", ":")).encode(), 1)
+    return _CABECALHO.pack(_MAGIC, _PROTOCOLO, _FLAG_ZLIB, versao, time.time(), len(payload)) + payload
+
+
+def _receber_exato(conexao, tamanho):
+    # aceita socket (recv) ou arquivo aberto em modo binário (read), para reaproveitar o formato em capturas
+    receber = conexao.recv if hasattr(conexao, "recv") else conexao.read
+    partes = []
+    while tamanho:
+        bloco = receber(min(tamanho, 1 << 20))
+        if not bloco:
+            raise ConnectionError("coletor encerrou a conexão")
+        partes.append(bloco)
+        tamanho -= len(bloco)
+    return b"".join(partes)
+
+
+def ler_quadro(conexao):
+    """Lê um quadro do socket (ou arquivo de captura) e devolve (versao, instante, snapshot)."""
+    magic, protocolo, flags, versao, instante, tamanho = _CABECALHO.unpack(_receber_exato(conexao, _CABECALHO.size))
+    if magic != _MAGIC or protocolo != _PROTOCOLO:
+        raise ValueError("quadro inválido ou protocolo incompatível")
+    payload = _receber_exato(conexao, tamanho)
+    if flags & _FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    return versao, instante, json.loads(payload)
+
+
+# MARK: Publicador (lado do coletor headless)
+
+class _Assinante:
+    """Uma conexão de cliente; guarda só o quadro mais recente, então cliente lento perde quadros em vez de atrasar o coletor."""
+
+    def __init__(self, conexao, publicador):
+        self.conexao = conexao
+        self.publicador = publicador
+        threading.Thread(target=self._enviar, daemon=True).start()
+
+    def _enviar(self):
+        enviado = 0
+        try:
+            while True:
+                versao, quadro = self.publicador.aguardar_versao(enviado)
+                self.conexao.sendall(quadro)
+                enviado = versao
+        except OSError:
+            pass
+        finally:
+            self.publicador.remover(self)
+            self.conexao.close()
+
+
+class PublicadorSnapshots:
+    """
+    Servidor em socket Unix que distribui snapshots versionados a qualquer número de clientes.
+    Cada versão é codificada uma única vez; dez visualizadores custam quase o mesmo que um.
+    Sem `grupo` o socket é 0600 (só o próprio usuário); com `grupo` ele é 0660 e pertence ao
+    grupo, para que operadores com usuários diferentes assinem o mesmo coletor.
+    """
+
+    def __init__(self, caminho=CAMINHO_SOCKET_PADRAO, grupo=None):
+        self.caminho = caminho
+        self.versao = 0
+        self.quadro = None
+        self.assinantes = set()
+        self._condicao = threading.Condition()
+
+        gid = grp.getgrnam(grupo).gr_gid if grupo else None # KeyError se o grupo não existe
+        diretorio = os.path.dirname(caminho)
+        if diretorio == _DIRETORIO_PRIVADO:
+            _preparar_diretorio_privado(diretorio)
+        elif gid is not None and not os.path.isdir(diretorio):
+            os.makedirs(diretorio)
+            os.chown(diretorio, -1, gid)
+            os.chmod(diretorio, 0o750) # o grupo precisa atravessar o diretório para conectar
+
+        if os.path.lexists(caminho):
+            # só remove um socket órfão; um coletor que responde continua dono do caminho
+            if _coletor_ativo(caminho):
+                raise OSError(errno.EADDRINUSE, "já existe um coletor ativo neste socket", caminho)
+            if not _dono_confiavel(caminho):
+                raise PermissionError(errno.EPERM, "socket existente pertence a outro usuário", caminho)
+            os.unlink(caminho) # socket órfão de uma execução anterior
+        self.servidor = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.servidor.bind(caminho)
+        if gid is None:
+            os.chmod(caminho, 0o600) # os dados de processos só ficam visíveis para o próprio usuário
+        else:
+            os.chown(caminho, -1, gid)
+            os.chmod(caminho, 0o660) # conectar a um socket Unix exige permissão de escrita
+        self.servidor.listen(16)
+        threading.Thread(target=self._aceitar, daemon=True).start()
+
+    def _aceitar(self):
+        while True:
+            try:
+                conexao, _ = self.servidor.accept()
+            except OSError:
+                return
+            with self._condicao:
+                self.assinantes.add(_Assinante(conexao, self))
+
+    def remover(self, assinante):
+        with self._condicao:
+            self.assinantes.discard(assinante)
+
+    def publicar(self, snapshot):
+        quadro = codificar_quadro(self.versao + 1, snapshot)
+        with self._condicao:
+            self.versao += 1
+            self.quadro = quadro
+            self._condicao.notify_all()
+        return self.versao
+
+    def aguardar_versao(self, ultima):
+        """Bloqueia até existir uma versão mais nova que `ultima`; devolve (versao, quadro)."""
+        with self._condicao:
+            self._condicao.wait_for(lambda: self.versao > ultima)
+            return self.versao, self.quadro
+
+    def fechar(self):
+        self.servidor.close()
+        if os.path.exists(self.caminho):
+            os.unlink(self.caminho)
+
+
+# MARK: Assinatura (lado do visualizador)
+
+def conectar(caminho=CAMINHO_SOCKET_PADRAO):
+    """Tenta conectar ao coletor; devolve o socket ou None se não houver coletor ativo (ou confiável)."""
+    try:
+        if not _dono_confiavel(caminho):
+            print(f"Ignorando {caminho}: socket de outro usuário num diretório compartilhado.")
+            return None
+    except OSError:
+        return None # caminho (ou diretório) inexistente: não há coletor
+    conexao = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conexao.connect(caminho)
+    except OSError:
+        conexao.close()
+        return None
+    return conexao
+
+
+def conectar_algum(caminhos):
+    """Tenta cada caminho em ordem (ex.: o socket do usuário e depois o compartilhado); devolve (caminho, socket) ou (None, None)."""
+    for caminho in dict.fromkeys(caminhos): # sem repetir, na ordem
+        conexao = conectar(caminho)
+        if conexao:
+            return caminho, conexao
+    return None, None
+
+
+def assinar(conexao, ao_receber, ao_desconectar=None):
+    """Lê quadros numa thread daemon e chama ao_receber(snapshot) para cada versão recebida."""
+
+    def _ler():
+        try:
+            while True:
+                _, _, snapshot = ler_quadro(conexao)
+                ao_receber(snapshot)
+        except (OSError, ValueError, zlib.error) as e:
+            print(f"Conexão com o coletor perdida: {e}")
+        finally:
+            conexao.close()
+            if ao_desconectar:
+                ao_desconectar()
+
+    threading.Thread(target=_ler, daemon=True).start()
@@ -1,42 +1,129 @@
 import time
+import threading
 
-# MARK: Função para ler o uso da CPU do sistema 
+import procfsModel
 
-def lerUsoCpu():
+# Estados de tempo da CPU na ordem das colunas de /proc/stat
+ESTADOS_CPU = ("user", "nice", "system", "idle", "iowait", "irq", "softirq", "steal")
 
+# Amostrador compartilhado de /proc/stat: a leitura recente é compartilhada, mas cada consumidor
+# guarda a própria amostra anterior (em vez de dormir entre duas leituras), então a janela do delta
+# de um não encolhe quando outro relê o arquivo
+lock_amostra = threading.Lock()
+_leitura_recente = None
+_por_consumidor = {} # consumidor -> (leitura usada, resultado calculado)
+
+
+# MARK: Leitura única de /proc/stat
+
+def lerProcStat():
+
+    '''
+     Lê /proc/stat uma única vez e devolve:
+       "cpus": {"cpu": [jiffies...], "cpu0": [...], ...}  (linha agregada + uma por núcleo)
+       "contadores": {"ctxt": n, "processes": n, "procs_running": n, "procs_blocked": n, ...}
     '''
-     'proc' arquivos de interface do kernel
-     /proc/stat arquivo com estatísticas sobre o uso da CPU
-     usoCPU = 100% - tempo_ocioso / tempo_total
 
+    cpus = {}
+    contadores = {}
+
+    with open(procfsModel.caminho_proc("stat"), "r") as l:
+        for linha in l:
+            partes = linha.split()
+            if not partes:
+                continue
+            if partes[0].startswith("cpu"):
+                cpus[partes[0]] = list(map(int, partes[1:]))
+            elif len(partes) == 2:
+                contadores[partes[0]] = int(partes[1])
+
+    return {"instante": time.monotonic(), "cpus": cpus, "contadores": contadores}
+
+
+def _detalhar_uso(valores1, valores2):
+
+    '''Calcula uso, ociosidade e a divisão por estado (user, nice, system, ...) entre duas leituras da mesma linha cpu/cpuN'''
+
+    # guest/guest_nice já estão contabilizados em user/nice; só os 8 primeiros campos entram no total
+    deltas = [b - a for a, b in zip(valores1[:8], valores2[:8])]
+    tempoDiff = sum(deltas)
+
+    if tempoDiff <= 0:
+        return {"uso": 0.0, "ocioso": 100.0, **{estado: 0.0 for estado in ESTADOS_CPU}}
+
+    detalhes = {
+        estado: round(100 * delta / tempoDiff, 2)
+        for estado, delta in zip(ESTADOS_CPU, deltas)
+    }
+
+    idleDiff = deltas[3] ##idle -> tempo de ociosidade da CPU
+
+    usoCpu = 100 * ((tempoDiff - idleDiff) / tempoDiff)
+    detalhes["uso"] = round(usoCpu, 2)
+    detalhes["ocioso"] = round(100 * (idleDiff / tempoDiff), 2)
+    return detalhes
+
+
+# MARK: Amostrador compartilhado
+
+def amostrarCpu(idade_maxima=0.0, consumidor="cpu"):
+
+    '''
+     Lê /proc/stat (no máximo uma vez a cada `idade_maxima` segundos, leitura compartilhada entre
+     consumidores) e calcula, contra a amostra anterior do mesmo `consumidor`, o uso agregado e por
+     núcleo dividido por estado. Não bloqueia: na primeira chamada o delta é desde o boot.
     '''
 
-    with open("/proc/stat", "r") as l:
-        linha = l.readline() 
-        partes1 = linha.split()[1:]
-        valores1 = list(map(int, partes1))
-        
-    time.sleep(1) #bloqueante
+    global _leitura_recente
+
+    with lock_amostra:
+        if _leitura_recente is None or time.monotonic() - _leitura_recente["instante"] >= idade_maxima:
+            _leitura_recente = lerProcStat()
+        nova = _leitura_recente
 
-    with open("/proc/stat", "r") as l:
-        linha = l.readline()
-        partes2 = linha.split()[1:]
-        valores2 = list(map(int, partes2))
+        anterior, resultado = _por_consumidor.get(consumidor, (None, None))
+        if anterior is nova:
+            return resultado
 
-    tempo1 = sum(valores1) #soma de todos os tempos registrados
-    tempo2 = sum(valores2)
+        resultado = {
+            "instante": nova["instante"],
+            "jiffies_total": sum(nova["cpus"]["cpu"][:8]),
+            "contadores": nova["contadores"],
+            "intervalo": nova["instante"] - anterior["instante"] if anterior else 0.0,
+        }
 
-    tempoOcioso1 = valores1[3]
-    tempoOcioso2 = valores2[3]
+        # "processes" conta os forks desde o boot: a diferença entre amostras dá a taxa
+        resultado["forks_por_s"] = (
+            round((nova["contadores"].get("processes", 0) - anterior["contadores"].get("processes", 0)) / resultado["intervalo"], 1)
+            if anterior and resultado["intervalo"] > 0 else 0.0
+        )
 
-    tempoDiff = tempo2 - tempo1
+        # sem amostra anterior: usa zeros, ou seja, o uso médio desde o boot
+        cpus_anteriores = anterior["cpus"] if anterior else {}
+        resultado["total"] = _detalhar_uso(cpus_anteriores.get("cpu", [0] * 8), nova["cpus"]["cpu"])
+        resultado["nucleos"] = {
+            nome: _detalhar_uso(cpus_anteriores.get(nome, [0] * 8), valores)
+            for nome, valores in nova["cpus"].items() if nome != "cpu"
+        }
 
-    idleDiff = tempoOcioso2 - tempoOcioso1 ##idle -> tempo de ociosidade da CPU
+        _por_consumidor[consumidor] = (nova, resultado)
 
-    tempoAtivo = tempoDiff - idleDiff #tempo em que a CPU realmente trabalhou
+        return resultado
 
-    usoCpu = 100 * (tempoAtivo / tempoDiff) # Calculo de uso da CPU em porcentagem
 
-    ociosidade = 100 * (idleDiff / tempoDiff) 
+def lerLoadavg():
+
+    '''
+     Lê /proc/loadavg ("0.13 0.09 0.16 3/71 12005"): as cargas médias de 1, 5 e 15 minutos e
+     "executando/total" das entidades escalonáveis. O total conta todas as threads do sistema
+     (inclusive as do kernel), o mesmo que somar "Threads:" de cada /proc/[pid]/status.
+    '''
 
-    return round(usoCpu, 2), round(ociosidade, 2)
+    with open(procfsModel.caminho_proc("loadavg")) as l:
+        partes = l.read().split()
+    executando, total = partes[3].split("/")
+    return {
+        "carga": tuple(float(c) for c in partes[:3]),
+        "entidades_executando": int(executando),
+        "entidades_total": int(total),
+    }
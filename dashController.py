@@ -2,99 +2,255 @@ import threading
 import time
 import tkinter as tk
 from view import dashboard_view, atualizar_interface
-from cpuModel import lerUsoCpu
+from cpuModel import amostrarCpu, lerLoadavg
 from memoryModel import lerUsoMemoria
-from processModel import (dicionarioStatusProcesso, dicionarioStatCPUProcesso, 
-                          atualizar_cpu_total, dicionarioPaginaProcesso,
-                          contar_processos_e_threads) 
-from systemModel import listDirectoryContent
+from ioModel import amostrarDiscos, amostrarRede
+from processModel import (coletar_snapshot_processos, obter_snapshot_processos, processosTodos,
+                          demanda_recursos, inventariar_recursos, sockets_rede_recentes,
+                          demanda_processos, contarProcessos)
+from systemModel import listarDiretorioEmLotes
+import coletorDaemon
+import diagnosticoModel
+from agendadorModel import AgendadorAdaptativo, executar_periodicamente
+from historyModel import HistoricoSeries
+from journalModel import DiarioMetricas
+from replayController import GravadorCaptura
 
 # Locks para controle de concorrência, que sincronizam o acesso relacionado à leitura/atualização dos dados
 
 lock_cpu = threading.Lock() 
 lock_mem = threading.Lock() 
+lock_io = threading.Lock()
 lock_proc = threading.Lock() 
+lock_recursos = threading.Lock()
 
 
 # Dados compartilhados entre threads armazenados em dicionários globais
 
 dados_cpu = {}  
 dados_mem = {}   
+dados_io = {}              # {"discos": {nome: taxas}, "rede": {interface: taxas}}
 dados_proc = {}
+dados_recursos = {}        # {pid: recursos abertos} inventariados sob demanda (substituído a cada publicação)
+_recursos_completos = {}   # resultado da última varredura completa ("Varrer todos")
 
-def atualizar_diretorio(diretorio_caminho="/"):
-    global dados_diretorio
+LIMITE_PROCESSOS = None  # top-N processos por %CPU enviados à interface (None = todos)
+PONTOS_TENDENCIA = 120   # pontos da camada de 5s mostrados nos gráficos de tendência (10 min)
 
-    conteudo = listDirectoryContent(diretorio_caminho)
-    return conteudo
+# Cadência de cada coletor, ajustada pelo custo medido e pela variação dos dados
+agendador = AgendadorAdaptativo()
+_chaves_processos = set()   # (pid, starttime) do ciclo anterior, para medir a rotatividade
+
+# Séries temporais em buffers circulares pré-alocados (memória fixa desde a inicialização)
+historico = HistoricoSeries()
+
+# Diário de métricas em disco (None = desativado); configurado por configurar_diario()
+diario = None
+PROCESSOS_NO_DIARIO = 32  # top-N processos por %CPU gravados a cada ciclo
+
+def atualizar_diretorio(diretorio_caminho="/", cancelado=None, reler=False):
+    # gerador de lotes: a view insere cada lote conforme chega e cancela ao navegar
+    return listarDiretorioEmLotes(diretorio_caminho, cancelado=cancelado, reler=reler)
   
 # MARK: Funções que atualizam os dados da CPU em paralelo
-def atualizar_cpu():
+def ciclo_cpu():
     global dados_cpu 
 
-    while True:
+    cpu_inicio = time.thread_time()
+
+    # uma leitura de /proc/stat por tick, comparada com a amostra anterior (sem sleep bloqueante)
+    with diagnosticoModel.medir("coleta.cpu"):
+        amostra = amostrarCpu(idade_maxima=0.5)
+    uso_percent = amostra["total"]["uso"]
+    ocioso_percent = amostra["total"]["ocioso"]
+    
+    # Contagens globais sem ler nenhum /proc/[pid]: threads de /proc/loadavg, executando/bloqueados
+    # e forks de /proc/stat (já lido acima) e processos pela listagem de /proc
+    with diagnosticoModel.medir("coleta.contadores_globais"):
+        carga = lerLoadavg()
+        total_procs = contarProcessos()
+    contadores = amostra["contadores"]
+    snapshot = obter_snapshot_processos()
+
+    agora = time.time()
+    historico.registrar_sistema(agora, cpu=uso_percent)
+    if diario:
+        diario.registrar(agora, "cpu", uso_percent)
+
+    with lock_cpu:    # entra na seção crítica protegida pelo lock para evitar condição de corrida
+        anterior = dados_cpu.get("uso_cpu")
+        dados_cpu = {
+            "uso_cpu": uso_percent,
+            "ocioso": ocioso_percent,
+            "total_processos": total_procs,  
+            "total_threads": carga["entidades_total"],
+            "executando": contadores.get("procs_running", "N/A"),
+            "bloqueados": contadores.get("procs_blocked", "N/A"),
+            "forks_por_s": amostra["forks_por_s"],
+            "carga": carga["carga"],
+            "syscalls_economizadas": snapshot.get("syscalls_economizadas", 0),
+            "estados": amostra["total"],
+            "nucleos": {nome: d["uso"] for nome, d in amostra["nucleos"].items()},
+            "tendencia_cpu": [v for _, v in historico.serie_sistema("cpu", n=PONTOS_TENDENCIA)],
+            "tendencia_mem": [v for _, v in historico.serie_sistema("memoria", n=PONTOS_TENDENCIA)],
+            "agendamento": agendador.resumo(),   # intervalos escolhidos por coletor, exibidos na interface
+        }
+
+    variacao = abs(uso_percent - anterior) if anterior is not None else None
+    agendador.concluir("cpu", time.thread_time() - cpu_inicio, variacao)
 
-        uso_percent, ocioso_percent = lerUsoCpu()
-        
-        # Chamada para obter contagens globais (tupla)
-        total_procs, total_thrs = contar_processos_e_threads()
-
-        with lock_cpu:    # entra na seção crítica protegida pelo lock para evitar condição de corrida
-            dados_cpu = {
-                "uso_cpu": uso_percent,
-                "ocioso": ocioso_percent,
-                "total_processos": total_procs,  
-                "total_threads": total_thrs   
-            }
-        
-        time.sleep(5)
+
+def atualizar_cpu():
+    executar_periodicamente(agendador, "cpu", ciclo_cpu)
 
 
 
 # MARK: Funções que atualizam os dados da memória e dos processos em paralelo
 
-def atualizar_memoria():
+def ciclo_memoria():
     global dados_mem            
 
-    while True:        
+    cpu_inicio = time.thread_time()
 
+    with diagnosticoModel.medir("coleta.memoria"):
         mem = lerUsoMemoria()   # chama função que retorna um dicionario do uso atual da memória
+    agora = time.time()
+    historico.registrar_sistema(agora, memoria=mem["Uso Memória RAM (%)"], swap=mem["Uso Swap (%)"])
+    if diario:
+        diario.registrar(agora, "memoria", mem["Uso Memória RAM (%)"])
+        diario.registrar(agora, "swap", mem["Uso Swap (%)"])
+
+    with lock_mem:          # entra na seção crítica protegida pelo lock para evitar acesso concorrente
+        anterior = dados_mem
+        dados_mem = mem     # atualiza o dicionário global com os dados de memória obtidos
+
+    variacao = None
+    if anterior:
+        variacao = max(abs(mem["Uso Memória RAM (%)"] - anterior["Uso Memória RAM (%)"]),
+                       abs(mem["Uso Swap (%)"] - anterior["Uso Swap (%)"]))
+    agendador.concluir("memoria", time.thread_time() - cpu_inicio, variacao)
+
+
+def atualizar_memoria():
+    executar_periodicamente(agendador, "memoria", ciclo_memoria)
+
+
+# MARK: Função que atualiza as taxas de E/S (discos e rede)
+
+def ciclo_io():
+    global dados_io
+
+    cpu_inicio = time.thread_time()
+
+    with diagnosticoModel.medir("coleta.io"):
+        io = {"discos": amostrarDiscos(), "rede": amostrarRede()}
+
+    with lock_io:
+        anterior = dados_io
+        dados_io = io
+
+    # variação: maior mudança de utilização de um disco (em pontos percentuais)
+    variacao = None
+    if anterior.get("discos") and io["discos"]:
+        variacao = max(abs(taxas["utilizacao"] - anterior["discos"].get(nome, taxas)["utilizacao"])
+                       for nome, taxas in io["discos"].items())
+    agendador.concluir("io", time.thread_time() - cpu_inicio, variacao)
 
-        with lock_mem:          # entra na seção crítica protegida pelo lock para evitar acesso concorrente
-            dados_mem = mem     # atualiza o dicionário global com os dados de memória obtidos
-        time.sleep(5)           
+
+def atualizar_io():
+    executar_periodicamente(agendador, "io", ciclo_io)
 
 
 # MARK: Função que atualiza os dados dos processos
 
+def ciclo_processos():
+
+    """Um ciclo completo da thread de processos: coleta (só status, stat e statm), ordenação, histórico/diário e publicação."""
+
+    global dados_proc, _chaves_processos
+
+    cpu_inicio = time.thread_time()
+
+    # coleta de passada única: lista /proc uma vez e lê cada arquivo uma vez por PID
+    snapshot = coletar_snapshot_processos()
+    tabela = snapshot["tabela"]
+
+    # ordena pelos índices da tabela colunar e só então monta os registros para a interface
+    with diagnosticoModel.medir("processos.ordenar"):
+        ordem = tabela.ordem_por_cpu(LIMITE_PROCESSOS)
+        processos_ordenados = tabela.para_dicionario(ordem)
+    agora = time.time()
+    with diagnosticoModel.medir("processos.historico"):
+        historico.registrar_processos(agora, tabela, ordem)
+        if diario: # só roda com a varredura aberta por outro consumidor (janela Processos, gravação...)
+            for i in ordem[:PROCESSOS_NO_DIARIO]:
+                diario.registrar(agora, "processo_cpu", tabela.cpu_percentual[i], tabela.pid[i])
+                diario.registrar(agora, "processo_rss", tabela.rss[i], tabela.pid[i])
+
+    with lock_proc:
+        dados_proc = processos_ordenados
+
+    # variação: % de processos que surgiram ou terminaram desde o ciclo anterior
+    chaves = set(zip(tabela.pid, tabela.starttime))
+    variacao = 100 * len(chaves ^ _chaves_processos) / max(len(chaves), 1) if _chaves_processos else None
+    _chaves_processos = chaves
+
+    agendador.concluir("processos", time.thread_time() - cpu_inicio, variacao)
+
+
 def atualizar_processos():
 
-    global dados_proc               
+    def ciclo():
+        demanda_processos.aguardar() # varredura por PID só com alguém usando a tabela (ex.: janela Processos)
+        ciclo_processos()
 
-    while True:                   
+    executar_periodicamente(agendador, "processos", ciclo)
 
-        atualizar_cpu_total()      # atualiza o delta do tempo total da CPU para 
-                                    #cálculos de uso (diferença entre dois tempos de leitura global)
 
-        status = dicionarioStatusProcesso()  
-        cpu = dicionarioStatCPUProcesso()    
-        paginas = dicionarioPaginaProcesso() 
+# MARK: Inventário de recursos abertos sob demanda (PIDs que a interface está mostrando)
 
-        processos = {}             # Armazenar dados combinados dos processos
+def ciclo_recursos(prioritarios, prefetch, completa):
 
-        for pid in status:         # para cada PID no status dos processos
+    """
+    Inventaria os FDs dos PIDs pedidos pela interface: primeiro os prioritários (selecionado e
+    visíveis), publicados logo, depois o prefetch. A varredura completa cobre todos os PIDs e
+    fica como base até a próxima; as linhas visíveis sempre sobrepõem dados mais novos.
+    """
 
-            if pid in cpu and pid in paginas:         # verifica se também temos dados de CPU e dados 
-                                                        #de pagina para esse PID
+    global dados_recursos, _recursos_completos
 
-                # une os dados de status, CPU e pagina para o mesmo processo em um único dicionário
-                processos[pid] = {**status[pid], **cpu[pid], **paginas[pid]}
+    alvo = processosTodos() if completa else prioritarios
+    if not alvo and not prefetch:
+        return # janela de processos fechada: o inventário não custa nada
 
-        processos_ordenados = dict(sorted(processos.items(), key=lambda item: item[1].get("uso_percentual_cpu", 0), reverse=True))
+    cpu_inicio = time.thread_time()
+    estatisticas = {"acertos": 0, "falhas": 0}
+    sockets = sockets_rede_recentes() # uma tabela de sockets para as duas passadas
+    with diagnosticoModel.medir("recursos.sob_demanda"):
+        recursos = inventariar_recursos(alvo, estatisticas, completo=completa, sockets_info=sockets)
+    if completa:
+        _recursos_completos = recursos
+    with lock_recursos:
+        dados_recursos = {**_recursos_completos, **recursos}
 
-        with lock_proc:
-            dados_proc = processos_ordenados
-        time.sleep(5)              
+    if prefetch and not completa:
+        with diagnosticoModel.medir("recursos.prefetch"):
+            recursos.update(inventariar_recursos(prefetch, estatisticas, sockets_info=sockets))
+        with lock_recursos:
+            dados_recursos = {**_recursos_completos, **recursos}
+
+    # FDs novos (falhas do cache) indicam inventário mudando depressa
+    total = estatisticas["acertos"] + estatisticas["falhas"]
+    agendador.concluir("recursos", time.thread_time() - cpu_inicio, 100 * estatisticas["falhas"] / max(total, 1))
+
+
+def atualizar_recursos():
+
+    # acorda quando a seleção/rolagem muda ou, sem mudanças, na cadência "recursos" do agendador
+    versao = 0
+    while True:
+        versao, prioritarios, prefetch, completa = demanda_recursos.aguardar(versao, agendador.intervalo("recursos"))
+        ciclo_recursos(prioritarios, prefetch, completa)
 
 
 # MARK: Função que inicia o loop de exibição da interface gráfica
@@ -113,7 +269,13 @@ def loop_exibicao():
         with lock_proc:                  
             procs = dados_proc.copy()    
 
-        atualizar_interface(cpu, mem, procs)  
+        with lock_recursos:
+            recursos = dados_recursos    # o dicionário é trocado inteiro a cada publicação (não precisa de cópia)
+
+        with lock_io:
+            io = dados_io                # idem
+
+        atualizar_interface(cpu, mem, procs, recursos, io)  
         
         root.after(1000, atualizar)      # agenda a próxima atualização da interface para daqui 1 segundo
 
@@ -127,15 +289,146 @@ def loop_exibicao():
 
 
 
-# MARK: Função que inicia todos os threads e o loop de exibição da interface gráfica
+# MARK: Funções que iniciam os coletores (locais ou via coletor headless)
+
+def configurar_orcamento_cpu(fracao):
 
-def iniciar_controller():
+    """Fração de um núcleo que os coletores podem usar juntos (ex.: 0.05 = 5%)."""
+
+    agendador.orcamento = fracao
+
+
+def configurar_diario(diretorio):
+
+    """
+    Ativa a gravação das métricas coletadas no diário em disco (None desativa). O diário não abre a
+    varredura por PID: os processos mais ativos só são gravados enquanto outro consumidor a mantém.
+    """
+
+    global diario
+    diario = None
+    if diretorio:
+        try:
+            diario = DiarioMetricas(diretorio)
+        except BlockingIOError:
+            print(f"Diário desativado: {diretorio} já está em uso por outra instância.")
+
+
+def encerrar_diario():
+
+    """Grava o lote pendente do diário (até REGISTROS_POR_LOTE registros ou alguns segundos de dados)."""
+
+    if diario:
+        diario.fechar()
+
+
+def iniciar_coletores():
 
     # inicia thread em segundo plano para atualizar dados da CPU continuamente
     threading.Thread(target=atualizar_cpu, daemon=True).start()  
     threading.Thread(target=atualizar_memoria, daemon=True).start()  
+    threading.Thread(target=atualizar_io, daemon=True).start()
     threading.Thread(target=atualizar_processos, daemon=True).start()  
 
-    loop_exibicao() # inicia o loop principal da interface gráfica (bloqueante)
 
+def _receber_snapshot(snapshot):
+
+    """Aplica um snapshot recebido do coletor headless nos dados compartilhados com a interface."""
+
+    global dados_cpu, dados_mem, dados_proc, dados_io
+
+    with lock_cpu:
+        dados_cpu = snapshot.get("cpu", {})
+    with lock_mem:
+        dados_mem = snapshot.get("mem", {})
+    with lock_io:
+        dados_io = snapshot.get("io", {})
+    with lock_proc:
+        dados_proc = snapshot.get("proc", {})
+
+
+def _coletor_desconectado():
+
+    print("Coletor headless indisponível; coletando /proc localmente.")
+    iniciar_coletores()
+
+
+# MARK: Acompanhamento de snapshots (publicação e gravação)
+
+def acompanhar_snapshots(ao_mudar, intervalo=1.0):
+
+    """Chama ao_mudar({"cpu", "mem", "proc", "io"}) sempre que algum laço atualizar_* publicar dados novos (bloqueante)."""
 
+    ultimo = None
+    while True:
+        with lock_cpu:
+            cpu = dados_cpu
+        with lock_mem:
+            mem = dados_mem
+        with lock_proc:
+            procs = dados_proc
+        with lock_io:
+            io = dados_io
+
+        # os laços sempre trocam o dicionário inteiro; comparar identidade basta para detectar dados novos
+        atual = (id(cpu), id(mem), id(procs), id(io))
+        if atual != ultimo:
+            ao_mudar({"cpu": cpu, "mem": mem, "proc": procs, "io": io})
+            ultimo = atual
+        time.sleep(intervalo)
+
+
+def iniciar_gravacao(caminho):
+
+    """Grava cada snapshot novo num arquivo de captura (mesmo formato de quadro do coletor) para reprodução posterior."""
+
+    gravador = GravadorCaptura(caminho)
+    print(f"Gravando captura em {caminho}")
+    demanda_processos.abrir() # a captura leva a tabela de processos
+    threading.Thread(target=acompanhar_snapshots, args=(gravador.gravar,), daemon=True).start()
+
+
+# MARK: Modo coletor headless (sem interface)
+
+def iniciar_coletor_headless(caminho_socket=coletorDaemon.CAMINHO_SOCKET_PADRAO, intervalo=1.0, grupo=None):
+
+    """
+    Roda os laços atualizar_* uma única vez na máquina e publica os snapshots no socket Unix.
+    Com `grupo`, o socket fica acessível aos membros do grupo (operadores com usuários diferentes).
+    """
+
+    try:
+        publicador = coletorDaemon.PublicadorSnapshots(caminho_socket, grupo)
+    except OSError as e:
+        print(f"Coletor não iniciado: {e}")
+        return
+    print(f"Coletor publicando snapshots em {caminho_socket}")
+    demanda_processos.abrir() # assinantes podem abrir a janela Processos a qualquer momento
+    iniciar_coletores()
+
+    try:
+        acompanhar_snapshots(publicador.publicar, intervalo)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publicador.fechar()
+
+
+# MARK: Função que inicia todos os threads e o loop de exibição da interface gráfica
+
+def iniciar_controller(caminho_socket=coletorDaemon.CAMINHO_SOCKET_PADRAO):
+
+    # se houver um coletor headless ativo, assina os snapshots dele em vez de varrer /proc
+    # o socket do próprio usuário primeiro, depois o do coletor compartilhado (--grupo)
+    caminho_socket, conexao = (coletorDaemon.conectar_algum((caminho_socket, coletorDaemon.CAMINHO_SOCKET_COMPARTILHADO))
+                               if caminho_socket else (None, None))
+    if conexao:
+        print(f"Assinando snapshots do coletor em {caminho_socket}")
+        coletorDaemon.assinar(conexao, _receber_snapshot, _coletor_desconectado)
+    else:
+        iniciar_coletores()
+
+    # FDs e sockets são inventariados aqui, para os PIDs que esta janela mostra (mesmo assinando um coletor)
+    threading.Thread(target=atualizar_recursos, daemon=True).start()
+
+    loop_exibicao() # inicia o loop principal da interface gráfica (bloqueante)
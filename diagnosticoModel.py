@@ -0,0 +1,154 @@
+import json
+import os
+import signal
+import threading
+import time
+from array import array
+from contextlib import nullcontext
+
+# Instrumentação das etapas de coleta e de renderização (tempos em ns via perf_counter_ns).
+# Desativada, cada ponto de medida custa só a verificação de ATIVO.
+ATIVO = os.environ.get("DASHBOARD_DIAGNOSTICO", "1") != "0"
+AMOSTRAS_POR_ETAPA = 1024   # janela de amostras recentes usada nos percentis
+CAMINHO_DESPEJO_PADRAO = os.path.join(os.environ.get("XDG_RUNTIME_DIR", "/tmp"), f"dashboard-so-diagnostico-{os.getpid()}.json")
+
+_lock = threading.Lock()
+_etapas = {}      # nome -> _Etapa
+_contadores = {}  # nome -> inteiro
+_NULO = nullcontext()
+
+
+# MARK: Amostras de uma etapa (buffer circular de tamanho fixo)
+
+class _Etapa:
+    __slots__ = ("duracoes", "posicao", "tamanho", "total_ns", "chamadas")
+
+    def __init__(self):
+        self.duracoes = array('q', bytes(8 * AMOSTRAS_POR_ETAPA))
+        self.posicao = 0
+        self.tamanho = 0
+        self.total_ns = 0
+        self.chamadas = 0
+
+    def adicionar(self, duracao_ns):
+        self.duracoes[self.posicao] = duracao_ns
+        self.posicao = (self.posicao + 1) % AMOSTRAS_POR_ETAPA
+        if self.tamanho < AMOSTRAS_POR_ETAPA:
+            self.tamanho += 1
+        self.total_ns += duracao_ns
+        self.chamadas += 1
+
+
+class _Medida:
+    __slots__ = ("nome", "inicio")
+
+    def __init__(self, nome):
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *_):
+        registrar(self.nome, time.perf_counter_ns() - self.inicio)
+
+
+# MARK: Pontos de medida
+
+def ativar(ativo=True):
+    global ATIVO
+    ATIVO = ativo
+
+
+def medir(nome):
+    """Context manager para etapas inteiras: `with medir("coleta.sockets"): ...`."""
+    return _Medida(nome) if ATIVO else _NULO
+
+
+def inicio():
+    """Para laços quentes: t = inicio(); ...; fim("etapa", t). Devolve 0 se desativado."""
+    return time.perf_counter_ns() if ATIVO else 0
+
+
+def fim(nome, t0):
+    if t0:
+        registrar(nome, time.perf_counter_ns() - t0)
+
+
+def registrar(nome, duracao_ns):
+    with _lock:
+        etapa = _etapas.get(nome)
+        if etapa is None:
+            etapa = _etapas[nome] = _Etapa()
+        etapa.adicionar(duracao_ns)
+
+
+def contar(nome, n=1):
+    if ATIVO:
+        with _lock:
+            _contadores[nome] = _contadores.get(nome, 0) + n
+
+
+def zerar():
+    with _lock:
+        _etapas.clear()
+        _contadores.clear()
+
+
+# MARK: Agregação e exportação
+
+def _percentil(ordenadas, p):
+    return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * p))]
+
+
+def resumo():
+    """{"ativo", "etapas": {nome: {amostras, chamadas, p50_ms, p95_ms, p99_ms, max_ms, total_ms}}, "contadores"}."""
+    with _lock:
+        copias = {nome: (sorted(e.duracoes[:e.tamanho]), e.chamadas, e.total_ns) for nome, e in _etapas.items()}
+        contadores = dict(_contadores)
+
+    etapas = {}
+    for nome, (ordenadas, chamadas, total_ns) in sorted(copias.items()):
+        if not ordenadas:
+            continue
+        etapas[nome] = {
+            "amostras": len(ordenadas),
+            "chamadas": chamadas,
+            "p50_ms": _percentil(ordenadas, 0.50) / 1e6,
+            "p95_ms": _percentil(ordenadas, 0.95) / 1e6,
+            "p99_ms": _percentil(ordenadas, 0.99) / 1e6,
+            "max_ms": ordenadas[-1] / 1e6,
+            "total_ms": total_ns / 1e6,
+        }
+    return {"instante": time.time(), "ativo": ATIVO, "etapas": etapas, "contadores": contadores}
+
+
+def despejar(caminho=None):
+    """Resumo em JSON; gravado em `caminho` (atomicamente) se informado."""
+    texto = json.dumps(resumo(), indent=2, sort_keys=True)
+    if caminho:
+        with open(caminho + ".tmp", "w") as f:
+            f.write(texto)
+        os.replace(caminho + ".tmp", caminho)
+    return texto
+
+
+def instalar_sinal(caminho=CAMINHO_DESPEJO_PADRAO):
+    """
+    `kill -USR1 <pid>` grava o resumo em `caminho` (útil no coletor headless, que não tem janela).
+    O tratador só marca um evento: ele roda na thread principal, que pode estar dentro de
+    registrar() com _lock tomado, então quem despeja é uma thread à parte.
+    """
+    pedido = threading.Event()
+
+    def despejar_quando_pedido():
+        while True:
+            pedido.wait()
+            pedido.clear()
+            try:
+                despejar(caminho)
+            except OSError as e:
+                print(f"Erro ao gravar o diagnóstico em {caminho}: {e}")
+
+    threading.Thread(target=despejar_quando_pedido, name="diagnostico-despejo", daemon=True).start()
+    signal.signal(signal.SIGUSR1, lambda *_: pedido.set())
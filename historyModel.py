@@ -0,0 +1,186 @@
+import threading
+from array import array
+
+# Camadas no estilo RRD: (resolução em segundos, quantidade de pontos)
+#   5s por 1h, 1min por 24h, 15min por 30 dias
+CAMADAS_PADRAO = ((5, 720), (60, 1440), (900, 2880))
+SLOTS_PROCESSOS_PADRAO = 32   # processos (top por %CPU) acompanhados ao mesmo tempo
+CARENCIA_SLOTS_PADRAO = 30    # amostras seguidas fora do top antes de o slot ser liberado
+
+
+# MARK: Buffer circular de capacidade fixa
+
+class AnelSerie:
+    """Buffer circular pré-alocado de pontos (instante, valor); adicionar é O(1) e não aloca."""
+
+    def __init__(self, capacidade):
+        self.capacidade = capacidade
+        self.instantes = array('d', bytes(8 * capacidade))
+        self.valores = array('d', bytes(8 * capacidade))
+        self.posicao = 0   # próxima posição de escrita
+        self.tamanho = 0
+
+    def adicionar(self, instante, valor):
+        self.instantes[self.posicao] = instante
+        self.valores[self.posicao] = valor
+        self.posicao = (self.posicao + 1) % self.capacidade
+        if self.tamanho < self.capacidade:
+            self.tamanho += 1
+
+    def limpar(self):
+        self.posicao = 0
+        self.tamanho = 0
+
+    def pontos(self, n=None):
+        """Últimos `n` pontos (todos se None), do mais antigo para o mais novo. Só a leitura aloca."""
+        n = self.tamanho if n is None else min(n, self.tamanho)
+        inicio = (self.posicao - n) % self.capacidade
+        if inicio + n <= self.capacidade:
+            return list(zip(self.instantes[inicio:inicio + n], self.valores[inicio:inicio + n]))
+        fim = inicio + n - self.capacidade
+        return (list(zip(self.instantes[inicio:], self.valores[inicio:]))
+                + list(zip(self.instantes[:fim], self.valores[:fim])))
+
+    def bytes_reservados(self):
+        return self.instantes.itemsize * self.capacidade * 2
+
+
+# MARK: Camada com agregação por intervalo
+
+class Camada:
+    """Acumula as amostras do intervalo corrente e grava a média no anel quando o intervalo fecha."""
+
+    def __init__(self, resolucao, capacidade):
+        self.resolucao = resolucao
+        self.anel = AnelSerie(capacidade)
+        self.balde = None
+        self.soma = 0.0
+        self.contagem = 0
+
+    def adicionar(self, instante, valor):
+        balde = int(instante // self.resolucao)
+        if balde != self.balde:
+            if self.contagem:
+                self.anel.adicionar(self.balde * self.resolucao, self.soma / self.contagem)
+            self.balde = balde
+            self.soma = 0.0
+            self.contagem = 0
+        self.soma += valor
+        self.contagem += 1
+
+    def limpar(self):
+        self.anel.limpar()
+        self.balde = None
+        self.soma = 0.0
+        self.contagem = 0
+
+
+class SerieMultiResolucao:
+    """Uma métrica gravada em todas as camadas (5s, 1min, 15min...)."""
+
+    def __init__(self, camadas=CAMADAS_PADRAO):
+        self.camadas = [Camada(resolucao, capacidade) for resolucao, capacidade in camadas]
+
+    def adicionar(self, instante, valor):
+        for camada in self.camadas:
+            camada.adicionar(instante, valor)
+
+    def limpar(self):
+        for camada in self.camadas:
+            camada.limpar()
+
+    def pontos(self, resolucao=None, n=None):
+        """Pontos da camada com a resolução pedida (a mais fina se None)."""
+        for camada in self.camadas:
+            if resolucao is None or camada.resolucao == resolucao:
+                return camada.anel.pontos(n)
+        raise ValueError(f"Sem camada de {resolucao}s")
+
+    def bytes_reservados(self):
+        return sum(camada.anel.bytes_reservados() for camada in self.camadas)
+
+
+# MARK: Histórico do sistema e dos processos
+
+class HistoricoSeries:
+    """
+    Séries temporais em memória fixa: CPU, memória e swap do sistema, mais %CPU e RSS dos
+    processos mais ativos em `slots` posições pré-alocadas, identificadas por (pid, starttime).
+    Um processo que sai do top mantém o slot (e a série) por `carencia` amostras, para que quem
+    oscila na fronteira do top não perca o histórico; depois o slot é limpo e reaproveitado sem
+    alocar. Sem slot livre, um processo que entra no top toma o do ausente há mais tempo.
+    """
+
+    METRICAS_SISTEMA = ("cpu", "memoria", "swap")
+    METRICAS_PROCESSO = ("cpu", "rss")
+
+    def __init__(self, camadas=CAMADAS_PADRAO, slots=SLOTS_PROCESSOS_PADRAO, carencia=CARENCIA_SLOTS_PADRAO):
+        self._lock = threading.Lock()
+        self.sistema = {nome: SerieMultiResolucao(camadas) for nome in self.METRICAS_SISTEMA}
+        self.processos = [
+            {nome: SerieMultiResolucao(camadas) for nome in self.METRICAS_PROCESSO}
+            for _ in range(slots)
+        ]
+        self._slot_por_processo = {}   # (pid, starttime) -> índice do slot
+        self._slots_livres = list(range(slots))
+        self.carencia = carencia
+        self._ausencias = {}           # (pid, starttime) com slot -> amostras seguidas fora do top
+
+    def registrar_sistema(self, instante, **valores):
+        """Ex.: registrar_sistema(t, cpu=12.5) ou registrar_sistema(t, memoria=40.1, swap=0.0)."""
+        with self._lock:
+            for nome, valor in valores.items():
+                self.sistema[nome].adicionar(instante, valor)
+
+    def registrar_processos(self, instante, tabela, indices):
+        """Grava %CPU e RSS das linhas `indices` (ex.: top-N por CPU) de uma TabelaProcessos."""
+        with self._lock:
+            linhas = {(tabela.pid[i], tabela.starttime[i]): i for i in indices[:len(self.processos)]}
+            for chave, i in linhas.items():
+                slot = self._slot_por_processo.get(chave)
+                if slot is None:
+                    if not self._slots_livres:
+                        # sem slot livre: o processo fora do top há mais tempo cede o dele
+                        ausente = max(self._ausencias, key=self._ausencias.__getitem__, default=None)
+                        if ausente is None:
+                            continue
+                        self._liberar_slot(ausente)
+                    slot = self._slots_livres.pop()
+                    self._slot_por_processo[chave] = slot
+                else:
+                    self._ausencias.pop(chave, None)
+                series = self.processos[slot]
+                series["cpu"].adicionar(instante, tabela.cpu_percentual[i])
+                series["rss"].adicionar(instante, tabela.rss[i])
+
+            # processos que saíram do top (ou terminaram) só liberam o slot depois da carência
+            for chave in [c for c in self._slot_por_processo if c not in linhas]:
+                ausencias = self._ausencias.get(chave, 0) + 1
+                if ausencias >= self.carencia:
+                    self._liberar_slot(chave)
+                else:
+                    self._ausencias[chave] = ausencias
+
+    def _liberar_slot(self, chave):
+        slot = self._slot_por_processo.pop(chave)
+        self._ausencias.pop(chave, None)
+        for serie in self.processos[slot].values():
+            serie.limpar()
+        self._slots_livres.append(slot)
+
+    def serie_sistema(self, nome, resolucao=None, n=None):
+        with self._lock:
+            return self.sistema[nome].pontos(resolucao, n)
+
+    def serie_processo(self, pid, starttime, nome, resolucao=None, n=None):
+        with self._lock:
+            slot = self._slot_por_processo.get((pid, starttime))
+            if slot is None:
+                return []
+            return self.processos[slot][nome].pontos(resolucao, n)
+
+    def bytes_reservados(self):
+        """Memória dos buffers, fixa desde a criação."""
+        total = sum(serie.bytes_reservados() for serie in self.sistema.values())
+        total += sum(serie.bytes_reservados() for slot in self.processos for serie in slot.values())
+        return total
@@ -0,0 +1,208 @@
+import os
+import time
+import threading
+from array import array
+from operator import itemgetter, sub
+
+import procfsModel
+import leitorProcModel
+
+INTERVALO_MINIMO = 0.25   # segundos; amostras mais próximas que isso não geram taxa (mantém a base)
+LIMITE_32_BITS = 1 << 32
+BYTES_POR_SETOR = 512     # /proc/diskstats conta em setores de 512 bytes, qualquer que seja o disco
+
+# Contadores usados de cada arquivo (posição depois do nome do dispositivo)
+CAMPOS_DISCO = ("leituras", "setores_lidos", "escritas", "setores_escritos", "ms_ocupado")
+_PEGAR_DISCO = itemgetter(3, 5, 7, 9, 12)     # campos de /proc/diskstats (major minor nome ...)
+CAMPOS_REDE = ("rx_bytes", "rx_pacotes", "rx_descartes", "tx_bytes", "tx_pacotes", "tx_descartes")
+_PEGAR_REDE = itemgetter(0, 1, 3, 8, 9, 11)   # colunas de /proc/net/dev depois de "iface:"
+
+
+# MARK: Motor de taxas (contadores monotônicos -> taxas por segundo)
+
+class MotorTaxas:
+    """
+    Guarda a amostra anterior de contadores monotônicos de muitos dispositivos, num único array
+    plano (dispositivo × contador), e calcula as taxas por segundo de todos numa passada só. O
+    intervalo é o medido entre as leituras, não o nominal, então atrasos do agendador não
+    distorcem as taxas. Dispositivos novos só têm taxa a partir da segunda amostra, e os que somem
+    são descartados. Um contador que diminui deu a volta em 32 bits (soma-se 2^32, se ele estava
+    perto do limite) ou foi zerado, e então a taxa é 0 nesse intervalo.
+    """
+
+    def __init__(self, campos):
+        self.campos = campos
+        self.largura = len(campos)
+        self._nomes = ()
+        self._indice = {}
+        self._valores = array('Q')
+        self._instante = None
+        self._taxas = {}
+
+    def amostrar(self, instante, nomes, valores):
+
+        """
+        `nomes`: tupla de dispositivos; `valores`: array('Q') com len(nomes) × len(campos)
+        contadores, na mesma ordem. Devolve {nome: [taxa por segundo de cada campo]}.
+        """
+
+        if self._instante is None:
+            self._guardar(instante, nomes, valores)
+            return {}
+        dt = instante - self._instante
+        if dt < INTERVALO_MINIMO:
+            return self._taxas # cedo demais: mantém a base para o próximo intervalo não ficar curto
+
+        k = self.largura
+        if nomes == self._nomes:
+            anteriores = self._valores
+            novos = ()
+        else:
+            # layout mudou (dispositivo apareceu ou sumiu): alinha a amostra anterior à nova ordem;
+            # um dispositivo novo usa os próprios valores (delta 0) e fica fora do resultado
+            anteriores = array('Q', valores)
+            novos = set()
+            for i, nome in enumerate(nomes):
+                j = self._indice.get(nome)
+                if j is None:
+                    novos.add(nome)
+                else:
+                    anteriores[i * k:(i + 1) * k] = self._valores[j * k:(j + 1) * k]
+
+        deltas = list(map(sub, valores, anteriores))
+        if min(deltas, default=0) < 0:
+            for i, delta in enumerate(deltas):
+                if delta < 0:
+                    # volta em 32 bits só se o anterior estava na metade de cima e o atual recomeçou embaixo
+                    volta = LIMITE_32_BITS // 2 <= anteriores[i] < LIMITE_32_BITS and valores[i] < LIMITE_32_BITS // 2
+                    deltas[i] = delta + LIMITE_32_BITS if volta else 0
+
+        inverso = 1.0 / dt
+        taxas = [delta * inverso for delta in deltas]
+        self._taxas = {
+            nome: taxas[i * k:(i + 1) * k]
+            for i, nome in enumerate(nomes) if nome not in novos
+        }
+        self._guardar(instante, nomes, valores)
+        return self._taxas
+
+    def _guardar(self, instante, nomes, valores):
+        if nomes != self._nomes:
+            self._nomes = nomes
+            self._indice = {nome: i for i, nome in enumerate(nomes)}
+        self._valores = valores
+        self._instante = instante
+
+
+# MARK: Leitura de /proc/diskstats e /proc/net/dev
+
+def lerDiskstats():
+    """(instante, nomes, array('Q') com CAMPOS_DISCO de cada dispositivo)."""
+    nomes = []
+    valores = array('Q')
+    buffer, n = leitorProcModel.ler(procfsModel.caminho_proc("diskstats"))
+    instante = time.monotonic()
+    for linha in buffer[:n].splitlines(): # int() aceita bytes: só os nomes são decodificados
+        partes = linha.split()
+        if len(partes) >= 14:
+            nomes.append(partes[2].decode())
+            valores.extend(map(int, _PEGAR_DISCO(partes)))
+    return instante, tuple(nomes), valores
+
+
+def lerNetDev():
+    """(instante, nomes, array('Q') com CAMPOS_REDE de cada interface)."""
+    nomes = []
+    valores = array('Q')
+    buffer, n = leitorProcModel.ler(procfsModel.caminho_proc("net", "dev"))
+    instante = time.monotonic()
+    for linha in buffer[:n].splitlines()[2:]:
+        nome, _, resto = linha.partition(b":")
+        partes = resto.split()
+        if len(partes) >= 16:
+            nomes.append(nome.strip().decode())
+            valores.extend(map(int, _PEGAR_REDE(partes)))
+    return instante, tuple(nomes), valores
+
+
+def _discos_inteiros(nomes):
+    """Dispositivos que não são partições (os de /sys/block); sem sysfs, todos."""
+    try:
+        return set(nomes) & set(os.listdir("/sys/block")) if procfsModel.procfs_real() else set(nomes)
+    except OSError:
+        return set(nomes)
+
+
+def _interfaces_fisicas(nomes):
+    """Interfaces com dispositivo de verdade (/sys/class/net/<if>/device); lo, veth, bridges etc. ficam de fora."""
+    if not procfsModel.procfs_real():
+        return set(nomes) - {"lo"}
+    return {nome for nome in nomes if os.path.exists(f"/sys/class/net/{nome}/device")}
+
+
+# MARK: Amostradores compartilhados
+
+lock_amostra = threading.Lock()
+_motor_discos = MotorTaxas(CAMPOS_DISCO)
+_motor_rede = MotorTaxas(CAMPOS_REDE)
+_nomes_discos = ()
+_inteiros = set()
+_nomes_rede = ()
+_fisicas = set()
+
+
+def amostrarDiscos():
+
+    '''
+     Taxas por disco inteiro (partições ficam de fora para não contar duas vezes):
+       {nome: {"iops", "leitura_bps", "escrita_bps", "utilizacao"}} (utilização em %)
+    '''
+
+    global _nomes_discos, _inteiros
+
+    with lock_amostra:
+        instante, nomes, valores = lerDiskstats()
+        if nomes != _nomes_discos:
+            _nomes_discos, _inteiros = nomes, _discos_inteiros(nomes)
+        taxas = _motor_discos.amostrar(instante, nomes, valores)
+        inteiros = _inteiros
+
+    return {
+        nome: {
+            "iops": round(leituras + escritas, 1),
+            "leitura_bps": setores_lidos * BYTES_POR_SETOR,
+            "escrita_bps": setores_escritos * BYTES_POR_SETOR,
+            "utilizacao": round(min(100.0, ms_ocupado / 10), 1), # ms ocupados por segundo -> %
+        }
+        for nome, (leituras, setores_lidos, escritas, setores_escritos, ms_ocupado) in taxas.items()
+        if nome in inteiros
+    }
+
+
+def amostrarRede():
+
+    '''
+     Taxas por interface: {nome: {"rx_bps", "tx_bps", "rx_pps", "tx_pps", "descartes_ps", "fisica"}}
+     ("fisica": placa de verdade; somar as virtuais contaria os mesmos bytes duas ou três vezes)
+    '''
+
+    global _nomes_rede, _fisicas
+
+    with lock_amostra:
+        instante, nomes, valores = lerNetDev()
+        if nomes != _nomes_rede:
+            _nomes_rede, _fisicas = nomes, _interfaces_fisicas(nomes)
+        taxas = _motor_rede.amostrar(instante, nomes, valores)
+        fisicas = _fisicas
+
+    return {
+        nome: {
+            "rx_bps": rx_bytes,
+            "tx_bps": tx_bytes,
+            "rx_pps": round(rx_pacotes, 1),
+            "tx_pps": round(tx_pacotes, 1),
+            "descartes_ps": round(rx_descartes + tx_descartes, 1),
+            "fisica": nome in fisicas,
+        }
+        for nome, (rx_bytes, rx_pacotes, rx_descartes, tx_bytes, tx_pacotes, tx_descartes) in taxas.items()
+    }
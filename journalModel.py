@@ -0,0 +1,273 @@
+import bisect
+import fcntl
+import mmap
+import os
+import struct
+import threading
+import time
+
+# Diretório padrão do diário de métricas
+DIRETORIO_DIARIO_PADRAO = os.path.join(
+    os.environ.get("XDG_STATE_HOME", os.path.expanduser("~/.local/state")), "dashboard-so", "diario"
+)
+
+DURACAO_SEGMENTO = 3600             # um segmento por hora
+ORCAMENTO_BYTES = 256 * 1024 ** 2   # tamanho máximo do diário em disco
+REGISTROS_POR_LOTE = 4096           # registros acumulados antes de escrever
+IDADE_MAXIMA_LOTE = 5.0             # ... ou segundos desde a última escrita
+INTERVALO_INDICE = 256              # uma entrada no índice esparso a cada N registros
+RESOLUCAO_COMPACTACAO = 60          # segmentos antigos são reduzidos a médias de 1 min
+DESVIO_MAXIMO = 10.0                # maior atraso (s) entre o instante de um registro e a gravação dele:
+                                    # as threads coletoras gravam fora de ordem dentro dessa janela
+
+# Métricas gravadas (id numérico no registro)
+METRICAS = {"cpu": 1, "memoria": 2, "swap": 3, "processo_cpu": 10, "processo_rss": 11}
+NOMES_METRICAS = {v: k for k, v in METRICAS.items()}
+
+# Registro de largura fixa: instante (epoch), métrica, entidade (pid ou 0), valor
+REGISTRO = struct.Struct("<dIId")
+# Cabeçalho de segmento: magic, versão, tamanho do registro, flags
+CABECALHO = struct.Struct("<4sHHI4x")
+ENTRADA_INDICE = struct.Struct("<dQ")   # instante, deslocamento no segmento
+MAGIC = b"DSOJ"
+FLAG_COMPACTADO = 0x1
+
+
+# MARK: Segmento (um arquivo por intervalo de tempo)
+
+def _caminhos_segmento(diretorio, inicio):
+    base = os.path.join(diretorio, f"{int(inicio):010d}")
+    return base + ".seg", base + ".idx"
+
+
+def _ler_indice(caminho_idx):
+    """Índice esparso do segmento: listas paralelas (instantes, deslocamentos)."""
+    instantes, deslocamentos = [], []
+    try:
+        with open(caminho_idx, "rb") as f:
+            dados = f.read()
+    except FileNotFoundError:
+        return instantes, deslocamentos
+    for instante, deslocamento in ENTRADA_INDICE.iter_unpack(dados[:len(dados) - len(dados) % ENTRADA_INDICE.size]):
+        instantes.append(instante)
+        deslocamentos.append(deslocamento)
+    return instantes, deslocamentos
+
+
+def ler_segmento(caminho_seg, caminho_idx, inicio, fim, metrica=None, entidade=None):
+    """
+    Lê via mmap só a faixa [inicio, fim] do segmento. Os registros podem estar fora de ordem
+    por até DESVIO_MAXIMO: a leitura parte da última entrada do índice anterior a
+    `inicio - DESVIO_MAXIMO` e só para num registro posterior a `fim + DESVIO_MAXIMO`.
+    """
+    instantes, deslocamentos = _ler_indice(caminho_idx)
+    with open(caminho_seg, "rb") as f:
+        tamanho = os.fstat(f.fileno()).st_size
+        if tamanho <= CABECALHO.size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            # antes dessa entrada nenhum registro chega a `inicio`, mesmo fora de ordem
+            posicao = bisect.bisect_left(instantes, inicio - DESVIO_MAXIMO) - 1
+            deslocamento = deslocamentos[posicao] if posicao >= 0 else CABECALHO.size
+            limite = tamanho - (tamanho - CABECALHO.size) % REGISTRO.size
+            while deslocamento < limite:
+                instante, id_metrica, ent, valor = REGISTRO.unpack_from(mapa, deslocamento)
+                deslocamento += REGISTRO.size
+                if instante > fim:
+                    if instante > fim + DESVIO_MAXIMO:
+                        break # daqui em diante tudo é posterior a `fim`
+                    continue
+                if instante < inicio:
+                    continue
+                if metrica is not None and id_metrica != metrica:
+                    continue
+                if entidade is not None and ent != entidade:
+                    continue
+                yield instante, NOMES_METRICAS.get(id_metrica, str(id_metrica)), ent, valor
+
+
+# MARK: Diário de métricas
+
+class DiarioMetricas:
+    """
+    Diário binário append-only de registros de largura fixa, segmentado por hora.
+    Os registros são acumulados num buffer pré-alocado e escritos em lote; cada segmento
+    tem um índice esparso (.idx) para que consultas por intervalo leiam só as páginas
+    necessárias via mmap. Acima do orçamento, segmentos antigos são compactados (médias
+    de 1 min) e, se ainda preciso, apagados.
+
+    Só uma instância escreve em cada diretório: o construtor toma um flock exclusivo em
+    `.lock` e levanta BlockingIOError se outra instância (outra janela local, o coletor
+    headless) já o tem. Dois escritores desalinhariam o índice esparso, e a compactação de um
+    faria o outro continuar escrevendo num arquivo já substituído.
+    """
+
+    def __init__(self, diretorio=DIRETORIO_DIARIO_PADRAO, orcamento=ORCAMENTO_BYTES):
+        self.diretorio = diretorio
+        self.orcamento = orcamento
+        os.makedirs(diretorio, exist_ok=True)
+        self._fd_trava = os.open(os.path.join(diretorio, ".lock"), os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o600)
+        try:
+            fcntl.flock(self._fd_trava, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(self._fd_trava)
+            raise
+        self._lock = threading.Lock()
+        self._fechado = False
+        self._buffer = bytearray(REGISTRO.size * REGISTROS_POR_LOTE)
+        self._pendentes = 0
+        self._ultima_escrita = time.monotonic()
+        self._compactar_se_preciso()
+        self._inicio_segmento = None
+        self._fd = None
+        self._fd_idx = None
+        self._registros_no_segmento = 0
+        self.estatisticas = {"registros": 0, "lotes": 0, "segundos_escrita": 0.0, "compactacoes": 0, "remocoes": 0}
+
+    # --- escrita -------------------------------------------------------------
+
+    def registrar(self, instante, metrica, valor, entidade=0):
+        """Acrescenta um registro ao lote (sem syscalls até o lote encher ou envelhecer)."""
+        with self._lock:
+            if self._fechado:
+                return # coletores daemon ainda rodando durante o encerramento
+            REGISTRO.pack_into(self._buffer, self._pendentes * REGISTRO.size,
+                               instante, METRICAS[metrica], entidade, valor)
+            self._pendentes += 1
+            if (self._pendentes == REGISTROS_POR_LOTE
+                    or time.monotonic() - self._ultima_escrita >= IDADE_MAXIMA_LOTE):
+                self._descarregar()
+
+    def descarregar(self):
+        with self._lock:
+            self._descarregar()
+
+    def _abrir_segmento(self, instante):
+        inicio = int(instante // DURACAO_SEGMENTO) * DURACAO_SEGMENTO
+        if inicio == self._inicio_segmento:
+            return
+        self._fechar_segmento()
+        caminho_seg, caminho_idx = _caminhos_segmento(self.diretorio, inicio)
+        self._fd = os.open(caminho_seg, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        self._fd_idx = os.open(caminho_idx, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        tamanho = os.fstat(self._fd).st_size
+        if tamanho == 0:
+            os.write(self._fd, CABECALHO.pack(MAGIC, 1, REGISTRO.size, 0))
+            tamanho = CABECALHO.size
+        self._registros_no_segmento = (tamanho - CABECALHO.size) // REGISTRO.size
+        self._inicio_segmento = inicio
+
+    def _fechar_segmento(self):
+        for fd in (self._fd, self._fd_idx):
+            if fd is not None:
+                os.close(fd)
+        self._fd = self._fd_idx = None
+        self._inicio_segmento = None
+
+    def _descarregar(self):
+        if not self._pendentes:
+            return
+        t0 = time.perf_counter()
+        dados = memoryview(self._buffer)[:self._pendentes * REGISTRO.size]
+        deslocamento = 0
+        while deslocamento < len(dados):
+            instante = REGISTRO.unpack_from(dados, deslocamento)[0]
+            self._abrir_segmento(instante)
+            # o lote vai inteiro para o segmento atual até cruzar a fronteira da hora
+            fim = deslocamento
+            limite_segmento = self._inicio_segmento + DURACAO_SEGMENTO
+            while fim < len(dados) and REGISTRO.unpack_from(dados, fim)[0] < limite_segmento:
+                fim += REGISTRO.size
+            fim = max(fim, deslocamento + REGISTRO.size)
+
+            base = CABECALHO.size + self._registros_no_segmento * REGISTRO.size
+            indice = bytearray()
+            for n in range(deslocamento, fim, REGISTRO.size):
+                if self._registros_no_segmento % INTERVALO_INDICE == 0:
+                    indice += ENTRADA_INDICE.pack(REGISTRO.unpack_from(dados, n)[0], base + (n - deslocamento))
+                self._registros_no_segmento += 1
+            os.write(self._fd, dados[deslocamento:fim])
+            if indice:
+                os.write(self._fd_idx, indice)
+            deslocamento = fim
+
+        self.estatisticas["registros"] += self._pendentes
+        self.estatisticas["lotes"] += 1
+        self.estatisticas["segundos_escrita"] += time.perf_counter() - t0
+        self._pendentes = 0
+        self._ultima_escrita = time.monotonic()
+        self._compactar_se_preciso()
+
+    def fechar(self):
+        """Escreve o lote pendente e solta a trava do diretório (chamado no encerramento)."""
+        with self._lock:
+            if self._fechado:
+                return
+            self._descarregar()
+            self._fechar_segmento()
+            self._fechado = True
+            os.close(self._fd_trava) # fechar o fd solta o flock
+
+    # --- leitura -------------------------------------------------------------
+
+    def segmentos(self):
+        """Inícios (epoch) dos segmentos existentes, em ordem."""
+        return sorted(int(nome[:-4]) for nome in os.listdir(self.diretorio) if nome.endswith(".seg"))
+
+    def consultar(self, inicio, fim, metrica=None, entidade=None):
+        """Registros (instante, métrica, entidade, valor) com inicio <= instante <= fim."""
+        self.descarregar()
+        id_metrica = METRICAS[metrica] if metrica else None
+        for inicio_seg in self.segmentos():
+            # um segmento pode ter registros até DESVIO_MAXIMO anteriores ao próprio início
+            if inicio_seg + DURACAO_SEGMENTO < inicio or inicio_seg - DESVIO_MAXIMO > fim:
+                continue # segmento fora da faixa: nem é aberto
+            caminho_seg, caminho_idx = _caminhos_segmento(self.diretorio, inicio_seg)
+            yield from ler_segmento(caminho_seg, caminho_idx, inicio, fim, id_metrica, entidade)
+
+    # --- rotação e compactação -----------------------------------------------
+
+    def tamanho_total(self):
+        return sum(os.path.getsize(os.path.join(self.diretorio, nome)) for nome in os.listdir(self.diretorio))
+
+    def _compactar_se_preciso(self):
+        """Chamado a cada lote escrito: compacta os segmentos mais antigos e, se não bastar, apaga-os."""
+        antigos = [s for s in self.segmentos() if s != self._inicio_segmento]
+        for inicio_seg in antigos:
+            if self.tamanho_total() <= self.orcamento:
+                return
+            if not self._compactar(inicio_seg):
+                for caminho in _caminhos_segmento(self.diretorio, inicio_seg):
+                    if os.path.exists(caminho):
+                        os.unlink(caminho)
+                self.estatisticas["remocoes"] += 1
+
+    def _compactar(self, inicio_seg):
+        """Reescreve o segmento com médias por (métrica, entidade, minuto). Retorna False se já estava compactado."""
+        caminho_seg, caminho_idx = _caminhos_segmento(self.diretorio, inicio_seg)
+        with open(caminho_seg, "rb") as f:
+            _, _, _, flags = CABECALHO.unpack(f.read(CABECALHO.size))
+        if flags & FLAG_COMPACTADO:
+            return False
+
+        somas = {}
+        for instante, metrica, entidade, valor in ler_segmento(caminho_seg, caminho_idx, 0, float("inf")):
+            chave = (int(instante // RESOLUCAO_COMPACTACAO), METRICAS[metrica], entidade)
+            soma, contagem = somas.get(chave, (0.0, 0))
+            somas[chave] = (soma + valor, contagem + 1)
+
+        dados = bytearray(CABECALHO.pack(MAGIC, 1, REGISTRO.size, FLAG_COMPACTADO))
+        indice = bytearray()
+        for n, ((balde, metrica, entidade), (soma, contagem)) in enumerate(sorted(somas.items())):
+            instante = float(balde * RESOLUCAO_COMPACTACAO)
+            if n % INTERVALO_INDICE == 0:
+                indice += ENTRADA_INDICE.pack(instante, len(dados))
+            dados += REGISTRO.pack(instante, metrica, entidade, soma / contagem)
+
+        # grava ao lado e troca atomicamente
+        for caminho, conteudo in ((caminho_seg, dados), (caminho_idx, indice)):
+            with open(caminho + ".tmp", "wb") as f:
+                f.write(conteudo)
+            os.replace(caminho + ".tmp", caminho)
+        self.estatisticas["compactacoes"] += 1
+        return True
@@ -0,0 +1,166 @@
+import os
+import socket
+import struct
+import threading
+from binascii import unhexlify
+
+import procfsModel
+
+# Leitura de /proc em bytes: os.open + os.readv num bytearray reaproveitado (um por thread) e os
+# campos tirados por posição com find(), sem decodificar o arquivo nem quebrá-lo em linhas str.
+TAMANHO_BUFFER_INICIAL = 16 * 1024   # status tem ~1,5 KB; cresce sozinho para /proc/net/* grandes
+
+_local = threading.local()
+
+
+# MARK: Buffer reaproveitado
+
+def ler(caminho):
+
+    """
+    Lê o arquivo inteiro no buffer da thread e devolve (buffer, n). O conteúdo só vale até a
+    próxima chamada de ler() na mesma thread: o chamador extrai os campos antes disso.
+    Erros de abertura/leitura (FileNotFoundError, PermissionError, ProcessLookupError) sobem.
+    """
+
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None:
+        buffer = _local.buffer = bytearray(TAMANHO_BUFFER_INICIAL)
+    fd = os.open(caminho, os.O_RDONLY | os.O_CLOEXEC)
+    visao = memoryview(buffer)
+    try:
+        n = 0
+        while True:
+            lidos = os.readv(fd, [visao[n:]])
+            if lidos == 0:
+                return buffer, n
+            n += lidos
+            if n == len(buffer): # arquivo maior que o buffer: dobra e continua de onde parou
+                visao.release()
+                buffer.extend(bytes(len(buffer)))
+                visao = memoryview(buffer)
+    finally:
+        visao.release()
+        os.close(fd)
+
+
+# MARK: /proc/[pid]/stat, status e statm
+
+def ler_stat_pid(pid):
+    """(utime, stime, starttime, minflt, majflt) de /proc/[pid]/stat."""
+    buffer, n = ler(f"{procfsModel.RAIZ_PROC}/{pid}/stat")
+    # o comm (campo 2) pode ter espaços e parênteses: os campos numéricos começam após o último ')'
+    inicio = buffer.rfind(b")", 0, n) + 2
+    campos = buffer[inicio:n].split(None, 20) # só até o campo 22 (starttime); o resto fica junto
+    return int(campos[11]), int(campos[12]), int(campos[19]), int(campos[7]), int(campos[9])
+
+
+# chaves de /proc/[pid]/status na ordem em que o kernel as escreve (a busca continua de onde parou)
+_CAMPOS_STATUS = (
+    (b"\nState:", "estado"),
+    (b"\nUid:", "uid"),
+    (b"\nVmSize:", "mem_total_kb"),
+    (b"\nVmRSS:", "mem_residente_kb"),
+    (b"\nVmData:", "mem_heap_kb"),
+    (b"\nVmStk:", "mem_stack_kb"),
+    (b"\nVmExe:", "mem_codigo_kb"),
+    (b"\nThreads:", "threads"),
+)
+
+def ler_status_pid(pid):
+
+    """
+    {"nome", "estado", "uid", "threads", "mem_*_kb"} de /proc/[pid]/status. Threads do kernel
+    não têm as linhas Vm*, que então ficam de fora (como no parser de texto).
+    """
+
+    buffer, n = ler(f"{procfsModel.RAIZ_PROC}/{pid}/status")
+    fim = buffer.find(b"\n", 0, n)
+    status = {"nome": buffer[6:fim].decode(errors="replace")} # "Name:\t"
+    posicao = fim
+    for chave, nome in _CAMPOS_STATUS:
+        i = buffer.find(chave, posicao, n)
+        if i < 0:
+            continue
+        inicio = i + len(chave)
+        fim = buffer.find(b"\n", inicio, n)
+        if nome == "estado":
+            status[nome] = buffer[inicio:fim].strip().decode()
+        elif nome == "uid":
+            status[nome] = int(buffer[inicio:buffer.find(b"\t", inicio + 1, fim)]) # real, efetivo, salvo, fs
+        elif nome == "threads":
+            status[nome] = int(buffer[inicio:fim])
+        else:
+            status[nome] = int(buffer[inicio:fim - 3]) # "\t    1748 kB": int() ignora os espaços
+        posicao = fim
+    return status
+
+
+def ler_statm_pid(pid):
+    """Primeiro campo de /proc/[pid]/statm: tamanho virtual em páginas."""
+    buffer, n = ler(f"{procfsModel.RAIZ_PROC}/{pid}/statm")
+    return int(buffer[:buffer.find(b" ", 0, n)])
+
+
+# MARK: /proc/meminfo
+
+def ler_meminfo(chaves=(b"MemTotal", b"MemAvailable", b"SwapTotal", b"SwapFree")):
+    """{chave: kB} das `chaves` (bytes, na ordem do arquivo) de /proc/meminfo."""
+    buffer, n = ler(procfsModel.caminho_proc("meminfo"))
+    valores = {}
+    posicao = 0
+    for chave in chaves:
+        i = buffer.find(chave + b":", posicao, n)
+        if i < 0:
+            continue
+        inicio = i + len(chave) + 1
+        fim = buffer.find(b"\n", inicio, n)
+        valores[chave.decode()] = int(buffer[inicio:fim].split()[0])
+        posicao = fim
+    return valores
+
+
+# MARK: /proc/net/tcp, udp, tcp6, udp6
+
+def _endereco(hexa, porta_hexa):
+    if len(hexa) == 8: # IPv4: um inteiro de 32 bits na ordem do host
+        ip = socket.inet_ntoa(struct.pack("<L", int(hexa, 16)))
+    elif len(hexa) == 32: # IPv6: quatro palavras de 32 bits, cada uma na ordem do host
+        ip = socket.inet_ntop(socket.AF_INET6, struct.pack(">4L", *struct.unpack("<4L", unhexlify(hexa))))
+    else:
+        ip = "N/A"
+    return f"{ip}:{int(porta_hexa, 16)}"
+
+
+def ler_sockets_rede(caminho):
+
+    """
+    Lista de (local, remoto, estado, inode), uma por linha de um arquivo /proc/net/{tcp,udp}[6].
+    Os campos até o estado têm largura fixa a partir do ':' do número da linha, e só o trecho
+    uid/timeout/inode, de largura variável, é separado. A lista fica pronta antes de retornar,
+    porque o buffer da thread é reaproveitado pela próxima chamada de ler().
+    """
+
+    buffer, n = ler(caminho)
+    sockets = []
+    inicio = buffer.find(b"\n", 0, n) + 1 # pula o cabeçalho
+    while 0 < inicio < n:
+        fim = buffer.find(b"\n", inicio, n)
+        if fim < 0:
+            fim = n
+        try:
+            c = buffer.find(b":", inicio, fim) + 2       # início do endereço local
+            p = buffer.find(b":", c, fim)                # separador endereço:porta
+            largura = p - c                              # 8 (IPv4) ou 32 (IPv6)
+            local = _endereco(buffer[c:p], buffer[p + 1:p + 5])
+            r = p + 6                                    # endereço remoto
+            remoto = _endereco(buffer[r:r + largura], buffer[r + largura + 1:r + largura + 5])
+            e = r + largura + 6                          # estado (2 dígitos hexadecimais)
+            estado = int(buffer[e:e + 2], 16)
+            # depois do estado: tx:rx (17) tr:when (11) retrnsmt (8), então uid timeout inode
+            uid_timeout_inode = buffer[e + 3 + 17 + 1 + 11 + 1 + 8:fim].split(None, 3)
+            sockets.append((local, remoto, estado, int(uid_timeout_inode[2])))
+        except (ValueError, IndexError, struct.error, OSError):
+            pass
+        inicio = fim + 1
+    return sockets
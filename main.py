@@ -1,6 +1,65 @@
 #Projeto Dashboard Sistemas Operacionais
 
-from dashController import iniciar_controller
+import argparse
+
+import diagnosticoModel
+
+from coletorDaemon import CAMINHO_SOCKET_PADRAO, CAMINHO_SOCKET_COMPARTILHADO
+from journalModel import DIRETORIO_DIARIO_PADRAO
+from agendadorModel import ORCAMENTO_CPU
+from dashController import (iniciar_controller, iniciar_coletor_headless, configurar_diario,
+                            encerrar_diario, configurar_orcamento_cpu, iniciar_gravacao)
+from replayController import reproduzir
+
+
+def _velocidade(valor):
+    # "max" reproduz sem esperar entre quadros
+    return None if valor == "max" else float(valor)
 
 if __name__ == "__main__":
-    iniciar_controller()
+    parser = argparse.ArgumentParser(description="Dashboard do Sistema Operacional")
+    parser.add_argument("--coletor", action="store_true",
+                        help="roda só o coletor (sem interface) e publica snapshots no socket Unix")
+    parser.add_argument("--socket", default=None,
+                        help=f"caminho do socket Unix do coletor (padrão: {CAMINHO_SOCKET_PADRAO}; "
+                             f"com --grupo, {CAMINHO_SOCKET_COMPARTILHADO})")
+    parser.add_argument("--grupo", metavar="GRUPO",
+                        help="com --coletor: socket compartilhado, legível pelos membros do grupo")
+    parser.add_argument("--local", action="store_true",
+                        help="ignora um coletor ativo e varre /proc nesta própria janela")
+    parser.add_argument("--diario", default=DIRETORIO_DIARIO_PADRAO,
+                        help="diretório do diário de métricas em disco")
+    parser.add_argument("--sem-diario", action="store_true",
+                        help="não grava as métricas coletadas em disco")
+    parser.add_argument("--orcamento-cpu", type=float, default=ORCAMENTO_CPU,
+                        help="fração de um núcleo que os coletores podem usar juntos (ex.: 0.05)")
+    parser.add_argument("--sem-diagnostico", action="store_true",
+                        help="desativa a instrumentação por etapa (janela Diagnóstico e kill -USR1)")
+    parser.add_argument("--gravar", metavar="ARQUIVO",
+                        help="grava cada snapshot num arquivo de captura para reprodução posterior")
+    parser.add_argument("--reproduzir", metavar="ARQUIVO",
+                        help="reproduz uma captura na interface em vez de coletar /proc")
+    parser.add_argument("--velocidade", type=_velocidade, default=1.0,
+                        help="aceleração da reprodução (ex.: 1, 10) ou 'max'")
+    args = parser.parse_args()
+
+    diagnosticoModel.ativar(not args.sem_diagnostico)
+    diagnosticoModel.instalar_sinal()
+
+    if args.reproduzir:
+        reproduzir(args.reproduzir, args.velocidade)
+        raise SystemExit
+
+    configurar_diario(None if args.sem_diario else args.diario)
+    configurar_orcamento_cpu(args.orcamento_cpu)
+    if args.gravar:
+        iniciar_gravacao(args.gravar)
+
+    try:
+        if args.coletor:
+            padrao = CAMINHO_SOCKET_COMPARTILHADO if args.grupo else CAMINHO_SOCKET_PADRAO
+            iniciar_coletor_headless(args.socket or padrao, grupo=args.grupo)
+        else:
+            iniciar_controller(None if args.local else args.socket or CAMINHO_SOCKET_PADRAO)
+    finally:
+        encerrar_diario() # sem isso o último lote (até 5 s de dados) se perderia
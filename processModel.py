@@ -1,83 +1,225 @@
 import os
+import errno
 import pwd
+import grp
 import stat
-import socket
-import datetime # Para psutil e timestamp de criação (se psutil for usado)
 import ctypes # p/ chamar semctl(2) via lib C
 import ctypes.util # p/ encontrar a lib C
-import struct
+import threading
+import time
+import heapq
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from itertools import repeat
+from array import array
+
+import procfsModel
+import diagnosticoModel
+import leitorProcModel
+from cpuModel import amostrarCpu, lerLoadavg
+from socketModel import inventarioSocketsNetlink
 
 # Carrega a biblioteca C padrão para chamadas de sistema
 libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True) #
 
 # Variável global para armazenar informações globais de sockets de rede
 _global_network_sockets_info = {} # Cache global para informações de sockets
+_sock_diag_disponivel = True      # False só quando o kernel não tem (ou não deixa usar) o sock_diag
+_sock_diag_retomar = 0.0          # instante (monotonic) até o qual o netlink fica em espera após uma falha passageira
+_sock_diag_espera = 0.0           # espera atual; dobra a cada falha seguida, até ESPERA_MAXIMA_SOCK_DIAG
+ESPERA_INICIAL_SOCK_DIAG = 5.0    # segundos
+ESPERA_MAXIMA_SOCK_DIAG = 300.0
+# erros ao criar o socket netlink que significam "sem sock_diag": não adianta tentar de novo
+_ERROS_SEM_SOCK_DIAG = {errno.EPROTONOSUPPORT, errno.EACCES}
+# protocolos cujo módulo de diag falta (ex.: udp_diag num contêiner): só eles vêm de /proc/net/*
+_protocolos_sem_diag = set()
 
 
 # Estado interno para armazenar valores anteriores
 prev_cpu_total = None    # armazena o último valor total lido do tempo da CPU (em jiffies)
                          # usado para calcular o delta entre leituras sucessivas
-previo_processo_CPU = {}    # dicionário que mapeia ProcessoID de processos para seu último tempo total de CPU registrado
-                         # usado para calcular a variação do tempo CPU por processo entre chamadas
 delta_cpu_total = None    # armazena a diferença do tempo total da CPU entre a última e penúltima leitura
                          # usado para calcular percentuais relativos de uso da CPU
-# MARK: Funções que lista todos os do sistema
 
-def processosTodos():
-    """Retorna e imprime uma lista de todos os PIDs encontrados em /proc"""
+CLK_TCK = os.sysconf(os.sysconf_names['SC_CLK_TCK']) # jiffies por segundo (normalmente 100)
 
-    processosID = [processosID for processosID in os.listdir('/proc') if processosID.isdigit()] #lista os processos do diretorio proc, verifica se todos os processos são dígitos.
-  
-    return processosID 
+# Último snapshot publicado pelo coletor de passada única (consumido pelas threads de CPU e de processos)
+lock_snapshot = threading.Lock()
+_snapshot_processos = {}
 
 
-# MARK: Funções que lêem os dados de cada processo
+# MARK: Histórico limitado por processo
 
-def statusProcesso(processosID):
+CAPACIDADE_HISTORICO = 1 << 18 # teto de entradas (processos vivos ao mesmo tempo); acima disso despeja as mais antigas
 
-    """Lê e retorna os dados do arquivo /proc/[pid]/status como dicionário"""
+class HistoricoProcessos:
+    """
+    Estado de cada processo entre ciclos (tempo de CPU e faltas de página),
+    com chave (pid, starttime): um PID reciclado tem outro starttime e não herda a base antiga.
+    Cada entrada é uma tupla de tamanho fixo; processos ausentes na varredura são despejados
+    e o total de entradas nunca passa de `capacidade`.
+    """
 
-    status_path = f'/proc/{processosID}/status' #caminho para acessar valores de cada processo
-    status_info = {} #onde serão guardadas os valores do processo
+    CAMPOS = ("cpu_jiffies", "faltas_menores", "faltas_maiores")
 
-    try: # Abre o arquivo status_path para leitura de forma segura,
-    # garantindo que o arquivo será fechado automaticamente após o uso
+    def __init__(self, capacidade=CAPACIDADE_HISTORICO):
+        self.capacidade = capacidade
+        self.despejos = 0
+        self._entradas = {} # dicionário mantém ordem de inserção: a primeira chave é a menos recente
 
-        with open(status_path, 'r') as f: 
+    def __len__(self):
+        return len(self._entradas)
 
-            for linha in f:#itera sobre cada linha de status do processo, 
-                            #realiza uma condicional e armazena o valor de destaque no vetor status_info
+    def __contains__(self, chave):
+        return chave in self._entradas
 
-                if linha.startswith("Name:"):
-                    status_info["nome"] = linha.split()[1]
+    def anterior(self, chave):
+        """Valores registrados no ciclo anterior (ou None)."""
+        return self._entradas.get(chave)
 
-                elif linha.startswith("State:"):
-                    status_info["estado"] = " ".join(linha.split()[1:])
+    def registrar(self, chave, valores):
+        """Grava os valores atuais (tupla na ordem de CAMPOS) e devolve os anteriores (ou None)."""
+        anterior = self._entradas.pop(chave, None)
+        self._entradas[chave] = valores
+        if len(self._entradas) > self.capacidade:
+            del self._entradas[next(iter(self._entradas))]
+            self.despejos += 1
+        return anterior
 
-                elif linha.startswith("Uid:"):
-                    uid = int(linha.split()[1]) 
-                    status_info["usuario"] = pwd.getpwuid(uid).pw_name #Acessa o banco de dados e pega o Usuario Id 
-                                                                        #correspondente e seleciona o nome desse usuário
-                                                                        
-                elif linha.startswith("Threads:"):
-                    status_info["threads"] = int(linha.split()[1])
+    def podar(self, chaves_vivas):
+        """Remove as entradas de processos que não apareceram na varredura atual."""
+        mortos = [chave for chave in self._entradas if chave not in chaves_vivas]
+        for chave in mortos:
+            del self._entradas[chave]
+        self.despejos += len(mortos)
+        return len(mortos)
 
-                elif linha.startswith("VmSize:"):#memoria total
-                    status_info["mem_total_kb"] = int(linha.split()[1])
 
-                elif linha.startswith("VmRSS:"):#memoria residente
-                    status_info["mem_residente_kb"] = int(linha.split()[1])
+previo_processo_CPU = HistoricoProcessos() # (pid, starttime) -> último tempo total de CPU e demais contadores
+                                          # usado para calcular a variação por processo entre ciclos
 
-                elif linha.startswith("VmData:"):#memoria heap
-                    status_info["mem_heap_kb"] = int(linha.split()[1])
 
-                elif linha.startswith("VmStk:"):#memoria stack
-                    status_info["mem_stack_kb"] = int(linha.split()[1])
+# MARK: Cache de identidades (uid, gid, dispositivo)
 
-                elif linha.startswith("VmExe:"):#memoria de código
-                    status_info["mem_codigo_kb"] = int(linha.split()[1])
+class CacheIdentidades:
+    """
+    Resolve uid -> usuário, gid -> grupo e dev_t -> nome do dispositivo de bloco com cache.
+    Os nomes de usuário/grupo são descartados quando o mtime de /etc/passwd ou /etc/group muda
+    (verificado no máximo uma vez por segundo). IDs desconhecidos viram o próprio número.
+    Compartilhado pela tabela de processos, pelo inventário de FDs e pelo navegador de diretórios.
+    """
+
+    INTERVALO_VERIFICACAO = 1.0
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._usuarios = {}
+        self._grupos = {}
+        self._dispositivos = None
+        self._mtimes = {}
+        self._ultima_verificacao = 0.0
+
+    def _revalidar(self):
+        agora = time.monotonic()
+        if agora - self._ultima_verificacao < self.INTERVALO_VERIFICACAO:
+            return
+        self._ultima_verificacao = agora
+        for arquivo, cache in (("/etc/passwd", self._usuarios), ("/etc/group", self._grupos)):
+            try:
+                mtime = os.stat(arquivo).st_mtime_ns
+            except OSError:
+                mtime = None
+            if self._mtimes.get(arquivo) != mtime:
+                self._mtimes[arquivo] = mtime
+                cache.clear()
+
+    def usuario(self, uid):
+        with self._lock:
+            self._revalidar()
+            nome = self._usuarios.get(uid)
+            if nome is None:
+                t0 = diagnosticoModel.inicio()
+                try:
+                    nome = pwd.getpwuid(uid).pw_name
+                except KeyError:
+                    nome = str(uid) # uid sem entrada no banco de usuários
+                diagnosticoModel.fim("identidades.getpwuid", t0)
+                self._usuarios[uid] = nome
+            return nome
+
+    def grupo(self, gid):
+        with self._lock:
+            self._revalidar()
+            nome = self._grupos.get(gid)
+            if nome is None:
+                t0 = diagnosticoModel.inicio()
+                try:
+                    nome = grp.getgrgid(gid).gr_name
+                except KeyError:
+                    nome = str(gid)
+                diagnosticoModel.fim("identidades.getgrgid", t0)
+                self._grupos[gid] = nome
+            return nome
+
+    def _carregar_particoes(self):
+        """(major, minor) -> nome a partir de /proc/partitions."""
+        dispositivos = {}
+        try:
+            with open(procfsModel.caminho_proc("partitions"), "r") as f:
+                for linha in f:
+                    partes = linha.split()
+                    if len(partes) == 4 and partes[0].isdigit():
+                        dispositivos[(int(partes[0]), int(partes[1]))] = partes[3]
+        except OSError:
+            pass
+        return dispositivos
+
+    def dispositivo(self, dev):
+        """Nome do dispositivo de bloco de um st_dev (ex.: 'sda1'), ou 'major:minor' se não houver."""
+        chave = (os.major(dev), os.minor(dev))
+        with self._lock:
+            if self._dispositivos is None:
+                self._dispositivos = self._carregar_particoes()
+            nome = self._dispositivos.get(chave)
+            if nome is None:
+                # discos que surgiram depois (ou dispositivos sem partição) aparecem em /sys/dev/block
+                try:
+                    nome = os.path.basename(os.readlink(f"/sys/dev/block/{chave[0]}:{chave[1]}"))
+                except OSError:
+                    nome = f"{chave[0]}:{chave[1]}"
+                self._dispositivos[chave] = nome
+            return nome
 
-    except FileNotFoundError:
+
+identidades = CacheIdentidades()
+
+
+# MARK: Funções que lista todos os do sistema
+
+def processosTodos():
+    """Retorna e imprime uma lista de todos os PIDs encontrados em /proc"""
+
+    processosID = [processosID for processosID in os.listdir(procfsModel.RAIZ_PROC) if processosID.isdigit()] #lista os processos do diretorio proc, verifica se todos os processos são dígitos.
+  
+    return processosID 
+
+
+# MARK: Funções que lêem os dados de cada processo
+
+def statusProcesso(processosID):
+
+    """Lê e retorna os dados do arquivo /proc/[pid]/status como dicionário"""
+
+    status_path = f'{procfsModel.RAIZ_PROC}/{processosID}/status' #caminho para acessar valores de cada processo
+
+    try: # leitura em bytes num buffer reaproveitado (leitorProcModel), sem quebrar o arquivo em linhas
+
+        status_info = leitorProcModel.ler_status_pid(processosID)
+        if "uid" in status_info:
+            # Resolve o nome do usuário pelo cache de identidades (uid desconhecido vira o próprio número)
+            status_info["usuario"] = identidades.usuario(status_info.pop("uid"))
+
+    except (FileNotFoundError, ProcessLookupError):
         print(f"Processo {processosID} não existe ou terminou.")
         return None
     
@@ -88,56 +230,35 @@ def statusProcesso(processosID):
     return status_info # Retorna o dicionário com as informações do processo
 
 
-# MARK: Funções que retornam dicionários com os dados de todos os processos ativos
-
-def dicionarioStatusProcesso():
-    """Retorna um dicionário com os status de todos os processos ativos, incluindo recursos abertos."""
-    processos_info = {}
-    # Atualiza o cache global de sockets de rede antes de processar os PIDs
-    global _global_network_sockets_info # Declara uso da variável global
-    _global_network_sockets_info = _ler_info_sockets_rede_global() # Preenche o cache global
-
-    for processosID in processosTodos():
-        info = statusProcesso(processosID)
-        if info:
-            # CORREÇÃO AQUI: Passar _global_network_sockets_info como argumento
-            recursos_abertos = listar_recursos_abertos_processo(processosID, _global_network_sockets_info)
-            info["recursos_abertos"] = recursos_abertos
-            processos_info[processosID] = info
-    return processos_info
-
-
 # MARK: Funções que lêem o uso da CPU de cada processo
 
 def cpuProcesso(processosID):
 
     """Lê e retorna os dados do arquivo /proc/[pid]/stat como dicionário"""
 
-    stat_path = f'/proc/{processosID}/stat'
+    stat_path = f'{procfsModel.RAIZ_PROC}/{processosID}/stat'
     
     try:
 
-        with open(stat_path, 'r') as f:
-
-            campos = f.read().split()
-
-        utime = int(campos[13])     # campo 14: tempo em modo usuário
-        stime = int(campos[14])     # campo 15: tempo em modo kernel
+        # o nome (campo 2) pode conter espaços e parênteses: o leitor começa após o último ')'
+        utime, stime, starttime, minflt, majflt = leitorProcModel.ler_stat_pid(processosID)
 
         tempo_total = utime + stime
 
         # Convertendo para segundos
-        clk_tck = os.sysconf(os.sysconf_names['SC_CLK_TCK'])  # normalmente 100
-        tempo_segundos = tempo_total / clk_tck #calcula o tempo de jiffs em segundos
+        tempo_segundos = tempo_total / CLK_TCK #calcula o tempo de jiffs em segundos
 
         return { 
             "utime_jiffies": utime,
             "stime_jiffies": stime,
             "tempo_total_jiffies": tempo_total,
-            "tempo_total_segundos": round(tempo_segundos, 2)
+            "tempo_total_segundos": round(tempo_segundos, 2),
+            "starttime": starttime,
+            "minflt": minflt,
+            "majflt": majflt
         }
     
-    except FileNotFoundError:
+    except (FileNotFoundError, ProcessLookupError):
         print(f"Processo {processosID} não encontrado.")
         return None
     
@@ -147,18 +268,15 @@ def cpuProcesso(processosID):
 
 
 #prev_cpu_total = None 
-#previo_processo_CPU = {}    
 #delta_cpu_total = None   
 
 # MARK: Funções que lêem o tempo total da CPU do sistema em jiffies
 
 def ler_cpu_total(): 
 
-    with open("/proc/stat", "r") as f: #caminho com o valor do uso da cpu global
+    """Total de jiffies da CPU, vindo do amostrador compartilhado de /proc/stat (reaproveita uma leitura recente)."""
 
-        linha = f.readline()
-        valores = list(map(int, linha.split()[1:])) # converte os tempos para inteiros, ignorando o label 'cpu'
-        return sum(valores) # soma e retorna o total dos jiffies da CPU
+    return amostrarCpu(idade_maxima=1.0, consumidor="processos")["jiffies_total"]
 
 
 # MARK: Funções que atualizam o uso da CPU e processos calculando o delta 
@@ -185,55 +303,40 @@ def atualizar_cpu_total():
 
 # MARK: Funções que calculam o uso da CPU por processo
 
-def calcular_uso_cpu_processo(pid):
+def calcular_uso_cpu_processo(pid, proc_total_atual=None, starttime=None):
 
-    global previo_processo_CPU, delta_cpu_total  # usa variáveis globais para manter dados entre chamadas
+    """Calcula o uso da CPU do processo. Se o tempo total (jiffies) já foi lido, não relê /proc/[pid]/stat."""
 
-    proc_info = cpuProcesso(pid) # obtém informações atuais do processo pelo ProcessoID
+    faltas = None
+    if proc_total_atual is None:
+        proc_info = cpuProcesso(pid) # obtém informações atuais do processo pelo ProcessoID
 
-    if proc_info is None: #se o processo não existir ou info não disponível
-        return 0.0 #retorna uso 0.0 para evitar erro
+        if proc_info is None: #se o processo não existir ou info não disponível
+            return 0.0 #retorna uso 0.0 para evitar erro
     
-    proc_total_atual = proc_info['tempo_total_jiffies'] # extrai o tempo total da CPU usado pelo processo (em jiffies)
-
-    if pid not in previo_processo_CPU:  # se for a primeira vez que vemos esse ProcessoID
-
-        previo_processo_CPU[pid] = proc_total_atual # armazena o tempo atual para próximas comparações
+        proc_total_atual = proc_info['tempo_total_jiffies'] # extrai o tempo total da CPU usado pelo processo (em jiffies)
+        starttime = proc_info['starttime']
+        faltas = (proc_info['minflt'], proc_info['majflt'])
+
+    # a chave inclui o starttime para que um PID reciclado não herde a base de outro processo
+    chave = (int(pid), starttime)
+    anterior = previo_processo_CPU.anterior(chave)
+    if faltas is None: # só o tempo de CPU é conhecido: preserva as faltas gravadas pela varredura
+        faltas = anterior[1:] if anterior is not None else (None, None)
+    previo_processo_CPU.registrar(chave, (proc_total_atual, *faltas))
+
+    if anterior is None:  # se for a primeira vez que vemos esse processo
         return 0.0  # retorna 0.0 pois não tem dado anterior para calcular delta
 
-    delta_processos = proc_total_atual - previo_processo_CPU[pid] # calcula a variação do tempo CPU do processo
-    previo_processo_CPU[pid] = proc_total_atual # atualiza o valor armazenado para a próxima chamada
+    delta_processos = proc_total_atual - anterior[0] # calcula a variação do tempo CPU do processo
 
     if delta_cpu_total and delta_cpu_total > 0:  # verifica se o delta total da CPU está disponível e é válido
         uso = (delta_processos / delta_cpu_total) * 100 
     else:
         uso = 0.0 # se não tiver delta válido, considera uso 0
-        uso = 0.0 # se não tiver delta válido, considera uso 0
 
     return round(uso, 2)  # retorna o uso arredondado com 2 casas decimais
-    return round(uso, 2)  # retorna o uso arredondado com 2 casas decimais
-
-
-# MARK: Funções que retornam dicionários com o uso da CPU de todos os processos ativos
-
-def dicionarioStatCPUProcesso():
 
-    """Retorna um dicionário com o uso percentual da CPU de todos os processos ativos"""
-    processosCPU_info = {}  
-
-    for pid in processosTodos():  
-
-        uso_percentual = calcular_uso_cpu_processo(pid) # calcula o uso percentual da CPU para o processo atual
-
-        tempo_cpu = cpuProcesso(pid)  # obtém as informações detalhadas do uso de CPU do processo
-
-        if tempo_cpu is not None:  # verifica se as informações do processo foram obtidas com sucesso
-
-            processosCPU_info[pid] = { # adiciona ao dicionário o PID como chave e um novo dicionário com as infos + uso percentual
-                **tempo_cpu,  # copia todas as informações do tempo_cpu para o novo dicionário o ** desempacota o dicionário
-                "uso_percentual_cpu": uso_percentual  # adiciona o uso percentual de CPU como um campo extra
-            }
-    return processosCPU_info # retorna o dicionário com os dados de todos os processos ativos
 
 # MARK: Funções que lêem a quantidade de páginas usadas por cada processo
 
@@ -241,21 +344,17 @@ def paginaProcesso(processosID):
 
     """Lê e retorna a quantidade de páginas usadas pelo processo a partir do arquivo /proc/[pid]/statm"""
     
-    statm_path = f'/proc/{processosID}/statm'  
+    statm_path = f'{procfsModel.RAIZ_PROC}/{processosID}/statm'  
 
     try:
 
-        with open(statm_path, 'r') as f:
-            # Lê o conteúdo e divide os valores
-            campos = f.read().split()
-        
-        total_pagina = int(campos[0])  # O primeiro campo de statm é o tamanho total do processo em páginas (tamanho virtual)
+        total_pagina = leitorProcModel.ler_statm_pid(processosID)  # O primeiro campo de statm é o tamanho total do processo em páginas (tamanho virtual)
 
         return {
             "total_pagina": total_pagina 
         }
     
-    except FileNotFoundError:  
+    except (FileNotFoundError, ProcessLookupError):  
         print(f"Processo {processosID} não encontrado.")
         return None
     
@@ -264,43 +363,334 @@ def paginaProcesso(processosID):
         return None
 
 
-# MARK: Funções que retornam dicionários com a quantidade de páginas usadas por todos os processos ativos
-
-def dicionarioPaginaProcesso():
-    """Retorna um dicionário com a quantidade de páginas usadas por todos os processos ativos"""
-    processos_pagina_info = {}  # Dicionário onde serão armazenadas as informações de páginas dos processos
-    for processosID in processosTodos(): 
-        pagina_info = paginaProcesso(processosID)  # Chama a função que retorna a quantidade de páginas
-        if pagina_info:  
-            processos_pagina_info[processosID] = pagina_info  # Adiciona o PID e a quantidade de páginas no dicionário
-    return processos_pagina_info  # Retorna o dicionário com as informações de páginas de todos os processos
+# MARK: Função que conta o número total de processos e threads ativos
 
+def contarProcessos():
+    """Quantidade de PIDs em /proc: só os nomes do diretório, sem abrir nenhum arquivo por processo."""
+    with os.scandir(procfsModel.RAIZ_PROC) as entradas:
+        return sum(1 for entrada in entradas if entrada.name.isdigit())
 
-# MARK: Função que conta o número total de processos e threads ativos
 
 def contar_processos_e_threads():
     """
     Calcula o número total de processos ativos e o número total de threads.
     Retorna uma tupla: (total_processos, total_threads).
+    As threads vêm de /proc/loadavg (total de entidades escalonáveis), sem ler o status de cada PID.
     """
-    lista_pids = processosTodos()
-    
-    if not lista_pids:
-        return 0, 0
+    return contarProcessos(), lerLoadavg()["entidades_total"]
 
-    total_processos = len(lista_pids)
-    total_threads = 0
 
-    for pid in lista_pids:
-        info_proc = statusProcesso(pid) # retorna informações do processo como dicionário
+# MARK: Tabela colunar de processos
 
-        if info_proc and "threads" in info_proc:
-            try:
-                total_threads += int(info_proc["threads"]) 
-            except (ValueError, TypeError):
-                # Ocorre se 'threads' não for um número válido; ignora o processo para a soma de threads.
-                pass 
-    return total_processos, total_threads
+class TabelaProcessos:
+    """
+    Tabela de processos em formato colunar: um buffer `array` por campo numérico
+    (pid, utime, stime, rss, vsize, threads, páginas...) e listas para os textos.
+    Evita um dicionário por processo durante a coleta; os dicionários só são
+    montados para as linhas que realmente vão para a interface.
+    """
+
+    def __init__(self):
+        self.pid = array('q')
+        self.utime = array('q')
+        self.stime = array('q')
+        self.rss = array('q')          # VmRSS (kB)
+        self.vsize = array('q')        # VmSize (kB)
+        self.heap = array('q')         # VmData (kB)
+        self.stack = array('q')        # VmStk (kB)
+        self.codigo = array('q')       # VmExe (kB)
+        self.threads = array('q')
+        self.paginas = array('q')      # statm: tamanho total em páginas
+        self.starttime = array('q')    # stat campo 22: com o pid, identifica o processo entre ciclos
+        self.minflt = array('q')
+        self.majflt = array('q')
+        self.cpu_percentual = array('d')
+        self.faltas_menores_ciclo = array('q')
+        self.faltas_maiores_ciclo = array('q')
+        self.nomes = []
+        self.usuarios = []
+        self.estados = []
+        self.recursos = []             # recursos abertos (lista de dicionários por processo)
+
+    def __len__(self):
+        return len(self.pid)
+
+    def adicionar(self, pid, status, tempo_cpu, paginas, recursos=None):
+        """Acrescenta uma linha a partir dos dicionários lidos de status, stat e statm."""
+        self.pid.append(int(pid))
+        self.utime.append(tempo_cpu["utime_jiffies"])
+        self.stime.append(tempo_cpu["stime_jiffies"])
+        self.rss.append(status.get("mem_residente_kb", 0))
+        self.vsize.append(status.get("mem_total_kb", 0))
+        self.heap.append(status.get("mem_heap_kb", 0))
+        self.stack.append(status.get("mem_stack_kb", 0))
+        self.codigo.append(status.get("mem_codigo_kb", 0))
+        self.threads.append(status.get("threads", 0))
+        self.paginas.append(paginas["total_pagina"])
+        self.starttime.append(tempo_cpu["starttime"])
+        self.minflt.append(tempo_cpu["minflt"])
+        self.majflt.append(tempo_cpu["majflt"])
+        self.nomes.append(status.get("nome", "-"))
+        self.usuarios.append(status.get("usuario", "-"))
+        self.estados.append(status.get("estado", "-"))
+        self.recursos.append(recursos)
+
+    def calcular_uso_cpu(self, historico, delta_total):
+        """
+        Calcula %CPU e faltas de página do ciclo para todas as linhas numa passada, usando o
+        HistoricoProcessos (chave (pid, starttime)) como base e já gravando os valores atuais nele.
+        Processos vistos pela primeira vez ficam com 0.
+        """
+        escala = 100.0 / delta_total if delta_total and delta_total > 0 else 0.0
+        cpu = []
+        faltas_menores = []
+        faltas_maiores = []
+
+        for chave, utime, stime, minflt, majflt in zip(zip(self.pid, self.starttime), self.utime,
+                                                      self.stime, self.minflt, self.majflt):
+            total = utime + stime
+            anterior = historico.registrar(chave, (total, minflt, majflt))
+            if anterior is None:
+                cpu.append(0.0)
+                faltas_menores.append(0)
+                faltas_maiores.append(0)
+            else:
+                cpu.append(round((total - anterior[0]) * escala, 2))
+                if anterior[1] is None: # base gravada sem faltas (só tempo de CPU)
+                    faltas_menores.append(0)
+                    faltas_maiores.append(0)
+                else:
+                    faltas_menores.append(minflt - anterior[1])
+                    faltas_maiores.append(majflt - anterior[2])
+
+        self.cpu_percentual = array('d', cpu)
+        self.faltas_menores_ciclo = array('q', faltas_menores)
+        self.faltas_maiores_ciclo = array('q', faltas_maiores)
+        return self.cpu_percentual
+
+    def ordem_por_cpu(self, limite=None):
+        """Índices das linhas ordenados por %CPU (decrescente). Com `limite`, seleciona só o top-N."""
+        chave = self.cpu_percentual.__getitem__
+        if limite is not None and limite < len(self):
+            return heapq.nlargest(limite, range(len(self)), key=chave)
+        return sorted(range(len(self)), key=chave, reverse=True)
+
+    def registro(self, i):
+        """Monta o dicionário de um processo no mesmo formato usado pela interface."""
+        tempo_total = self.utime[i] + self.stime[i]
+        info = {
+            "nome": self.nomes[i],
+            "estado": self.estados[i],
+            "usuario": self.usuarios[i],
+            "threads": self.threads[i],
+            "mem_total_kb": self.vsize[i],
+            "mem_residente_kb": self.rss[i],
+            "mem_heap_kb": self.heap[i],
+            "mem_stack_kb": self.stack[i],
+            "mem_codigo_kb": self.codigo[i],
+            "utime_jiffies": self.utime[i],
+            "stime_jiffies": self.stime[i],
+            "tempo_total_jiffies": tempo_total,
+            "tempo_total_segundos": round(tempo_total / CLK_TCK, 2),
+            "uso_percentual_cpu": self.cpu_percentual[i] if i < len(self.cpu_percentual) else 0.0,
+            "total_pagina": self.paginas[i],
+            "starttime": self.starttime[i],
+            "faltas_menores_ciclo": self.faltas_menores_ciclo[i] if i < len(self.faltas_menores_ciclo) else 0,
+            "faltas_maiores_ciclo": self.faltas_maiores_ciclo[i] if i < len(self.faltas_maiores_ciclo) else 0,
+        }
+        if self.recursos[i] is not None:
+            info["recursos_abertos"] = self.recursos[i]
+        return info
+
+    def para_dicionario(self, indices=None):
+        """Converte as linhas indicadas (todas, se None) em {pid_str: registro}, preservando a ordem."""
+        if indices is None:
+            indices = range(len(self))
+        return {str(self.pid[i]): self.registro(i) for i in indices}
+
+
+# MARK: Coleta paralela por faixas de PID
+
+TRABALHADORES_COLETA = 1   # 1 = coleta sequencial na própria thread de processos
+MODO_COLETA = "threads"    # "threads": tudo num pool de threads (limitado por syscalls)
+                           # "processos": status/stat/statm (parse) num pool de processos, FDs em threads
+_executores = {}           # pools reaproveitados entre ciclos: (modo, trabalhadores) -> executor
+
+def _obter_executor(modo, trabalhadores):
+    chave = (modo, trabalhadores)
+    if chave not in _executores:
+        if modo == "processos":
+            # forkserver evita fazer fork de um processo com threads (Tk + coletores) em execução
+            _executores[chave] = ProcessPoolExecutor(max_workers=trabalhadores,
+                                                     mp_context=multiprocessing.get_context("forkserver"))
+        else:
+            _executores[chave] = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix="coleta")
+    return _executores[chave]
+
+def _fatiar_pids(lista_pids, partes):
+    """Divide os PIDs em `partes` faixas contíguas (PIDs próximos tendem a ter custo parecido)."""
+    ordenados = sorted(lista_pids, key=int)
+    tamanho = max(1, -(-len(ordenados) // partes))
+    return [ordenados[i:i + tamanho] for i in range(0, len(ordenados), tamanho)]
+
+def _ler_basico_faixa(pids):
+    """
+    Lê status, stat e statm de uma faixa de PIDs. Não depende de estado do módulo,
+    por isso pode rodar tanto em threads quanto em processos.
+    Retorna ([(pid, status, tempo_cpu, paginas), ...], aberturas).
+    """
+    linhas = []
+    aberturas = 0
+    for pid in pids:
+        status = statusProcesso(pid)
+        aberturas += 1
+        if not status:
+            continue
+
+        tempo_cpu = cpuProcesso(pid)
+        aberturas += 1
+        if tempo_cpu is None:
+            continue
+
+        paginas = paginaProcesso(pid)
+        aberturas += 1
+        if paginas is None:
+            continue
+
+        linhas.append((pid, status, tempo_cpu, paginas))
+    return linhas, aberturas
+
+def _ler_recursos_faixa(linhas, sockets_info, varrer=True):
+    """
+    Inventário de FDs (com cache) para as linhas de uma faixa. Usa contadores locais para não disputar os globais.
+    Com varrer=False nenhum /proc/[pid]/fd é lido (o inventário é feito sob demanda por inventariar_recursos).
+    """
+    estatisticas = {"acertos": 0, "falhas": 0, "cpu_s": 0.0}
+    if not varrer:
+        return [None] * len(linhas), estatisticas
+    cpu_inicio = time.thread_time() # custo em CPU desta thread
+    recursos = []
+    for pid, _, tempo_cpu, _ in linhas:
+        t0 = diagnosticoModel.inicio() # distribuição por PID: revela processos com milhares de FDs
+        recursos.append(listar_recursos_abertos_cache(pid, tempo_cpu["starttime"], sockets_info, estatisticas))
+        diagnosticoModel.fim("coleta.fds_por_pid", t0)
+    estatisticas["cpu_s"] = time.thread_time() - cpu_inicio
+    return recursos, estatisticas
+
+def _coletar_faixa(pids, sockets_info, varrer=True):
+    with diagnosticoModel.medir("coleta.status_stat_statm"):
+        linhas, aberturas = _ler_basico_faixa(pids)
+    with diagnosticoModel.medir("coleta.fds"):
+        recursos, estatisticas = _ler_recursos_faixa(linhas, sockets_info, varrer)
+    return linhas, recursos, aberturas, estatisticas
+
+def _coletar_faixas(lista_pids, sockets_info, trabalhadores, modo, varrer=True):
+    """Distribui as faixas de PID entre os pools e devolve os resultados na ordem das faixas."""
+    if trabalhadores <= 1:
+        return [_coletar_faixa(lista_pids, sockets_info, varrer)]
+
+    faixas = _fatiar_pids(lista_pids, trabalhadores)
+    threads = _obter_executor("threads", trabalhadores)
+
+    if modo == "processos":
+        # os trabalhadores em outros processos não enxergam o diagnóstico: mede-se o map inteiro
+        with diagnosticoModel.medir("coleta.status_stat_statm"):
+            basicos = list(_obter_executor("processos", trabalhadores).map(_ler_basico_faixa, faixas))
+        with diagnosticoModel.medir("coleta.fds"):
+            recursos = list(threads.map(_ler_recursos_faixa, [linhas for linhas, _ in basicos],
+                                        repeat(sockets_info), repeat(varrer)))
+        return [(linhas, rec, aberturas, est) for (linhas, aberturas), (rec, est) in zip(basicos, recursos)]
+
+    return list(threads.map(_coletar_faixa, faixas, repeat(sockets_info), repeat(varrer)))
+
+
+# MARK: Coletor de passada única (um registro por PID)
+
+def coletar_snapshot_processos(trabalhadores=None, modo=None, varrer_recursos=False):
+    """
+    Varre /proc uma única vez e lê status, stat e statm de cada PID uma única vez,
+    publicando uma TabelaProcessos (uma linha por processo) junto com os totais globais.
+    Substitui, num único ciclo, as leituras por PID de status, CPU e páginas e a contagem de
+    processos e threads.
+    Com `trabalhadores` > 1 a lista de PIDs é dividida em faixas coletadas em paralelo.
+    Por padrão o ciclo lê só status, stat e statm: o inventário de sockets e FDs, a etapa mais
+    cara, é feito sob demanda (inventariar_recursos) para os PIDs que a interface está mostrando.
+    Com varrer_recursos=True ele também é feito aqui, para todos os PIDs.
+    """
+    global _snapshot_processos, _global_network_sockets_info
+
+    trabalhadores = trabalhadores or TRABALHADORES_COLETA
+    modo = modo or MODO_COLETA
+
+    inicio = time.perf_counter()
+    atualizar_cpu_total() # lê /proc/stat uma vez por ciclo para o delta global
+
+    custo_recursos = 0.0
+    if varrer_recursos:
+        cpu_inicio = time.thread_time()
+        with diagnosticoModel.medir("coleta.sockets"):
+            _global_network_sockets_info = _ler_info_sockets_rede_global()
+        custo_recursos = time.thread_time() - cpu_inicio
+
+    with diagnosticoModel.medir("coleta.listar_pids"):
+        lista_pids = processosTodos() # única listagem de /proc no ciclo
+    tabela = TabelaProcessos()
+    chaves_vivas = set()
+    aberturas = 2 + len(_ARQUIVOS_SOCKETS_REDE) # /proc/stat + listdir(/proc) + /proc/net/*
+
+    # junta as faixas numa única tabela
+    for linhas, recursos, aberturas_faixa, estatisticas in _coletar_faixas(
+            lista_pids, _global_network_sockets_info, trabalhadores, modo, varrer_recursos):
+        aberturas += aberturas_faixa
+        custo_recursos += estatisticas["cpu_s"]
+        estatisticas_cache_fds["acertos"] += estatisticas["acertos"]
+        estatisticas_cache_fds["falhas"] += estatisticas["falhas"]
+        diagnosticoModel.contar("fds.acertos_cache", estatisticas["acertos"])
+        diagnosticoModel.contar("fds.falhas_cache", estatisticas["falhas"])
+        for (pid, status, tempo_cpu, paginas), rec in zip(linhas, recursos):
+            chaves_vivas.add((pid, tempo_cpu["starttime"]))
+            tabela.adicionar(pid, status, tempo_cpu, paginas, rec)
+
+    podar_cache_fds(chaves_vivas) # processos que sumiram (ou cujo PID foi reutilizado) saem do cache
+
+    # %CPU de todos os processos num único passo, contra o histórico (pid, starttime) do ciclo anterior
+    with diagnosticoModel.medir("coleta.uso_cpu"):
+        tabela.calcular_uso_cpu(previo_processo_CPU, delta_cpu_total)
+        previo_processo_CPU.podar(set(zip(tabela.pid, tabela.starttime)))
+
+    # o caminho antigo fazia 4 listagens de /proc e abria status 2x, stat 2x e statm 1x por PID
+    n = len(lista_pids)
+    aberturas_legado = 5 + len(_ARQUIVOS_SOCKETS_REDE) + 5 * n
+
+    snapshot = {
+        "tabela": tabela,
+        "total_processos": n,
+        "total_threads": sum(tabela.threads),
+        "syscalls_realizadas": aberturas,
+        "syscalls_economizadas": max(aberturas_legado - aberturas, 0),
+        "cache_fds": dict(estatisticas_cache_fds),
+        "historico_entradas": len(previo_processo_CPU),
+        "historico_despejos": previo_processo_CPU.despejos,
+        "duracao_ciclo_s": time.perf_counter() - inicio,
+        "trabalhadores": trabalhadores,
+        "recursos_varridos": varrer_recursos,
+        "custo_recursos_s": custo_recursos,  # CPU gasta no inventário de sockets e FDs neste ciclo
+    }
+    if diagnosticoModel.ATIVO:
+        diagnosticoModel.registrar("coleta.ciclo", int(snapshot["duracao_ciclo_s"] * 1e9))
+        diagnosticoModel.contar("coleta.arquivos_abertos", aberturas)
+        diagnosticoModel.contar("coleta.processos", n)
+
+    with lock_snapshot:
+        _snapshot_processos = snapshot
+
+    return snapshot
+
+
+def obter_snapshot_processos():
+    """Retorna o último snapshot publicado pelo coletor (dicionário vazio se ainda não houve coleta)."""
+    with lock_snapshot:
+        return _snapshot_processos
 
 
 # ----------------------- helpers POSIX ----------------------------
@@ -343,63 +733,63 @@ def _tipo_recurso_sem(real_path, target_stat):
         return "POSIX Nomeado (Semaphore)"
     return None
 
+_ARQUIVOS_SOCKETS_REDE = {   # relativos à raiz do procfs
+    "tcp": "net/tcp",
+    "udp": "net/udp",
+    "tcp6": "net/tcp6",
+    "udp6": "net/udp6",
+}
+
 def _ler_info_sockets_rede_global():
+    """
+    Monta o mapa inode -> socket do sistema. Usa NETLINK_SOCK_DIAG (rede + Unix, filtrado
+    por estado no kernel) e cai no parser de texto de /proc/net/* se o netlink falhar. Um
+    protocolo sem módulo de diag cai no parser de texto sozinho; os outros seguem no netlink.
+    """
+    global _sock_diag_disponivel, _sock_diag_retomar, _sock_diag_espera
+    # o netlink consulta o kernel; com um procfs alternativo os sockets vêm dos arquivos dele
+    if _sock_diag_disponivel and procfsModel.procfs_real() and time.monotonic() >= _sock_diag_retomar:
+        try:
+            ausentes = {}
+            sockets = inventarioSocketsNetlink(ignorar=_protocolos_sem_diag, ausentes=ausentes)
+            _sock_diag_espera = 0.0
+            for proto, e in ausentes.items():
+                print(f"sock_diag sem suporte a {proto} ({e}); {proto} vem de /proc/net/*")
+            _protocolos_sem_diag.update(ausentes)
+            if _protocolos_sem_diag:
+                sockets.update(_ler_info_sockets_rede_texto(_protocolos_sem_diag))
+            return sockets
+        except OSError as e:
+            if e.errno in _ERROS_SEM_SOCK_DIAG:
+                print(f"sock_diag indisponível ({e}); usando /proc/net/*")
+                _sock_diag_disponivel = False # não tenta de novo a cada ciclo
+            else:
+                # falha passageira (ENOBUFS, EINTR, mensagem truncada...): texto por enquanto, netlink depois
+                _sock_diag_espera = min(ESPERA_MAXIMA_SOCK_DIAG, max(ESPERA_INICIAL_SOCK_DIAG, 2 * _sock_diag_espera))
+                _sock_diag_retomar = time.monotonic() + _sock_diag_espera
+                print(f"sock_diag falhou ({e}); usando /proc/net/* por {_sock_diag_espera:.0f} s")
+    return _ler_info_sockets_rede_texto()
+
+def _ler_info_sockets_rede_texto(protocolos=None):
     """
     Lê informações de sockets de rede globais do sistema de /proc/net/.
     Retorna um dicionário mapeando inodes de socket para seus detalhes.
+    `protocolos` restringe a leitura (ex.: {"udp", "udp6"}); None lê todos.
     """
     sockets_info = {}
-    socket_files = {
-        "tcp": "/proc/net/tcp",
-        "udp": "/proc/net/udp",
-        "tcp6": "/proc/net/tcp6",
-        "udp6": "/proc/net/udp6",
-    }
 
-    for proto, path in socket_files.items():
+    for proto, path in _ARQUIVOS_SOCKETS_REDE.items():
+        if protocolos is not None and proto not in protocolos:
+            continue
         try:
-            with open(path, 'r') as f:
-                next(f)
-                for line in f:
-                    parts = line.strip().split()
-                    if len(parts) < 10:
-                        continue
-                    try:
-                        local_addr_hex, local_port_hex = parts[1].split(':')
-                        rem_addr_hex, rem_port_hex = parts[2].split(':')
-                        st = int(parts[3], 16)
-                        inode = int(parts[9])
-
-                        local_ip = ''
-                        if len(local_addr_hex) == 8: # IPv4
-                            local_ip = socket.inet_ntoa(struct.pack("<L", int(local_addr_hex, 16))) #
-                        elif len(local_addr_hex) == 32: # IPv6
-                            local_ip = socket.inet_ntop(socket.AF_INET6, bytes.fromhex(local_addr_hex))
-                        else:
-                            local_ip = "N/A"
-
-                        local_port = int(local_port_hex, 16)
-
-                        remote_ip = ''
-                        if len(rem_addr_hex) == 8: # IPv4
-                
-                            remote_ip = socket.inet_ntoa(struct.pack("<L", int(rem_addr_hex, 16))) #
-                        elif len(rem_addr_hex) == 32: # IPv6
-                            remote_ip = socket.inet_ntop(socket.AF_INET6, bytes.fromhex(rem_addr_hex))
-                        else:
-                            remote_ip = "N/A"
-
-                        remote_port = int(rem_port_hex, 16)
-
-                        sockets_info[inode] = {
-                            "protocolo": proto,
-                            "local_address": f"{local_ip}:{local_port}",
-                            "remote_address": f"{remote_ip}:{remote_port}",
-                            "state": _get_socket_state_name(st),
-                            "inode": inode
-                        }
-                    except (ValueError, IndexError, socket.error, struct.error): # Adicionado struct.error
-                        continue
+            for local, remoto, st, inode in leitorProcModel.ler_sockets_rede(procfsModel.caminho_proc(path)):
+                sockets_info[inode] = {
+                    "protocolo": proto,
+                    "local_address": local,
+                    "remote_address": remoto,
+                    "state": _get_socket_state_name(st),
+                    "inode": inode
+                }
         except (FileNotFoundError, PermissionError):
             continue
     return sockets_info
@@ -415,15 +805,69 @@ def _get_socket_state_name(state_hex_int):
     return states.get(state_hex_int, f"UNKNOWN({state_hex_int})")
 
 
-# MARK: Função para listar recursos abertos por processo 
-def listar_recursos_abertos_processo(pid, global_network_sockets_info):
+# MARK: Classificação de um descritor de arquivo
+def _classificar_fd(fd_num, real_path, target_stat, alvo_existe, global_network_sockets_info):
     """
-    Lista os descritores de arquivo abertos por um processo lendo o diretório /proc/[pid]/fd.
-    Para cada descritor, tenta determinar o tipo (arquivo, socket, semáforo POSIX, pipe, etc.) e o caminho/identificador.
-    Utiliza informações globais de sockets para detalhamento.
-    Retorna um dicionário com listas de recursos categorizados.
+    Classifica um descritor (semáforo POSIX, socket, pipe, dispositivo, arquivo...) a partir do
+    alvo do link e do stat já obtidos. Não faz chamadas de sistema.
+    Retorna (categoria, detalhes).
     """
-    recursos_abertos = {
+    detalhes = {
+        'fd': fd_num,
+        'caminho': real_path,
+        'modo': oct(target_stat.st_mode) if target_stat else 'N/A',
+        'inode': target_stat.st_ino if target_stat else 'N/A',
+        'tamanho': target_stat.st_size if target_stat and alvo_existe else 'N/A',
+        'dono': identidades.usuario(target_stat.st_uid) if target_stat else 'N/A',
+        'grupo': identidades.grupo(target_stat.st_gid) if target_stat else 'N/A',
+        'dispositivo': identidades.dispositivo(target_stat.st_dev) if target_stat else 'N/A',
+    }
+
+    # Prioridade na classificação: Semáforos POSIX, Sockets, Pipes, Dispositivos, Arquivos
+    sem_tipo = _tipo_recurso_sem(real_path, target_stat)
+    if sem_tipo:
+        detalhes['tipo'] = sem_tipo
+        return 'semaphores_posix', detalhes
+    if real_path.startswith('socket:['): # Socket de domínio Unix ou outro
+        inode = int(real_path.split('[')[1][:-1]) if '[' in real_path else 'N/A'
+        socket_info = global_network_sockets_info.get(inode)
+        if socket_info and socket_info.get("protocolo") == "unix":
+            detalhes['tipo'] = "Socket Unix"
+            detalhes.update(socket_info)
+        elif socket_info:
+            detalhes['tipo'] = "Socket de Rede"
+            detalhes.update(socket_info)
+        else:
+            detalhes['tipo'] = "Socket (Unix/Outro)"
+        return 'sockets', detalhes
+    if real_path.startswith('pipe:['):
+        detalhes['tipo'] = "Pipe (FIFO)"
+        return 'pipes', detalhes
+    if target_stat:
+        if stat.S_ISREG(target_stat.st_mode):
+            detalhes['tipo'] = "Arquivo Regular"
+            return 'arquivos_regulares', detalhes
+        if stat.S_ISDIR(target_stat.st_mode):
+            detalhes['tipo'] = "Diretório"
+            return 'arquivos_regulares', detalhes # Pode ser uma categoria separada se quiser
+        if stat.S_ISCHR(target_stat.st_mode):
+            detalhes['tipo'] = "Dispositivo de Caractere"
+            return 'dispositivos', detalhes
+        if stat.S_ISBLK(target_stat.st_mode):
+            detalhes['tipo'] = "Dispositivo de Bloco"
+            return 'dispositivos', detalhes
+        if stat.S_ISLNK(target_stat.st_mode):
+            # O alvo do link é outro link, tratamos como arquivo regular por simplicidade aqui
+            detalhes['tipo'] = "Link Simbólico (alvo)"
+            return 'arquivos_regulares', detalhes
+        detalhes['tipo'] = "Outro"
+        return 'outros', detalhes
+    detalhes['tipo'] = "Link Quebrado/Inacessível"
+    return 'links_quebrados_ou_inacessiveis', detalhes
+
+
+def _recursos_vazios(pid):
+    return {
         'pid': pid,
         'arquivos_regulares': [],
         'sockets': [],
@@ -433,83 +877,205 @@ def listar_recursos_abertos_processo(pid, global_network_sockets_info):
         'links_quebrados_ou_inacessiveis': [],
         'outros': []
     }
-    fd_path = f'/proc/{pid}/fd'
+
+
+# MARK: Cache incremental de descritores por (pid, starttime)
+
+# (pid, starttime) -> {nome_fd: (alvo_do_link, target_stat, categoria, detalhes)}
+# O starttime torna a chave segura contra reuso de PID.
+# Lido e escrito pelo ciclo de processos (e suas faixas) e pela thread de inventário sob demanda.
+_cache_fds = {}
+_lock_cache_fds = threading.Lock()
+estatisticas_cache_fds = {"acertos": 0, "falhas": 0, "despejos": 0}
+
+def listar_recursos_abertos_cache(pid, starttime, global_network_sockets_info, estatisticas=None):
+    """
+    Lista os recursos abertos de forma incremental: percorre /proc/[pid]/fd com scandir e
+    readlink relativo ao dir_fd; só FDs novos ou cujo alvo mudou passam por stat/classificação.
+    """
+    if estatisticas is None:
+        estatisticas = estatisticas_cache_fds
+    recursos_abertos = _recursos_vazios(pid)
+    chave = (pid, starttime)
+    with _lock_cache_fds:
+        anterior = _cache_fds.get(chave, {})
+    atual = {}
 
     try:
-        for fd_num_str in os.listdir(fd_path):
-            fd_num = int(fd_num_str)
-            full_fd_path = os.path.join(fd_path, fd_num_str)
+        dir_fd = os.open(f'{procfsModel.RAIZ_PROC}/{pid}/fd', os.O_RDONLY | os.O_DIRECTORY)
+    except (FileNotFoundError, PermissionError, NotADirectoryError):
+        return recursos_abertos # Diretório /proc/{pid}/fd não existe ou sem permissão
 
-            try:
-                real_path = os.readlink(full_fd_path)
-                
-                # Tenta obter o stat do ALVO do link simbólico
-                target_stat = None
+    try:
+        with os.scandir(dir_fd) as entradas:
+            for entrada in entradas:
+                nome = entrada.name
                 try:
-                    # os.stat segue o link simbólico
-                    target_stat = os.stat(full_fd_path)
-                except (FileNotFoundError, PermissionError):
-                    pass # Se o alvo não existe ou sem permissão, target_stat permanece None
-
-                tipo_recurso = "Desconhecido"
-                detalhes = {
-                    'fd': fd_num,
-                    'caminho': real_path,
-                    'modo': oct(target_stat.st_mode) if target_stat else 'N/A',
-                    'inode': target_stat.st_ino if target_stat else 'N/A',
-                    'tamanho': target_stat.st_size if target_stat and os.path.exists(real_path) else 'N/A',
-                }
+                    real_path = os.readlink(nome, dir_fd=dir_fd)
+                except OSError as e:
+                    recursos_abertos['links_quebrados_ou_inacessiveis'].append({
+                        'fd': nome,
+                        'caminho': f"Erro ao ler link: {e}",
+                        'tipo': 'Link Quebrado/Inacessível'
+                    })
+                    continue
 
-                # Prioridade na classificação: Semáforos POSIX, Sockets, Pipes, Dispositivos, Arquivos
-                sem_tipo = _tipo_recurso_sem(real_path, target_stat)
-                if sem_tipo:
-                    detalhes['tipo'] = sem_tipo
-                    recursos_abertos['semaphores_posix'].append(detalhes)
-                elif real_path.startswith('socket:['): # Socket de domínio Unix ou outro
-                    inode = int(real_path.split('[')[1][:-1]) if '[' in real_path else 'N/A'
-                    socket_info = global_network_sockets_info.get(inode)
-                    if socket_info:
-                        detalhes['tipo'] = "Socket de Rede"
-                        detalhes.update(socket_info)
-                        recursos_abertos['sockets'].append(detalhes)
-                    else:
-                        detalhes['tipo'] = "Socket (Unix/Outro)"
-                        recursos_abertos['sockets'].append(detalhes)
-                elif real_path.startswith('pipe:['):
-                    detalhes['tipo'] = "Pipe (FIFO)"
-                    recursos_abertos['pipes'].append(detalhes)
-                elif target_stat:
-                    if stat.S_ISREG(target_stat.st_mode):
-                        detalhes['tipo'] = "Arquivo Regular"
-                        recursos_abertos['arquivos_regulares'].append(detalhes)
-                    elif stat.S_ISDIR(target_stat.st_mode):
-                        detalhes['tipo'] = "Diretório"
-                        recursos_abertos['arquivos_regulares'].append(detalhes) # Pode ser uma categoria separada se quiser
-                    elif stat.S_ISCHR(target_stat.st_mode):
-                        detalhes['tipo'] = "Dispositivo de Caractere"
-                        recursos_abertos['dispositivos'].append(detalhes)
-                    elif stat.S_ISBLK(target_stat.st_mode):
-                        detalhes['tipo'] = "Dispositivo de Bloco"
-                        recursos_abertos['dispositivos'].append(detalhes)
-                    elif stat.S_ISLNK(target_stat.st_mode):
-                         # O alvo do link é outro link, tratamos como arquivo regular por simplicidade aqui
-                        detalhes['tipo'] = "Link Simbólico (alvo)"
-                        recursos_abertos['arquivos_regulares'].append(detalhes)
-                    else:
-                        detalhes['tipo'] = "Outro"
-                        recursos_abertos['outros'].append(detalhes)
+                em_cache = anterior.get(nome)
+                if em_cache is not None and em_cache[0] == real_path:
+                    estatisticas["acertos"] += 1
+                    _, target_stat, categoria, detalhes = em_cache
+                    if categoria == 'sockets':
+                        # estado/endereços do socket mudam sem o FD mudar: reclassifica sem syscalls
+                        categoria, detalhes = _classificar_fd(int(nome), real_path, target_stat,
+                                                              detalhes['tamanho'] != 'N/A', global_network_sockets_info)
                 else:
-                    detalhes['tipo'] = "Link Quebrado/Inacessível"
-                    recursos_abertos['links_quebrados_ou_inacessiveis'].append(detalhes)
-
-            except (OSError, ValueError) as e:
-                # Captura erros ao lerlink ou stat, indicando um link quebrado ou inacessível
-                recursos_abertos['links_quebrados_ou_inacessiveis'].append({
-                    'fd': fd_num_str,
-                    'caminho': f"Erro ao ler link: {e}",
-                    'tipo': 'Link Quebrado/Inacessível'
-                })
-    except (FileNotFoundError, PermissionError):
-        pass # Diretório /proc/{pid}/fd não existe ou sem permissão
-
+                    estatisticas["falhas"] += 1
+                    target_stat = None
+                    try:
+                        target_stat = os.stat(nome, dir_fd=dir_fd) # segue o link até o alvo
+                    except (FileNotFoundError, PermissionError):
+                        pass
+                    alvo_existe = target_stat is not None and os.path.exists(real_path)
+                    categoria, detalhes = _classificar_fd(int(nome), real_path, target_stat, alvo_existe, global_network_sockets_info)
+
+                atual[nome] = (real_path, target_stat, categoria, detalhes)
+                recursos_abertos[categoria].append(detalhes)
+    except (FileNotFoundError, PermissionError, ProcessLookupError):
+        pass # o processo terminou durante a varredura
+    finally:
+        os.close(dir_fd)
+
+    with _lock_cache_fds:
+        _cache_fds[chave] = atual
     return recursos_abertos
+
+
+def podar_cache_fds(chaves_vivas):
+    """Remove do cache os processos que não apareceram na varredura atual (chaves (pid, starttime))."""
+    with _lock_cache_fds:
+        mortos = [chave for chave in _cache_fds if chave not in chaves_vivas]
+        for chave in mortos:
+            del _cache_fds[chave]
+        estatisticas_cache_fds["despejos"] += len(mortos)
+    return len(mortos)
+
+
+# MARK: Inventário de recursos sob demanda (PIDs visíveis/selecionados na interface)
+
+class DemandaRecursos:
+    """
+    PIDs cujo inventário de FDs a interface quer agora: `prioritarios` (selecionado e linhas
+    visíveis) e `prefetch` (próximas linhas prováveis). Quem coleta espera por mudanças com
+    aguardar(); uma "varredura completa" explícita inclui todos os PIDs uma única vez.
+    """
+
+    def __init__(self):
+        self._condicao = threading.Condition()
+        self.versao = 0
+        self.prioritarios = ()
+        self.prefetch = ()
+        self._varredura_completa = False
+
+    def definir(self, prioritarios, prefetch=()):
+        prioritarios = tuple(prioritarios)
+        prefetch = tuple(pid for pid in prefetch if pid not in prioritarios)
+        with self._condicao:
+            # a ordem só define a prioridade; reordenar as mesmas linhas não acorda o coletor
+            if (set(prioritarios), set(prefetch)) != (set(self.prioritarios), set(self.prefetch)):
+                self.prioritarios, self.prefetch = prioritarios, prefetch
+                self.versao += 1
+                self._condicao.notify_all()
+
+    def solicitar_varredura_completa(self):
+        with self._condicao:
+            self._varredura_completa = True
+            self.versao += 1
+            self._condicao.notify_all()
+
+    def aguardar(self, versao, timeout=None):
+        """Bloqueia até a demanda mudar (ou `timeout`); devolve (versao, prioritarios, prefetch, varredura_completa)."""
+        with self._condicao:
+            self._condicao.wait_for(lambda: self.versao != versao, timeout)
+            completa, self._varredura_completa = self._varredura_completa, False
+            return self.versao, self.prioritarios, self.prefetch, completa
+
+
+demanda_recursos = DemandaRecursos()
+
+
+class DemandaProcessos:
+    """
+    Quantos consumidores precisam da tabela completa de processos (janelas Processos abertas,
+    coletor headless, gravação, diário). Sem nenhum, o ciclo por PID fica parado em aguardar()
+    e a janela principal usa só os contadores globais (loadavg e /proc/stat).
+    """
+
+    def __init__(self):
+        self._condicao = threading.Condition()
+        self.consumidores = 0
+
+    def abrir(self):
+        with self._condicao:
+            self.consumidores += 1
+            self._condicao.notify_all()
+
+    def fechar(self):
+        with self._condicao:
+            self.consumidores = max(0, self.consumidores - 1)
+
+    def aguardar(self):
+        with self._condicao:
+            self._condicao.wait_for(lambda: self.consumidores > 0)
+
+
+demanda_processos = DemandaProcessos()
+
+
+# Uma tabela de sockets por acordada do inventário; rolagens seguidas reaproveitam a mesma
+VALIDADE_SOCKETS = 1.0 # segundos
+_sockets_recentes = (None, {})
+_lock_sockets_recentes = threading.Lock()
+
+def sockets_rede_recentes(validade=VALIDADE_SOCKETS):
+    """Mapa inode -> socket de no máximo `validade` segundos atrás (relê só quando venceu)."""
+    global _sockets_recentes, _global_network_sockets_info
+    with _lock_sockets_recentes:
+        instante, sockets = _sockets_recentes
+        agora = time.monotonic()
+        if instante is None or agora - instante >= validade:
+            with diagnosticoModel.medir("coleta.sockets"):
+                sockets = _ler_info_sockets_rede_global()
+            _sockets_recentes = (agora, sockets)
+            _global_network_sockets_info = sockets
+        return sockets
+
+
+def inventariar_recursos(pids, estatisticas=None, completo=False, sockets_info=None):
+
+    """
+    Inventário de FDs (com cache) de uma lista de PIDs, fora do ciclo base: {pid: recursos}.
+    O starttime vem de /proc/[pid]/stat para manter a chave do cache segura contra reuso de PID;
+    processos que já terminaram são omitidos. Com completo=True (`pids` = todos os processos)
+    o cache de FDs também é podado, o que importa quando não há ciclo base local (modo assinante).
+    `sockets_info` permite passar a mesma tabela de sockets para várias chamadas; sem ela usa-se
+    sockets_rede_recentes().
+    """
+
+    if not pids:
+        return {}
+    if sockets_info is None:
+        sockets_info = sockets_rede_recentes()
+
+    resultado = {}
+    vistos = set()
+    for pid in pids:
+        tempo_cpu = cpuProcesso(pid)
+        if tempo_cpu is None:
+            continue
+        vistos.add((pid, tempo_cpu["starttime"]))
+        t0 = diagnosticoModel.inicio()
+        resultado[pid] = listar_recursos_abertos_cache(pid, tempo_cpu["starttime"], sockets_info, estatisticas)
+        diagnosticoModel.fim("coleta.fds_por_pid", t0)
+    if completo:
+        podar_cache_fds(vistos)
+    return resultado
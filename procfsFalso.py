@@ -0,0 +1,156 @@
+# Gera uma árvore procfs sintética (N processos, M FDs por processo, K sockets) para medições reproduzíveis
+
+import argparse
+import os
+import random
+import socket
+import struct
+
+NUCLEOS_FALSOS = 4
+USUARIOS_FALSOS = (0, 1000, 1001, 65534)
+ESTADOS_FALSOS = ("S (sleeping)", "R (running)", "I (idle)", "D (disk sleep)")
+
+
+# MARK: Arquivos globais (stat, loadavg, meminfo, partitions, diskstats, mounts, net/*)
+
+def _escrever(caminho, conteudo):
+    with open(caminho, "w") as f:
+        f.write(conteudo)
+
+
+def _arquivos_globais(raiz, processos, aleatorio):
+    linhas = [f"cpu  {' '.join(str(aleatorio.randrange(10**6)) for _ in range(10))}"]
+    linhas += [f"cpu{n} {' '.join(str(aleatorio.randrange(10**5)) for _ in range(10))}" for n in range(NUCLEOS_FALSOS)]
+    linhas += ["intr 0", f"ctxt {aleatorio.randrange(10**9)}", "btime 1700000000",
+               f"processes {processos * 3}", "procs_running 2", "procs_blocked 0"]
+    _escrever(os.path.join(raiz, "stat"), "\n".join(linhas) + "\n")
+
+    _escrever(os.path.join(raiz, "loadavg"), f"0.50 0.40 0.30 2/{processos * 2} {processos}\n")
+
+    # mesma ordem de linhas do kernel: ler_meminfo busca as chaves em sequência
+    meminfo = ("MemTotal", "MemFree", "MemAvailable", "Buffers", "Cached", "SwapCached", "Active",
+               "Inactive", "Active(anon)", "Inactive(anon)", "Active(file)", "Inactive(file)",
+               "Unevictable", "Mlocked", "SwapTotal", "SwapFree")
+    valores = {"MemTotal": 16 * 1024**2, "MemAvailable": 9 * 1024**2, "SwapTotal": 4 * 1024**2, "SwapFree": 3 * 1024**2}
+    _escrever(os.path.join(raiz, "meminfo"),
+              "".join(f"{nome + ':':<16}{valores.get(nome, 1024):>8} kB\n" for nome in meminfo))
+
+    _escrever(os.path.join(raiz, "partitions"),
+              "major minor  #blocks  name\n\n   8        0  500107608 sda\n   8        1  500106584 sda1\n")
+    _escrever(os.path.join(raiz, "diskstats"),
+              "".join(f"   8       {n} {nome} {' '.join(str(aleatorio.randrange(10**6)) for _ in range(17))}\n"
+                      for n, nome in enumerate(("sda", "sda1"))))
+    _escrever(os.path.join(raiz, "mounts"),
+              "/dev/sda1 / ext4 rw,relatime 0 0\nproc /proc proc rw,nosuid,nodev,noexec,relatime 0 0\n")
+
+
+def _arquivos_sockets(raiz, sockets, aleatorio):
+    """Distribui os K sockets entre net/tcp, udp, tcp6 e udp6; devolve os inodes criados."""
+    os.makedirs(os.path.join(raiz, "net"), exist_ok=True)
+    cabecalho = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+    arquivos = {nome: [cabecalho] for nome in ("tcp", "udp", "tcp6", "udp6")}
+    inodes = []
+    for n in range(sockets):
+        nome = ("tcp", "udp", "tcp6", "udp6")[n % 4]
+        inode = 100000 + n
+        inodes.append(inode)
+        if nome.endswith("6"):
+            # como o kernel: quatro palavras de 32 bits, cada uma na ordem do host
+            local = "".join(f"{p:08X}" for p in struct.unpack("<4L", socket.inet_pton(socket.AF_INET6, "::1")))
+            remoto = "0" * 32
+        else:
+            local = f"{struct.unpack('<L', socket.inet_aton('127.0.0.1'))[0]:08X}"
+            remoto = "00000000"
+        estado = 10 if n % 3 == 0 else 1
+        arquivos[nome].append(
+            f"{len(arquivos[nome]) - 1:4}: {local}:{1024 + n % 60000:04X} {remoto}:0000 {estado:02X} "
+            f"00000000:00000000 00:00000000 00000000  {aleatorio.choice(USUARIOS_FALSOS)}        0 {inode}\n")
+    for nome, linhas in arquivos.items():
+        _escrever(os.path.join(raiz, "net", nome), "".join(linhas))
+    _escrever(os.path.join(raiz, "net", "dev"),
+              "Inter-|   Receive                                                |  Transmit\n"
+              " face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed\n"
+              + "".join(f"{nome:>6}: {' '.join(str(aleatorio.randrange(10**9)) for _ in range(16))}\n" for nome in ("lo", "eth0")))
+    return inodes
+
+
+# MARK: Processos
+
+def _arquivos_processo(raiz, pid, fds, inodes_sockets, arquivo_comum, aleatorio):
+    base = os.path.join(raiz, str(pid))
+    os.makedirs(os.path.join(base, "fd"))
+
+    rss = aleatorio.randrange(1024, 512 * 1024)
+    threads = aleatorio.choice((1, 1, 1, 2, 4, 16))
+    _escrever(os.path.join(base, "status"),
+              f"Name:\tproc{pid}\nState:\t{aleatorio.choice(ESTADOS_FALSOS)}\nPid:\t{pid}\n"
+              f"Uid:\t{aleatorio.choice(USUARIOS_FALSOS)}\t0\t0\t0\n"
+              f"VmSize:\t{rss * 4} kB\nVmRSS:\t{rss} kB\nVmData:\t{rss // 2} kB\nVmStk:\t132 kB\nVmExe:\t{rss // 16} kB\n"
+              f"Threads:\t{threads}\n")
+    # campos de /proc/[pid]/stat a partir do 3º; o nome entre parênteses pode ter espaços
+    campos = ["S", "1", str(pid), str(pid), "0", "-1", "4194560",
+              str(aleatorio.randrange(10**5)), "0", str(aleatorio.randrange(100)), "0",
+              str(aleatorio.randrange(10**5)), str(aleatorio.randrange(10**4)), "0", "0", "20", "0",
+              str(threads), "0", str(aleatorio.randrange(10**7)), str(rss * 4096), str(rss // 4)]
+    _escrever(os.path.join(base, "stat"), f"{pid} (proc {pid}) {' '.join(campos)}\n")
+    _escrever(os.path.join(base, "statm"), f"{rss} {rss // 4} 100 10 0 {rss // 2} 0\n")
+
+    # FDs: links simbólicos com os mesmos alvos que o kernel expõe
+    for fd in range(fds):
+        tipo = fd % 4
+        if tipo == 0:
+            alvo = "/dev/null"
+        elif tipo == 1 and inodes_sockets:
+            alvo = f"socket:[{aleatorio.choice(inodes_sockets)}]"
+        elif tipo == 2:
+            alvo = f"pipe:[{aleatorio.randrange(10**6)}]"
+        else:
+            alvo = arquivo_comum
+        os.symlink(alvo, os.path.join(base, "fd", str(fd)))
+
+
+def gerar_procfs(raiz, processos, fds_por_processo=8, sockets=256, semente=0):
+
+    """
+    Cria em `raiz` um procfs sintético com `processos` PIDs, `fds_por_processo` FDs em cada um
+    e `sockets` sockets em net/*. A mesma semente gera sempre a mesma árvore.
+    Um arquivo .parametros marca a árvore pronta: chamar de novo com os mesmos parâmetros não regera.
+    """
+
+    raiz = os.path.abspath(raiz) # os FDs apontam para arquivos dentro da árvore
+    parametros = f"{processos} {fds_por_processo} {sockets} {semente}\n"
+    marcador = os.path.join(raiz, ".parametros")
+    try:
+        with open(marcador) as f:
+            if f.read() == parametros:
+                return raiz
+    except FileNotFoundError:
+        pass
+    if os.path.exists(raiz) and os.listdir(raiz):
+        raise FileExistsError(f"{raiz} já existe com outro conteúdo; escolha um diretório vazio")
+
+    aleatorio = random.Random(semente)
+    os.makedirs(raiz, exist_ok=True)
+    _arquivos_globais(raiz, processos, aleatorio)
+    inodes = _arquivos_sockets(raiz, sockets, aleatorio)
+    arquivo_comum = os.path.join(raiz, "arquivo_aberto")
+    _escrever(arquivo_comum, "dados\n")
+
+    for pid in range(1, processos + 1):
+        _arquivos_processo(raiz, pid, fds_por_processo, inodes, arquivo_comum, aleatorio)
+
+    _escrever(marcador, parametros)
+    return raiz
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera uma árvore procfs sintética")
+    parser.add_argument("destino")
+    parser.add_argument("--processos", type=int, default=1000)
+    parser.add_argument("--fds", type=int, default=8, help="FDs por processo")
+    parser.add_argument("--sockets", type=int, default=256)
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    raiz = gerar_procfs(args.destino, args.processos, args.fds, args.sockets, args.semente)
+    print(f"procfs sintético em {raiz} (use DASHBOARD_PROC={raiz})")
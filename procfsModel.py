@@ -0,0 +1,26 @@
+import os
+
+# Raiz do procfs lida por todos os modelos. Trocá-la (ex.: por uma árvore gerada com procfsFalso.py)
+# permite medir a coleta de forma reproduzível, sem depender dos processos da máquina.
+RAIZ_PROC = os.environ.get("DASHBOARD_PROC", "/proc")
+
+
+def definir_raiz_proc(raiz):
+
+    """Aponta os leitores para outra raiz de procfs. Deve ser chamada antes da primeira coleta
+    (o pool de processos da coleta paralela herda a raiz pela variável de ambiente)."""
+
+    global RAIZ_PROC
+    RAIZ_PROC = raiz.rstrip("/") or "/"
+    os.environ["DASHBOARD_PROC"] = RAIZ_PROC
+
+
+def caminho_proc(*partes):
+
+    """Ex.: caminho_proc("net", "tcp") -> "/proc/net/tcp" (ou o equivalente na raiz configurada)."""
+
+    return os.path.join(RAIZ_PROC, *map(str, partes))
+
+
+def procfs_real():
+    return RAIZ_PROC == "/proc"
@@ -0,0 +1,108 @@
+import os
+import statistics
+import time
+import tkinter as tk
+import zlib
+
+import coletorDaemon
+from view import dashboard_view, atualizar_interface
+from systemModel import listarDiretorioEmLotes
+
+
+# MARK: Gravação de capturas (mesmo quadro binário do coletor headless)
+
+class GravadorCaptura:
+    """Acrescenta cada snapshot a um arquivo de captura, um quadro por versão, sem reescrever o que já foi gravado."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.versao = 0
+        self._fd = os.open(caminho, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+
+    def gravar(self, snapshot):
+        self.versao += 1
+        os.write(self._fd, coletorDaemon.codificar_quadro(self.versao, snapshot))
+
+    def fechar(self):
+        os.close(self._fd)
+
+
+def ler_captura(caminho):
+
+    """Gera (instante, snapshot) sob demanda: só o quadro corrente fica em memória, qualquer que seja o tamanho da captura."""
+
+    with open(caminho, "rb") as arquivo:
+        while True:
+            try:
+                _, instante, snapshot = coletorDaemon.ler_quadro(arquivo)
+            except ConnectionError:
+                return # fim do arquivo (ou último quadro truncado por uma gravação interrompida)
+            except (ValueError, zlib.error) as e:
+                print(f"Captura corrompida em {caminho}: {e}")
+                return
+            yield instante, snapshot
+
+
+# MARK: Reprodução acelerada
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def reproduzir(caminho, velocidade=1.0):
+
+    """
+    Alimenta a interface com os snapshots gravados, respeitando os intervalos originais
+    divididos por `velocidade` (None = o mais rápido possível). Ao final imprime quadros
+    por segundo e a latência de renderização (atualizar_interface + update_idletasks).
+    """
+
+    quadros = ler_captura(caminho)
+    latencias = []
+    estado = {"t0_captura": None, "t0_relogio": None}
+
+    def proximo(instante, snapshot):
+        if estado["t0_captura"] is None:
+            estado["t0_captura"] = instante
+            estado["t0_relogio"] = time.perf_counter()
+
+        inicio = time.perf_counter()
+        atualizar_interface(snapshot.get("cpu", {}), snapshot.get("mem", {}), snapshot.get("proc", {}),
+                            io=snapshot.get("io", {}))
+        root.update_idletasks() # inclui o desenho na medida, não só a atualização dos widgets
+        latencias.append(time.perf_counter() - inicio)
+
+        agendar()
+
+    def agendar():
+        # lê o próximo quadro antes e o agenda pelo instante dele, não pelo do quadro que acabou de ser desenhado
+        try:
+            instante, snapshot = next(quadros)
+        except StopIteration:
+            root.destroy()
+            return
+        atraso = 0 if estado["t0_captura"] is None else _atraso_ms(instante)
+        root.after(atraso, proximo, instante, snapshot)
+
+    def _atraso_ms(instante):
+        if velocidade is None:
+            return 0
+        # agenda pelo relógio absoluto para que a latência de renderização não acumule atraso
+        alvo = estado["t0_relogio"] + (instante - estado["t0_captura"]) / velocidade
+        return max(0, int((alvo - time.perf_counter()) * 1000))
+
+    root = tk.Tk()
+    root.title(f"Reprodução: {os.path.basename(caminho)}")
+    dashboard_view(root, {}, {}, {}, lambda caminho, cancelado=None, reler=False: listarDiretorioEmLotes(caminho, cancelado=cancelado, reler=reler))
+    root.after(0, agendar)
+
+    inicio_total = time.perf_counter()
+    root.mainloop()
+    duracao = time.perf_counter() - inicio_total
+
+    if latencias:
+        print(f"{len(latencias)} quadros em {duracao:.2f}s ({len(latencias) / duracao:.1f} quadros/s)")
+        print(f"latência de renderização: p50 {statistics.median(latencias) * 1000:.1f} ms, "
+              f"p95 {_percentil(latencias, 0.95) * 1000:.1f} ms, máx {max(latencias) * 1000:.1f} ms")
+    return latencias
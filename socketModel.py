@@ -0,0 +1,194 @@
+import errno
+import os
+import socket
+import struct
+
+# MARK: Constantes do NETLINK_SOCK_DIAG (linux/sock_diag.h, inet_diag.h, unix_diag.h)
+
+NETLINK_SOCK_DIAG = 4
+SOCK_DIAG_BY_FAMILY = 20
+
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300          # NLM_F_ROOT | NLM_F_MATCH
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+
+UDIAG_SHOW_NAME = 0x1
+UDIAG_SHOW_PEER = 0x4
+UNIX_DIAG_NAME = 0
+UNIX_DIAG_PEER = 2
+
+_NLMSGHDR = struct.Struct("=IHHII")                 # len, type, flags, seq, pid
+_INET_DIAG_REQ_V2 = struct.Struct("=BBBxI48s")     # family, protocol, ext, pad, states, inet_diag_sockid
+_INET_DIAG_MSG = struct.Struct("=BBBB2s2s16s16sI8sIIIII")  # family, state, timer, retrans, sockid..., expires, rqueue, wqueue, uid, inode
+_UNIX_DIAG_REQ = struct.Struct("=BBxxIII8s")        # family, protocol, pad, states, ino, show, cookie
+_UNIX_DIAG_MSG = struct.Struct("=BBBxI8s")          # family, type, state, pad, ino, cookie
+_RTATTR = struct.Struct("=HH")
+
+# Estados TCP como bits (1 << estado). TIME_WAIT e SYN_RECV/NEW_SYN_RECV não têm dono (inode 0),
+# então filtrá-los no kernel reduz a resposta sem perder nada que apareça em /proc/[pid]/fd.
+ESTADOS_TODOS = 0xFFFFFFFF
+ESTADOS_COM_DONO = ESTADOS_TODOS & ~((1 << 3) | (1 << 6) | (1 << 12))
+
+_NOMES_ESTADO_TCP = {
+    1: "ESTABLISHED", 2: "SYN_SENT", 3: "SYN_RECV", 4: "FIN_WAIT1",
+    5: "FIN_WAIT2", 6: "TIME_WAIT", 7: "CLOSE", 8: "CLOSE_WAIT",
+    9: "LAST_ACK", 10: "LISTEN", 11: "CLOSING", 12: "NEW_SYN_RECV"
+}
+
+# erros no dump de um protocolo que indicam só a falta do módulo dele (ex.: udp_diag ou unix_diag
+# ausentes num kernel mínimo ou contêiner); os outros protocolos continuam pelo netlink
+ERROS_PROTOCOLO_AUSENTE = {errno.ENOENT, errno.EOPNOTSUPP, errno.EPROTONOSUPPORT, errno.EAFNOSUPPORT, errno.EINVAL}
+
+_TIPOS_UNIX = {
+    socket.SOCK_STREAM: "stream",
+    socket.SOCK_DGRAM: "dgram",
+    socket.SOCK_SEQPACKET: "seqpacket",
+}
+
+
+# MARK: Transporte netlink
+
+def _consultar_sock_diag(sock, payload, seq):
+
+    """Envia um pedido de dump SOCK_DIAG_BY_FAMILY e devolve o payload de cada mensagem de resposta."""
+
+    cabecalho = _NLMSGHDR.pack(_NLMSGHDR.size + len(payload), SOCK_DIAG_BY_FAMILY,
+                               NLM_F_REQUEST | NLM_F_DUMP, seq, 0)
+    sock.send(cabecalho + payload)
+
+    buffer = bytearray(65536)
+    while True:
+        n = sock.recv_into(buffer)
+        dados = memoryview(buffer)[:n]
+        deslocamento = 0
+        while deslocamento + _NLMSGHDR.size <= n:
+            tamanho, tipo, _, _, _ = _NLMSGHDR.unpack_from(dados, deslocamento)
+            if tamanho < _NLMSGHDR.size:
+                return
+            if tipo == NLMSG_DONE:
+                return
+            if tipo == NLMSG_ERROR:
+                erro = -struct.unpack_from("=i", dados, deslocamento + _NLMSGHDR.size)[0]
+                if erro:
+                    raise OSError(erro, os.strerror(erro))
+                return
+            yield bytes(dados[deslocamento + _NLMSGHDR.size:deslocamento + tamanho])
+            deslocamento += (tamanho + 3) & ~3
+
+
+def _formatar_endereco(familia, bruto, porta_be):
+    porta = struct.unpack(">H", porta_be)[0]
+    if familia == socket.AF_INET:
+        return f"{socket.inet_ntop(socket.AF_INET, bruto[:4])}:{porta}"
+    return f"{socket.inet_ntop(socket.AF_INET6, bruto)}:{porta}"
+
+
+# MARK: Sockets de rede (INET_DIAG)
+
+def listar_sockets_inet(sock, familia, protocolo, estados=ESTADOS_COM_DONO, seq=1):
+
+    """Lista sockets TCP/UDP de uma família via INET_DIAG. Retorna {inode: detalhes}."""
+
+    nome_proto = ("tcp" if protocolo == socket.IPPROTO_TCP else "udp") + ("6" if familia == socket.AF_INET6 else "")
+    pedido = _INET_DIAG_REQ_V2.pack(familia, protocolo, 0, estados, bytes(48))
+    sockets_info = {}
+
+    for msg in _consultar_sock_diag(sock, pedido, seq):
+        (fam, estado, _, _, sport, dport, src, dst, _, _,
+         _, _, _, _, inode) = _INET_DIAG_MSG.unpack_from(msg)
+        if not inode:
+            continue
+        sockets_info[inode] = {
+            "protocolo": nome_proto,
+            "local_address": _formatar_endereco(fam, src, sport),
+            "remote_address": _formatar_endereco(fam, dst, dport),
+            "state": _NOMES_ESTADO_TCP.get(estado, f"UNKNOWN({estado})"),
+            "inode": inode,
+        }
+    return sockets_info
+
+
+# MARK: Sockets Unix (UNIX_DIAG)
+
+def listar_sockets_unix(sock, seq=1):
+
+    """Lista sockets Unix com caminho (ou @nome abstrato) e inode do par via UNIX_DIAG."""
+
+    pedido = _UNIX_DIAG_REQ.pack(socket.AF_UNIX, 0, ESTADOS_TODOS, 0,
+                                 UDIAG_SHOW_NAME | UDIAG_SHOW_PEER, b"\xff" * 8)
+    sockets_info = {}
+
+    for msg in _consultar_sock_diag(sock, pedido, seq):
+        _, tipo, estado, inode, _ = _UNIX_DIAG_MSG.unpack_from(msg)
+        caminho = ""
+        par = None
+
+        deslocamento = _UNIX_DIAG_MSG.size
+        while deslocamento + _RTATTR.size <= len(msg):
+            tamanho, tipo_attr = _RTATTR.unpack_from(msg, deslocamento)
+            if tamanho < _RTATTR.size:
+                break
+            valor = msg[deslocamento + _RTATTR.size:deslocamento + tamanho]
+            if tipo_attr == UNIX_DIAG_NAME:
+                # nomes abstratos começam com \0; exibidos com '@' como no ss(8)
+                if valor[:1] == b"\0":
+                    caminho = "@" + valor[1:].decode(errors="replace")
+                else:
+                    caminho = valor.rstrip(b"\0").decode(errors="replace")
+            elif tipo_attr == UNIX_DIAG_PEER:
+                par = struct.unpack_from("=I", valor)[0]
+            deslocamento += (tamanho + 3) & ~3
+
+        sockets_info[inode] = {
+            "protocolo": "unix",
+            "tipo_unix": _TIPOS_UNIX.get(tipo, str(tipo)),
+            "local_address": caminho or "(sem nome)",
+            "remote_address": f"peer:[{par}]" if par else "N/A",
+            "state": _NOMES_ESTADO_TCP.get(estado, f"UNKNOWN({estado})"),
+            "inode": inode,
+        }
+    return sockets_info
+
+
+# MARK: Inventário completo
+
+def inventarioSocketsNetlink(estados=ESTADOS_COM_DONO, incluir_unix=True, ignorar=(), ausentes=None):
+
+    """
+    Monta o mapa inode -> socket de todo o sistema usando NETLINK_SOCK_DIAG
+    (TCP/UDP em IPv4/IPv6 e, opcionalmente, Unix). Levanta OSError se o socket
+    netlink não puder ser criado (kernel sem sock_diag) ou se um dump falhar de
+    forma passageira; o chamador deve cair no parser de /proc/net.
+    Protocolos ("tcp", "udp", "tcp6", "udp6", "unix") em `ignorar` não são pedidos. Os que
+    falham por falta do módulo de diag são pulados e anotados em `ausentes` ({nome: OSError}).
+    """
+
+    sockets_info = {}
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_SOCK_DIAG) as sock:
+        seq = 1
+        pedidos = [
+            (("tcp" if protocolo == socket.IPPROTO_TCP else "udp") + ("6" if familia == socket.AF_INET6 else ""),
+             familia, protocolo)
+            for familia in (socket.AF_INET, socket.AF_INET6)
+            for protocolo in (socket.IPPROTO_TCP, socket.IPPROTO_UDP)
+        ]
+        if incluir_unix:
+            pedidos.append(("unix", socket.AF_UNIX, 0))
+        for nome, familia, protocolo in pedidos:
+            if nome in ignorar:
+                continue
+            try:
+                if familia == socket.AF_UNIX:
+                    sockets_info.update(listar_sockets_unix(sock, seq))
+                else:
+                    # UDP não tem máquina de estados TCP; pede todos
+                    filtro = estados if protocolo == socket.IPPROTO_TCP else ESTADOS_TODOS
+                    sockets_info.update(listar_sockets_inet(sock, familia, protocolo, filtro, seq))
+            except OSError as e:
+                if e.errno not in ERROS_PROTOCOLO_AUSENTE:
+                    raise
+                if ausentes is not None:
+                    ausentes[nome] = e
+            seq += 1
+    return sockets_info
@@ -1,56 +1,234 @@
 import os
+import re
+import stat
+import time
+import select
+import struct
+import ctypes
 import datetime
+import threading
+from collections import OrderedDict
+
+import procfsModel
+import diagnosticoModel
+from processModel import identidades, libc
 
 # Mark: Obtem informaçoes de uso de espaço para um dado diretorio
+def _uso_de_statvfs(statsInfo):
+    totalBytes = statsInfo.f_blocks * statsInfo.f_bsize
+    freeBytes = statsInfo.f_bfree * statsInfo.f_bsize
+    totalAvailableBytes = statsInfo.f_bavail * statsInfo.f_bsize
+    usedBytes = totalBytes - freeBytes
+    percentUsed = (usedBytes / totalBytes) * 100 if totalBytes else 0
+
+    return{
+        "Tamanho Total (Gb)": round(totalBytes / (1024 ** 3), 2),
+        "Espaço Usado (Mb)": round(usedBytes / (1024 ** 2), 2),
+        "Espaço Livre (Gb)": round(freeBytes / (1024 ** 3), 2),
+        "Espaço Disponível (Gb)": round(totalAvailableBytes / (1024 ** 3), 2),
+        "Percentual de Uso (%)": round(percentUsed, 2)  
+    }
+
 def getUsagePartition(diretctory):
+    # síncrono: pode travar num NFS/FUSE morto; a interface usa tabela_montagens.montagens()
     try:
-        statsInfo = os.statvfs(diretctory)
-
-        totalBytes = statsInfo.f_blocks * statsInfo.f_bsize
-        freeBytes = statsInfo.f_bfree * statsInfo.f_bsize
-        totalAvailableBytes = statsInfo.f_bavail * statsInfo.f_bsize
-        usedBytes = totalBytes - freeBytes
-        percentUsed = (usedBytes / totalBytes) * 100
-
-        return{
-            "Tamanho Total (Gb)": round(totalBytes / (1024 ** 3), 2),
-            "Espaço Usado (Mb)": round(usedBytes / (1024 ** 2), 2),
-            "Espaço Livre (Gb)": round(freeBytes / (1024 ** 3), 2),
-            "Espaço Disponível (Gb)": round(totalAvailableBytes / (1024 ** 3), 2),
-            "Percentual de Uso (%)": round(percentUsed, 2)  
-        }
-    except Exception as e:
+        return _uso_de_statvfs(os.statvfs(diretctory))
+    except Exception:
         print(f"Erro: O diretório '{diretctory}' não foi encontrado.")
         return None    
 
 
+# Mark: Tabela de montagens (mountinfo relido só quando muda) e statvfs com tempo limite
+TEMPO_LIMITE_STATVFS = 2.0  # segundos sem resposta até a montagem ser marcada como "sem resposta"
+VALIDADE_USO = 5.0          # segundos em que o resultado de um statvfs é reaproveitado
+
+# sistemas de arquivos sem espaço em disco próprio (como os "dummy" do df)
+SISTEMAS_PSEUDO = frozenset((
+    "proc", "sysfs", "devtmpfs", "devpts", "cgroup", "cgroup2", "securityfs", "pstore", "debugfs",
+    "tracefs", "mqueue", "hugetlbfs", "configfs", "fusectl", "binfmt_misc", "autofs", "bpf",
+    "rpc_pipefs", "nsfs", "selinuxfs", "efivarfs", "rootfs", "ramfs", "nfsd", "fuse.gvfsd-fuse",
+    "fuse.portal",
+))
+
+def _desescapar(campo):
+    # mountinfo escapa espaço, tab, \n e \\ como \ooo (octal)
+    if "\\" not in campo:
+        return campo
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), campo)
+
+def _ler_mountinfo(texto):
+    """[{dispositivo, ponto, raiz, tipo, opcoes, origem}] de /proc/self/mountinfo."""
+    entradas = []
+    for linha in texto.splitlines():
+        campos = linha.split()
+        try:
+            separador = campos.index("-", 6) # campos opcionais (shared:N...) têm tamanho variável
+        except ValueError:
+            continue
+        entradas.append({
+            "dispositivo": campos[2],        # major:minor
+            "raiz": _desescapar(campos[3]),  # subárvore montada (≠ "/" em bind mounts)
+            "ponto": _desescapar(campos[4]),
+            "opcoes": campos[5],
+            "tipo": campos[separador + 1],
+            "origem": _desescapar(campos[separador + 2]) if len(campos) > separador + 2 else "none",
+        })
+    return entradas
+
+def _ler_mounts(texto):
+    """Mesmo formato a partir de /proc/mounts (sem major:minor: o dispositivo faz as vezes)."""
+    entradas = []
+    for linha in texto.splitlines():
+        campos = linha.split()
+        if len(campos) >= 4:
+            entradas.append({"dispositivo": campos[0], "raiz": "/", "ponto": _desescapar(campos[1]),
+                             "opcoes": campos[3], "tipo": campos[2], "origem": campos[0]})
+    return entradas
+
+def _filtrar_montagens(entradas):
+    """
+    Tira pseudo-sistemas de arquivos, montagens encobertas (outra montada depois no mesmo ponto)
+    e montagens repetidas do mesmo dispositivo (bind mounts), mantendo a que expõe a raiz do
+    sistema de arquivos, ou a de caminho mais curto.
+    """
+    visiveis = {}
+    for e in entradas:
+        if e["tipo"] not in SISTEMAS_PSEUDO:
+            visiveis.pop(e["ponto"], None) # a última montagem no ponto é a que vale
+            visiveis[e["ponto"]] = e
+    por_dispositivo = {}
+    for e in visiveis.values():
+        atual = por_dispositivo.get(e["dispositivo"])
+        if atual is None or (e["raiz"] != "/", len(e["ponto"])) < (atual["raiz"] != "/", len(atual["ponto"])):
+            por_dispositivo[e["dispositivo"]] = e
+    escolhidas = {id(e) for e in por_dispositivo.values()}
+    return [e for e in visiveis.values() if id(e) in escolhidas]
+
+class _UsoMontagem:
+    __slots__ = ("resultado", "instante", "erro", "inicio", "pronto")
+
+    def __init__(self):
+        self.resultado = None # último uso obtido (pode estar velho)
+        self.instante = None  # monotonic do último resultado
+        self.erro = None
+        self.inicio = None    # monotonic do statvfs em andamento (None = nenhum)
+        self.pronto = threading.Event()
+
+class TabelaMontagens:
+    """
+    Mantém /proc/self/mountinfo aberto e só o relê quando poll() acusa POLLPRI (o kernel sinaliza
+    a cada mount/umount). O statvfs de cada montagem roda numa thread própria, no máximo um por
+    montagem ao mesmo tempo, e o resultado vale por VALIDADE_USO segundos. Quem consulta espera
+    no máximo `espera` segundos no total, então um NFS ou FUSE morto nunca trava o chamador: a
+    montagem só aparece como "pendente" e, depois de TEMPO_LIMITE_STATVFS, como "sem resposta".
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._arquivo = None
+        self._poll = None
+        self._entradas = None
+        self._usos = {} # ponto -> _UsoMontagem
+
+    def _reler(self):
+        if self._arquivo is None:
+            try:
+                self._arquivo = open(procfsModel.caminho_proc("self", "mountinfo"))
+                self._poll = select.poll()
+                self._poll.register(self._arquivo, select.POLLPRI | select.POLLERR)
+            except OSError:
+                # sem mountinfo (procfs sintético): relê /proc/mounts a cada consulta
+                with open(procfsModel.caminho_proc("mounts")) as f:
+                    return _filtrar_montagens(_ler_mounts(f.read()))
+        elif self._entradas is not None and not self._poll.poll(0):
+            return self._entradas
+        self._arquivo.seek(0)
+        self._entradas = _filtrar_montagens(_ler_mountinfo(self._arquivo.read()))
+        diagnosticoModel.contar("montagens.releituras")
+        for ponto in set(self._usos) - {e["ponto"] for e in self._entradas}:
+            del self._usos[ponto]
+        return self._entradas
+
+    def _statvfs(self, ponto, uso):
+        try:
+            resultado, erro = _uso_de_statvfs(os.statvfs(ponto)), None
+        except OSError as e:
+            resultado, erro = None, e
+        with self._lock:
+            uso.resultado, uso.erro = resultado, erro
+            uso.instante = time.monotonic()
+            uso.inicio = None
+            uso.pronto.set()
+
+    def montagens(self, espera=0.0):
+
+        """
+        [{"Dispositivo de Bloco", "Diretorio", "Opçoes de Montagem", "Tipo", "Uso", "Estado"}]
+        "Uso" é o dicionário de getUsagePartition (ou None); "Estado" é "ok", "pendente",
+        "sem resposta" ou "erro".
+        """
+
+        agora = time.monotonic()
+        with self._lock:
+            entradas = self._reler()
+            aguardando = []
+            for e in entradas:
+                uso = self._usos.get(e["ponto"])
+                if uso is None:
+                    uso = self._usos[e["ponto"]] = _UsoMontagem()
+                vencido = uso.instante is None or agora - uso.instante > VALIDADE_USO
+                if vencido and uso.inicio is None:
+                    uso.inicio = agora
+                    uso.pronto.clear()
+                    threading.Thread(target=self._statvfs, args=(e["ponto"], uso), daemon=True).start()
+                if uso.inicio is not None:
+                    aguardando.append(uso)
+
+        limite = agora + espera
+        for uso in aguardando:
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                break
+            uso.pronto.wait(restante)
+
+        agora = time.monotonic()
+        linhas = []
+        with self._lock:
+            for e in entradas:
+                uso = self._usos.get(e["ponto"]) or _UsoMontagem()
+                if uso.inicio is not None:
+                    estado = "sem resposta" if agora - uso.inicio > TEMPO_LIMITE_STATVFS else "pendente"
+                elif uso.erro is not None:
+                    estado = "erro"
+                else:
+                    estado = "ok"
+                linhas.append({
+                    "Dispositivo de Bloco": e["origem"],
+                    "Diretorio": e["ponto"],
+                    "Opçoes de Montagem": e["opcoes"],
+                    "Tipo": e["tipo"],
+                    "Uso": uso.resultado,
+                    "Estado": estado,
+                })
+        return linhas
+
+tabela_montagens = TabelaMontagens()
+
+
 # Mark: Funçao para leitura de arquivos
-def getFileSystem ():
+def getFileSystem (espera=TEMPO_LIMITE_STATVFS):
+    # pares (montagem, uso) como antes; montagens sem resposta em `espera` segundos ficam sem o uso
 
     partitions = []
     
     try:
-        with open("/proc/mounts", "r") as f:
-            for line in f:
-                print(line.strip())  
-                parts = line.split()
-                partitions.append({
-                    "Dispositivo de Bloco": parts[0],
-                    "Diretorio": parts[1],
-                    "Opçoes de Montagem": parts[3]
-                })
-
-                usage = getUsagePartition(parts[1])
-                if usage:
-                    details = {
-                        "Tamanho Total (Gb)": usage["Tamanho Total (Gb)"],
-                        "Espaço Usado (Mb)": usage["Espaço Usado (Mb)"],
-                        "Espaço Livre (Gb)": usage["Espaço Livre (Gb)"],
-                        "Espaço Disponível (Gb)": usage["Espaço Disponível (Gb)"],
-                        "Percentual de Uso (%)": usage["Percentual de Uso (%)"]
-                    }
-                    usage.update(details)
-                    partitions.append(usage)
+        for montagem in tabela_montagens.montagens(espera):
+            partitions.append({
+                "Dispositivo de Bloco": montagem["Dispositivo de Bloco"],
+                "Diretorio": montagem["Diretorio"],
+                "Opçoes de Montagem": montagem["Opçoes de Montagem"]
+            })
+            partitions.append(montagem["Uso"] or {})
     except FileNotFoundError:
         print("Erro: O arquivo /proc/mounts não foi encontrado.")
         return None
@@ -63,32 +241,284 @@ def getFileSystem ():
 #    print()  
 
 
+# Mark: Listagem de diretório em lotes (os.scandir + um lstat por entrada)
+TAMANHO_LOTE_DIRETORIO = 500
+
+def _formatar_data(instante):
+    return datetime.datetime.fromtimestamp(instante).strftime('%Y-%m-%d %H:%M:%S')
+
+def _atributos_entrada(entrada):
+    """Monta o registro de uma entrada a partir de um único lstat (o d_type do scandir dispensa o resto)."""
+    itemStat = entrada.stat(follow_symlinks=False)
+    diretorio = stat.S_ISDIR(itemStat.st_mode)
+    if not diretorio and stat.S_ISLNK(itemStat.st_mode):
+        diretorio = entrada.is_dir() # link para diretório continua navegável (stat extra só para links)
+
+    return {
+        "Nome": entrada.name,
+        "Caminho": entrada.path,
+        "Permissões": oct(itemStat.st_mode)[-3:],
+        "Dono": identidades.usuario(itemStat.st_uid),
+        "Data de Criação": _formatar_data(itemStat.st_ctime),
+        "Data de Modificação": _formatar_data(itemStat.st_mtime),
+        "Tipo": "Diretório" if diretorio else "Arquivo",
+        "Tamanho (Bytes)": 0 if diretorio else itemStat.st_size
+    }
+
+# Mark: Cache LRU de listagens, invalidado por inotify
+LIMITE_CACHE_DIRETORIOS = 32 * 1024**2 # bytes (estimados) de registros guardados
+
+# constantes de <sys/inotify.h>
+IN_MODIFY, IN_ATTRIB, IN_CLOSE_WRITE = 0x002, 0x004, 0x008
+IN_MOVED_FROM, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x040, 0x080, 0x100, 0x200
+IN_DELETE_SELF, IN_MOVE_SELF, IN_UNMOUNT, IN_Q_OVERFLOW, IN_IGNORED = 0x400, 0x800, 0x2000, 0x4000, 0x8000
+IN_ONLYDIR, IN_NONBLOCK, IN_CLOEXEC = 0x01000000, 0o4000, 0o2000000
+# qualquer mudança que altere alguma coluna da listagem (nome, tamanho, datas, dono, permissões)
+MASCARA_DIRETORIO = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+                     | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENTO_INOTIFY = struct.Struct("iIII") # wd, mask, cookie, len (o nome vem em seguida)
+
+# f_type (statfs(2)) de sistemas de arquivos em que o inotify não vê as mudanças: pseudo-arquivos
+# gerados pelo kernel (proc, sysfs, cgroup...) e sistemas remotos/userspace (NFS, SMB, FUSE, 9p...)
+SEM_INOTIFY = {
+    0x9fa0,      # proc
+    0x62656572,  # sysfs
+    0x27e0eb,    # cgroup
+    0x63677270,  # cgroup2
+    0x64626720,  # debugfs
+    0x74726163,  # tracefs
+    0x73636673,  # securityfs
+    0x62656570,  # configfs
+    0x6165676c,  # pstore
+    0xcafe4a11,  # bpf
+    0x6969,      # nfs
+    0x517b,      # smb
+    0xff534d42,  # cifs
+    0xfe534d42,  # smb2
+    0x65735546,  # fuse
+    0x01021997,  # 9p (v9fs)
+    0x00c36400,  # ceph
+}
+
+def _custo_registro(registro):
+    return 400 + len(registro["Nome"]) + len(registro["Caminho"]) # dict + strings, aproximado
+
+class CacheDiretorios:
+    """
+    Listagens completas de diretórios, em ordem LRU e limitadas por memória. Cada diretório em
+    cache tem um watch inotify: qualquer evento nele (entrada criada, removida, renomeada,
+    modificada, atributos) descarta só aquela listagem. Os eventos pendentes são lidos sem
+    bloquear antes de cada consulta, então não há thread extra. Sem inotify, o cache fica desligado.
+    """
+
+    def __init__(self, limite=LIMITE_CACHE_DIRETORIOS):
+        self.limite = limite
+        self._lock = threading.Lock()
+        self._listagens = OrderedDict() # caminho -> (registros, custo)
+        self._custo = 0
+        self._watches = {}              # wd -> conjunto de caminhos (o mesmo inode devolve o mesmo wd)
+        self._wd_por_caminho = {}
+        self._invalidacoes = {}         # caminho -> contador, p/ descartar listagens que mudaram durante o scandir
+        self._usos = {}                 # caminho -> listagens em andamento (entre preparar e liberar)
+        try:
+            libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+            self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        except AttributeError:
+            self._fd = -1
+        if self._fd < 0:
+            print("Cache de diretórios desativado: inotify indisponível.")
+
+    @property
+    def ativo(self):
+        return self._fd >= 0 and self.limite > 0
+
+    # --- eventos
+
+    def _drenar_eventos(self):
+        while True:
+            try:
+                dados = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            pos = 0
+            while pos < len(dados):
+                wd, mascara, _, tamanho = _EVENTO_INOTIFY.unpack_from(dados, pos)
+                pos += _EVENTO_INOTIFY.size + tamanho
+                if mascara & IN_Q_OVERFLOW:
+                    for caminho in list(self._listagens): # eventos perdidos: nada no cache é confiável
+                        self._invalidar(caminho)
+                    continue
+                for caminho in list(self._watches.get(wd, ())):
+                    self._invalidar(caminho)
+                if mascara & IN_IGNORED: # watch removido (pelo kernel ou por nós)
+                    for caminho in self._watches.pop(wd, ()):
+                        if self._wd_por_caminho.get(caminho) == wd:
+                            del self._wd_por_caminho[caminho]
+
+    def _invalidar(self, caminho):
+        self._invalidacoes[caminho] = self._invalidacoes.get(caminho, 0) + 1
+        entrada = self._listagens.pop(caminho, None)
+        if entrada is not None:
+            self._custo -= entrada[1]
+            diagnosticoModel.contar("diretorios.invalidacoes")
+
+    def _observar(self, caminho):
+        wd = self._wd_por_caminho.get(caminho)
+        if wd is None:
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(caminho), MASCARA_DIRETORIO)
+            if wd < 0:
+                return False # sem permissão, limite de watches (ENOSPC)...: não guarda
+            self._wd_por_caminho[caminho] = wd
+            self._watches.setdefault(wd, set()).add(caminho)
+        return True
+
+    def _esquecer(self, caminho):
+        if self._usos.get(caminho): # outra listagem do mesmo caminho ainda depende do watch
+            return
+        wd = self._wd_por_caminho.pop(caminho, None)
+        if wd is None:
+            return
+        caminhos = self._watches.get(wd)
+        if caminhos is not None:
+            caminhos.discard(caminho)
+            if not caminhos:
+                del self._watches[wd]
+                libc.inotify_rm_watch(self._fd, wd)
+
+    # --- consulta
+
+    def obter(self, caminho):
+        """Registros em cache (lista, não copiar) ou None."""
+        if not self.ativo:
+            return None
+        with self._lock:
+            self._drenar_eventos()
+            entrada = self._listagens.get(caminho)
+            if entrada is None:
+                diagnosticoModel.contar("diretorios.falhas_cache")
+                return None
+            self._listagens.move_to_end(caminho)
+            diagnosticoModel.contar("diretorios.acertos_cache")
+            return entrada[0]
+
+    def preparar(self, caminho):
+        """Põe o watch ANTES do scandir; devolve o marcador a passar para guardar() (None = não guardar)."""
+        if not self.ativo:
+            return None
+        with self._lock:
+            if not self._observar(caminho):
+                return None
+            self._usos[caminho] = self._usos.get(caminho, 0) + 1
+            return self._invalidacoes.get(caminho, 0)
+
+    def guardar(self, caminho, marcador, registros, custo):
+        if marcador is None or custo > self.limite:
+            return
+        with self._lock:
+            self._drenar_eventos()
+            if self._invalidacoes.get(caminho, 0) != marcador or caminho not in self._wd_por_caminho:
+                return # mudou enquanto listávamos (ou o watch sumiu)
+            antiga = self._listagens.pop(caminho, None)
+            if antiga is not None:
+                self._custo -= antiga[1]
+            self._listagens[caminho] = (registros, custo)
+            self._custo += custo
+            while self._custo > self.limite:
+                antigo, (_, custo_antigo) = self._listagens.popitem(last=False)
+                self._custo -= custo_antigo
+                self._esquecer(antigo)
+
+    def liberar(self, caminho):
+        """Fim de uma listagem preparada: remove o watch se ninguém mais usa e a listagem não foi para o cache."""
+        with self._lock:
+            usos = self._usos.get(caminho, 0) - 1
+            if usos > 0:
+                self._usos[caminho] = usos
+                return
+            self._usos.pop(caminho, None)
+            if caminho not in self._listagens:
+                self._esquecer(caminho)
+
+    def limpar(self):
+        with self._lock:
+            for caminho in list(self._listagens):
+                self._invalidar(caminho)
+                self._esquecer(caminho)
+
+cache_diretorios = CacheDiretorios()
+
+
+def _inotify_confiavel(caminho):
+    """False para diretórios em sistemas de arquivos cujas mudanças o inotify não reporta."""
+    buffer = ctypes.create_string_buffer(256) # struct statfs: f_type é o primeiro campo (long)
+    try:
+        if libc.statfs(os.fsencode(caminho), buffer) != 0:
+            return False
+    except AttributeError:
+        return False
+    return (ctypes.c_ulong.from_buffer(buffer).value & 0xffffffff) not in SEM_INOTIFY
+
+
+def listarDiretorioEmLotes(directory, tamanho_lote=TAMANHO_LOTE_DIRETORIO, cancelado=None, usar_cache=True, reler=False):
+    """
+    Gera o conteúdo do diretório em listas de até `tamanho_lote` registros, à medida que o
+    scandir avança, sem montar a lista inteira. `cancelado` (threading.Event) interrompe entre
+    lotes. Erros ao abrir o diretório (inexistente, sem permissão) são levantados como OSError;
+    entradas que somem durante a listagem são ignoradas. Listagens completas vão para o
+    cache_diretorios, e um diretório que não mudou desde então sai direto do cache. `reler=True`
+    ignora a listagem em cache (botão Atualizar), mas guarda a nova. Diretórios em /proc, /sys,
+    NFS, FUSE etc. nunca usam o cache, porque o inotify não reporta as mudanças neles.
+    """
+    directory = os.path.normpath(directory)
+    if usar_cache and cache_diretorios.ativo and not _inotify_confiavel(directory):
+        usar_cache = False
+    if usar_cache:
+        registros = None if reler else cache_diretorios.obter(directory)
+        if registros is not None:
+            for i in range(0, len(registros), tamanho_lote):
+                if cancelado is not None and cancelado.is_set():
+                    return
+                yield registros[i:i + tamanho_lote]
+            return
+        marcador = cache_diretorios.preparar(directory)
+    else:
+        marcador = None
+
+    todos = [] if marcador is not None else None
+    custo = 0
+    lote = []
+    try:
+        with os.scandir(directory) as entradas:
+            for entrada in entradas:
+                try:
+                    registro = _atributos_entrada(entrada)
+                except OSError:
+                    continue # removida (ou inacessível) entre o readdir e o lstat
+                lote.append(registro)
+                if todos is not None:
+                    todos.append(registro)
+                    custo += _custo_registro(registro)
+                if len(lote) >= tamanho_lote:
+                    if cancelado is not None and cancelado.is_set():
+                        return
+                    yield lote
+                    lote = []
+        if cancelado is not None and cancelado.is_set():
+            return
+        if lote:
+            yield lote
+        if todos is not None:
+            cache_diretorios.guardar(directory, marcador, todos, custo)
+    finally:
+        if marcador is not None:
+            cache_diretorios.liberar(directory) # cancelada/erro/não coube: não deixa watch órfão
+
+
 # Mark: Função para listar o conteúdo de um diretório específico
 def listDirectoryContent(directory):
      
-    directoryContent = []
-
     try:
-        for item in os.listdir(directory):
-            itemPath = os.path.join(directory, item)
-
-            item_type = "Diretório" if os.path.isdir(itemPath) else "Arquivo"
-            size = os.path.getsize(itemPath) if item_type == "Arquivo" else 0 # Obtém o tamanho apenas para arquivos
-
-            creationTimeFormatted = datetime.datetime.fromtimestamp(os.path.getctime(itemPath)).strftime('%Y-%m-%d %H:%M:%S')
-            modificationTimeFormatted = datetime.datetime.fromtimestamp(os.path.getmtime(itemPath)).strftime('%Y-%m-%d %H:%M:%S')
-
-            atribute = {
-                "Nome": item,
-                "Caminho": itemPath,
-                "Permissões": "N/A" if not os.path.exists(itemPath) else oct(os.stat(itemPath).st_mode)[-3:],
-                "Data de Criação": creationTimeFormatted,
-                "Data de Modificação": modificationTimeFormatted,
-                "Tipo": item_type,
-                "Tamanho (Bytes)": size
-            }
-            directoryContent.append(atribute)
-        return directoryContent
+        return [item for lote in listarDiretorioEmLotes(directory) for item in lote]
     except FileNotFoundError:
         print(f"Erro: O diretório '{directory}' não foi encontrado.")
         return None
@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+# os módulos ficam na raiz do projeto, sem pacote
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import procfsFalso
+import procfsModel
+
+PROCESSOS_FALSOS = 50
+SOCKETS_FALSOS = 1024 # net/tcp passa dos 16 KB do buffer inicial do leitor
+
+
+@pytest.fixture(scope="session")
+def raiz_procfs(tmp_path_factory):
+    """procfs sintético (procfsFalso) compartilhado pelos testes da sessão."""
+    return procfsFalso.gerar_procfs(tmp_path_factory.mktemp("procfs"), PROCESSOS_FALSOS, 8, SOCKETS_FALSOS)
+
+
+@pytest.fixture
+def procfs_falso(raiz_procfs, monkeypatch):
+    """Aponta os leitores para o procfs sintético durante o teste."""
+    monkeypatch.setattr(procfsModel, "RAIZ_PROC", raiz_procfs)
+    return raiz_procfs
@@ -0,0 +1,103 @@
+import errno
+import io
+import os
+import shutil
+import socket
+import tempfile
+
+import pytest
+
+import coletorDaemon
+
+
+@pytest.fixture
+def diretorio():
+    # caminhos de socket Unix têm limite de ~108 bytes: o tmp_path do pytest pode passar disso
+    caminho = tempfile.mkdtemp(prefix="dso-")
+    yield caminho
+    shutil.rmtree(caminho, ignore_errors=True)
+
+
+def test_quadro_ida_e_volta():
+    snapshot = {"cpu": {"uso": 12.5}, "processos": [[1, "init"]]}
+    versao, _, lido = coletorDaemon.ler_quadro(io.BytesIO(coletorDaemon.codificar_quadro(7, snapshot)))
+    assert (versao, lido) == (7, snapshot)
+
+
+def test_quadro_invalido():
+    with pytest.raises(ValueError):
+        coletorDaemon.ler_quadro(io.BytesIO(b"XXXX" + bytes(coletorDaemon._CABECALHO.size)))
+
+
+def test_publicar_e_receber(diretorio):
+    caminho = os.path.join(diretorio, "coletor.sock")
+    publicador = coletorDaemon.PublicadorSnapshots(caminho)
+    try:
+        assert os.stat(caminho).st_mode & 0o777 == 0o600
+        conexao = coletorDaemon.conectar(caminho)
+        assert conexao is not None
+        conexao.settimeout(5)
+        publicador.publicar({"n": 1})
+        assert coletorDaemon.ler_quadro(conexao)[2] == {"n": 1}
+        conexao.close()
+    finally:
+        publicador.fechar()
+    assert coletorDaemon.conectar(caminho) is None
+
+
+def test_nao_toma_o_socket_de_um_coletor_ativo(diretorio):
+    caminho = os.path.join(diretorio, "coletor.sock")
+    primeiro = coletorDaemon.PublicadorSnapshots(caminho)
+    try:
+        with pytest.raises(OSError) as erro:
+            coletorDaemon.PublicadorSnapshots(caminho)
+        assert erro.value.errno == errno.EADDRINUSE
+        conexao = coletorDaemon.conectar(caminho) # o primeiro continua atendendo
+        assert conexao is not None
+        conexao.close()
+    finally:
+        primeiro.fechar()
+
+
+def test_remove_socket_orfao(diretorio):
+    caminho = os.path.join(diretorio, "coletor.sock")
+    orfao = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    orfao.bind(caminho)
+    orfao.close() # o arquivo fica, mas ninguém escuta: connect() dá ECONNREFUSED
+    publicador = coletorDaemon.PublicadorSnapshots(caminho)
+    publicador.fechar()
+
+
+def test_diretorio_privado_aberto_a_outros_e_recusado(diretorio, monkeypatch):
+    privado = os.path.join(diretorio, "privado")
+    monkeypatch.setattr(coletorDaemon, "_DIRETORIO_PRIVADO", privado)
+    publicador = coletorDaemon.PublicadorSnapshots(os.path.join(privado, "coletor.sock"))
+    publicador.fechar()
+    assert os.stat(privado).st_mode & 0o777 == 0o700
+
+    os.chmod(privado, 0o755)
+    with pytest.raises(PermissionError):
+        coletorDaemon.PublicadorSnapshots(os.path.join(privado, "coletor.sock"))
+
+
+def test_diretorio_privado_trocado_por_link_e_recusado(diretorio, monkeypatch):
+    alvo = os.path.join(diretorio, "alvo")
+    os.mkdir(alvo, 0o700)
+    privado = os.path.join(diretorio, "privado")
+    os.symlink(alvo, privado)
+    monkeypatch.setattr(coletorDaemon, "_DIRETORIO_PRIVADO", privado)
+    with pytest.raises(PermissionError):
+        coletorDaemon.PublicadorSnapshots(os.path.join(privado, "coletor.sock"))
+
+
+def test_conectar_algum_usa_o_primeiro_ativo(diretorio):
+    ausente = os.path.join(diretorio, "ausente.sock")
+    caminho = os.path.join(diretorio, "coletor.sock")
+    publicador = coletorDaemon.PublicadorSnapshots(caminho)
+    try:
+        escolhido, conexao = coletorDaemon.conectar_algum([ausente, caminho])
+        assert escolhido == caminho
+        conexao.close()
+        assert coletorDaemon.conectar_algum([ausente]) == (None, None)
+    finally:
+        publicador.fechar()
@@ -0,0 +1,42 @@
+import cpuModel
+import procfsModel
+
+
+def _escrever_stat(raiz, user, idle, processos):
+    linha = f"{user} 0 0 {idle} 0 0 0 0 0 0"
+    (raiz / "stat").write_text(f"cpu  {linha}\ncpu0 {linha}\nprocesses {processos}\nprocs_running 1\n")
+
+
+def test_cada_consumidor_tem_a_propria_amostra_anterior(tmp_path, monkeypatch):
+    monkeypatch.setattr(procfsModel, "RAIZ_PROC", str(tmp_path))
+    monkeypatch.setattr(cpuModel, "_leitura_recente", None)
+    monkeypatch.setattr(cpuModel, "_por_consumidor", {})
+    relogio = [10.0]
+    monkeypatch.setattr(cpuModel.time, "monotonic", lambda: relogio[0])
+
+    _escrever_stat(tmp_path, 100, 900, 1000)
+    cpuModel.amostrarCpu(consumidor="cpu")
+    relogio[0] = 10.5
+    _escrever_stat(tmp_path, 150, 950, 1010)
+    # outro consumidor relê no meio do intervalo: não vira a base do primeiro
+    assert cpuModel.amostrarCpu(consumidor="processos")["jiffies_total"] == 1100
+    relogio[0] = 11.0
+    _escrever_stat(tmp_path, 300, 1000, 1020)
+    amostra = cpuModel.amostrarCpu(consumidor="cpu")
+
+    assert amostra["intervalo"] == 1.0
+    assert amostra["total"]["uso"] == 66.67 # 200 de 300 jiffies desde a primeira amostra do consumidor
+    assert amostra["forks_por_s"] == 20.0
+    assert amostra["nucleos"]["cpu0"]["user"] == amostra["total"]["user"]
+
+
+def test_leitura_recente_e_compartilhada(tmp_path, monkeypatch):
+    monkeypatch.setattr(procfsModel, "RAIZ_PROC", str(tmp_path))
+    monkeypatch.setattr(cpuModel, "_leitura_recente", None)
+    monkeypatch.setattr(cpuModel, "_por_consumidor", {})
+    _escrever_stat(tmp_path, 100, 900, 1000)
+    primeira = cpuModel.amostrarCpu(idade_maxima=60, consumidor="cpu")
+    _escrever_stat(tmp_path, 200, 900, 1000)
+    # dentro de idade_maxima: nem relê o arquivo, e o mesmo consumidor recebe o mesmo resultado
+    assert cpuModel.amostrarCpu(idade_maxima=60, consumidor="cpu") is primeira
+    assert cpuModel.amostrarCpu(idade_maxima=60, consumidor="processos")["jiffies_total"] == 1000
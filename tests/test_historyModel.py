@@ -0,0 +1,125 @@
+from array import array
+
+import pytest
+
+from historyModel import AnelSerie, Camada, HistoricoSeries, SerieMultiResolucao
+
+
+class TabelaFalsa:
+    """Só as colunas de TabelaProcessos que o histórico lê."""
+
+    def __init__(self, pids, cpu=None, rss=None):
+        self.pid = array('i', pids)
+        self.starttime = array('q', [100] * len(pids))
+        self.cpu_percentual = array('d', cpu or [float(pid) for pid in pids])
+        self.rss = array('q', rss or [pid * 1024 for pid in pids])
+
+
+# MARK: Buffer circular
+
+def test_anel_antes_de_encher():
+    anel = AnelSerie(4)
+    anel.adicionar(1.0, 10.0)
+    anel.adicionar(2.0, 20.0)
+    assert anel.pontos() == [(1.0, 10.0), (2.0, 20.0)]
+    assert anel.pontos(1) == [(2.0, 20.0)]
+
+
+def test_anel_da_a_volta_e_mantem_a_ordem():
+    anel = AnelSerie(3)
+    for n in range(7):
+        anel.adicionar(float(n), n * 10.0)
+    assert anel.tamanho == 3
+    assert anel.pontos() == [(4.0, 40.0), (5.0, 50.0), (6.0, 60.0)]
+    assert anel.pontos(2) == [(5.0, 50.0), (6.0, 60.0)]
+    assert anel.pontos(10) == anel.pontos()
+
+
+def test_anel_nao_cresce():
+    anel = AnelSerie(8)
+    reservado = anel.bytes_reservados()
+    for n in range(100):
+        anel.adicionar(float(n), 0.0)
+    assert anel.bytes_reservados() == reservado == 8 * 8 * 2
+    anel.limpar()
+    assert anel.pontos() == []
+
+
+# MARK: Camadas
+
+def test_camada_grava_a_media_quando_o_intervalo_fecha():
+    camada = Camada(5, 10)
+    for instante, valor in ((0, 1.0), (1, 2.0), (4.9, 3.0), (5, 10.0), (12, 20.0)):
+        camada.adicionar(instante, valor)
+    # o intervalo [10, 15) ainda está aberto
+    assert camada.anel.pontos() == [(0.0, 2.0), (5.0, 10.0)]
+
+
+def test_serie_multiresolucao():
+    serie = SerieMultiResolucao(((5, 10), (60, 10)))
+    for segundo in range(125):
+        serie.adicionar(segundo, float(segundo))
+    assert len(serie.pontos(5)) == 10 # capacidade da camada fina
+    assert serie.pontos(60) == [(0.0, 29.5), (60.0, 89.5)]
+    assert serie.pontos() == serie.pontos(5)
+    with pytest.raises(ValueError):
+        serie.pontos(900)
+
+
+# MARK: Slots de processos
+
+def _historico(slots=2, carencia=3):
+    return HistoricoSeries(camadas=((1, 16),), slots=slots, carencia=carencia)
+
+
+def test_processos_por_pid_e_starttime():
+    historico = _historico()
+    for instante in range(3):
+        historico.registrar_processos(instante, TabelaFalsa([10, 20]), [0, 1])
+    assert historico.serie_processo(10, 100, "cpu") == [(0.0, 10.0), (1.0, 10.0)]
+    assert historico.serie_processo(20, 100, "rss") == [(0.0, 20480.0), (1.0, 20480.0)]
+    assert historico.serie_processo(10, 999, "cpu") == [] # PID reciclado: outro starttime
+
+
+def test_slot_mantido_durante_a_carencia():
+    historico = _historico(carencia=3)
+    historico.registrar_processos(0, TabelaFalsa([10, 20]), [0, 1])
+    historico.registrar_processos(1, TabelaFalsa([10]), [0])
+    historico.registrar_processos(2, TabelaFalsa([10]), [0])
+    # fora do top por 2 amostras: o histórico continua lá e volta a crescer
+    historico.registrar_processos(3, TabelaFalsa([10, 20]), [0, 1])
+    historico.registrar_processos(4, TabelaFalsa([10, 20]), [0, 1])
+    assert historico.serie_processo(20, 100, "cpu") == [(0.0, 20.0), (3.0, 20.0)]
+
+    for instante in range(5, 8):
+        historico.registrar_processos(instante, TabelaFalsa([10]), [0])
+    assert historico.serie_processo(20, 100, "cpu") == [] # 3 amostras fora: slot liberado
+
+
+def test_sem_slot_livre_o_ausente_mais_antigo_cede():
+    historico = _historico(slots=2, carencia=10)
+    historico.registrar_processos(0, TabelaFalsa([10, 20]), [0, 1])
+    historico.registrar_processos(1, TabelaFalsa([10]), [0])
+    historico.registrar_processos(2, TabelaFalsa([10, 30]), [0, 1]) # 30 entra no lugar de 20
+    historico.registrar_processos(3, TabelaFalsa([10, 30]), [0, 1])
+    assert historico.serie_processo(20, 100, "cpu") == []
+    assert historico.serie_processo(30, 100, "cpu") == [(2.0, 30.0)]
+    assert len(historico.serie_processo(10, 100, "cpu")) == 3
+
+
+def test_sem_slot_nem_ausentes_o_novo_fica_de_fora():
+    historico = _historico(slots=2)
+    historico.registrar_processos(0, TabelaFalsa([10, 20, 30]), [2, 0, 1])
+    historico.registrar_processos(1, TabelaFalsa([10, 20, 30]), [2, 0, 1])
+    assert historico.serie_processo(30, 100, "cpu") == [(0.0, 30.0)]
+    assert historico.serie_processo(20, 100, "cpu") == [] # só os `slots` primeiros índices entram
+
+
+def test_memoria_fixa():
+    historico = HistoricoSeries()
+    reservado = historico.bytes_reservados()
+    tabela = TabelaFalsa(list(range(1, 101)))
+    for instante in range(0, 600, 5):
+        historico.registrar_sistema(instante, cpu=1.0, memoria=2.0, swap=0.0)
+        historico.registrar_processos(instante, tabela, list(range(instante % 100, 100)))
+    assert historico.bytes_reservados() == reservado
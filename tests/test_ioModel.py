@@ -0,0 +1,79 @@
+from array import array
+
+import pytest
+
+import ioModel
+from ioModel import LIMITE_32_BITS, MotorTaxas
+
+
+def _motor():
+    return MotorTaxas(("bytes", "pacotes"))
+
+
+# MARK: Motor de taxas
+
+def test_primeira_amostra_so_guarda_a_base():
+    assert _motor().amostrar(0.0, ("eth0",), array('Q', [100, 1])) == {}
+
+
+def test_taxa_usa_o_intervalo_medido():
+    motor = _motor()
+    motor.amostrar(10.0, ("eth0", "lo"), array('Q', [1000, 10, 0, 0]))
+    taxas = motor.amostrar(12.0, ("eth0", "lo"), array('Q', [3000, 30, 500, 5]))
+    assert taxas == {"eth0": [1000.0, 10.0], "lo": [250.0, 2.5]}
+
+
+def test_amostra_cedo_demais_mantem_a_base():
+    motor = _motor()
+    motor.amostrar(0.0, ("eth0",), array('Q', [0, 0]))
+    primeira = motor.amostrar(1.0, ("eth0",), array('Q', [100, 1]))
+    # antes de INTERVALO_MINIMO: devolve as taxas anteriores e não avança a base
+    assert motor.amostrar(1.0 + ioModel.INTERVALO_MINIMO / 2, ("eth0",), array('Q', [999, 9])) is primeira
+    assert motor.amostrar(2.0, ("eth0",), array('Q', [300, 3])) == {"eth0": [200.0, 2.0]}
+
+
+def test_volta_de_32_bits():
+    motor = _motor()
+    motor.amostrar(0.0, ("eth0",), array('Q', [LIMITE_32_BITS - 100, 5]))
+    assert motor.amostrar(1.0, ("eth0",), array('Q', [50, 6])) == {"eth0": [150.0, 1.0]}
+
+
+def test_contador_zerado_da_taxa_zero():
+    motor = _motor()
+    motor.amostrar(0.0, ("eth0",), array('Q', [1000, 50]))
+    # anterior na metade de baixo: não foi volta, o contador recomeçou (ex.: driver recarregado)
+    assert motor.amostrar(1.0, ("eth0",), array('Q', [10, 1])) == {"eth0": [0.0, 0.0]}
+    assert motor.amostrar(2.0, ("eth0",), array('Q', [30, 2])) == {"eth0": [20.0, 1.0]}
+
+
+def test_realinha_quando_dispositivos_aparecem_e_somem():
+    motor = _motor()
+    motor.amostrar(0.0, ("a", "b"), array('Q', [100, 1, 200, 2]))
+    # "a" sumiu, "c" apareceu antes de "b": "b" usa a própria base, "c" só entra na próxima
+    taxas = motor.amostrar(1.0, ("c", "b"), array('Q', [7, 7, 260, 8]))
+    assert taxas == {"b": [60.0, 6.0]}
+    taxas = motor.amostrar(2.0, ("c", "b"), array('Q', [17, 9, 300, 8]))
+    assert taxas == {"c": [10.0, 2.0], "b": [40.0, 0.0]}
+
+
+def test_muitos_dispositivos():
+    motor = MotorTaxas(ioModel.CAMPOS_REDE)
+    nomes = tuple(f"veth{n}" for n in range(5000))
+    largura = len(ioModel.CAMPOS_REDE)
+    motor.amostrar(0.0, nomes, array('Q', [0] * (largura * len(nomes))))
+    taxas = motor.amostrar(0.5, nomes, array('Q', range(largura * len(nomes))))
+    assert len(taxas) == len(nomes)
+    assert taxas["veth1"] == pytest.approx([2.0 * (largura + i) for i in range(largura)])
+
+
+# MARK: Leitura de diskstats e net/dev
+
+def test_leituras_do_procfs_falso(procfs_falso):
+    _, discos, valores = ioModel.lerDiskstats()
+    assert discos == ("sda", "sda1")
+    assert len(valores) == len(discos) * len(ioModel.CAMPOS_DISCO)
+
+    _, interfaces, valores = ioModel.lerNetDev()
+    assert interfaces == ("lo", "eth0")
+    assert len(valores) == len(interfaces) * len(ioModel.CAMPOS_REDE)
+    assert ioModel._interfaces_fisicas(interfaces) == {"eth0"} # fora do /proc real: tudo menos lo
@@ -0,0 +1,106 @@
+import os
+
+import pytest
+
+import journalModel
+from journalModel import DESVIO_MAXIMO, DURACAO_SEGMENTO, INTERVALO_INDICE, DiarioMetricas
+
+BASE = 1000 * DURACAO_SEGMENTO # início de um segmento
+
+
+@pytest.fixture
+def diario(tmp_path):
+    d = DiarioMetricas(str(tmp_path / "diario"))
+    yield d
+    d.fechar()
+
+
+def _gravar(diario, instantes, metrica="cpu"):
+    for n, instante in enumerate(instantes):
+        diario.registrar(instante, metrica, float(n))
+    diario.descarregar()
+
+
+# MARK: Índice e leitura por faixa
+
+def test_indice_esparso(diario):
+    _gravar(diario, [BASE + n for n in range(3 * INTERVALO_INDICE + 1)])
+    instantes, deslocamentos = journalModel._ler_indice(journalModel._caminhos_segmento(diario.diretorio, BASE)[1])
+    assert instantes == [BASE, BASE + INTERVALO_INDICE, BASE + 2 * INTERVALO_INDICE, BASE + 3 * INTERVALO_INDICE]
+    assert deslocamentos == [journalModel.CABECALHO.size + n * INTERVALO_INDICE * journalModel.REGISTRO.size
+                             for n in range(4)]
+
+
+def test_consulta_por_faixa_e_filtros(diario):
+    for n in range(2000):
+        diario.registrar(BASE + n, "cpu", n)
+        diario.registrar(BASE + n, "processo_cpu", n / 2, entidade=n % 3)
+    diario.descarregar()
+
+    cpu = list(diario.consultar(BASE + 1000, BASE + 1009, "cpu"))
+    assert [valor for _, _, _, valor in cpu] == list(range(1000, 1010))
+    processo = list(diario.consultar(BASE + 1000, BASE + 1009, "processo_cpu", entidade=1))
+    assert [instante - BASE for instante, _, _, _ in processo] == [1000, 1003, 1006, 1009]
+    assert {metrica for _, metrica, _, _ in diario.consultar(BASE, BASE + 5)} == {"cpu", "processo_cpu"}
+
+
+def test_registros_fora_de_ordem_nas_bordas(diario):
+    # 100 registros por segundo: uma entrada do índice a cada 2,56 s, e os desvios abaixo
+    # (dentro de DESVIO_MAXIMO) atravessam várias entradas
+    instantes = [BASE + n / 100 for n in range(6000)]
+    instantes.insert(2800, BASE + 20.005) # gravado 8 s atrasado
+    instantes.insert(2300, BASE + 30.005) # gravado 7 s adiantado
+    instantes.insert(3600, BASE + 30.0)   # gravado 6 s atrasado, depois de registros além do fim
+    _gravar(diario, instantes)
+
+    for inicio, fim in ((BASE + 20.0, BASE + 20.02), (BASE + 29.99, BASE + 30.005)):
+        lidos = [instante for instante, _, _, _ in diario.consultar(inicio, fim)]
+        assert sorted(lidos) == sorted(i for i in instantes if inicio <= i <= fim)
+
+
+def test_consulta_atravessa_segmentos(diario):
+    _gravar(diario, [BASE + DURACAO_SEGMENTO - 2 + n for n in range(4)])
+    assert diario.segmentos() == [BASE, BASE + DURACAO_SEGMENTO]
+    assert len(list(diario.consultar(BASE + DURACAO_SEGMENTO - 1, BASE + DURACAO_SEGMENTO))) == 2
+
+
+def test_registro_atrasado_de_outro_segmento(diario):
+    # atrasado o bastante para ir ao segmento anterior, mas dentro do desvio do fim da consulta
+    _gravar(diario, [BASE + DURACAO_SEGMENTO + 1, BASE + DURACAO_SEGMENTO - DESVIO_MAXIMO / 2])
+    instantes = [i for i, _, _, _ in diario.consultar(BASE + DURACAO_SEGMENTO - DESVIO_MAXIMO, BASE + DURACAO_SEGMENTO)]
+    assert instantes == [BASE + DURACAO_SEGMENTO - DESVIO_MAXIMO / 2]
+
+
+# MARK: Orçamento, compactação e trava
+
+def test_orcamento_conferido_a_cada_lote(tmp_path):
+    diario = DiarioMetricas(str(tmp_path / "diario"), orcamento=64 * 1024)
+    try:
+        for hora in range(3):
+            inicio = BASE + hora * DURACAO_SEGMENTO
+            _gravar(diario, [inicio + n * 0.5 for n in range(2000)])
+        # cada segmento tem ~48 KB: o 2º lote compacta o 1º segmento; o 3º compacta o 2º e, como
+        # ainda não basta, apaga o 1º (já compactado). Tudo sem rotação depois da escrita.
+        assert diario.estatisticas["compactacoes"] == 2
+        assert diario.estatisticas["remocoes"] == 1
+        assert diario.segmentos() == [BASE + DURACAO_SEGMENTO, BASE + 2 * DURACAO_SEGMENTO]
+        assert diario.tamanho_total() <= diario.orcamento
+
+        # o segmento compactado guarda médias de 1 minuto
+        inicio = BASE + DURACAO_SEGMENTO
+        assert list(diario.consultar(inicio, inicio + 59.5, "cpu")) == [(float(inicio), "cpu", 0, sum(range(120)) / 120)]
+    finally:
+        diario.fechar()
+
+
+def test_segundo_escritor_no_mesmo_diretorio(diario):
+    with pytest.raises(BlockingIOError):
+        DiarioMetricas(diario.diretorio)
+
+
+def test_registrar_depois_de_fechar_e_ignorado(tmp_path):
+    diario = DiarioMetricas(str(tmp_path / "diario"))
+    diario.fechar()
+    diario.registrar(BASE, "cpu", 1.0)
+    diario.fechar()
+    assert not [nome for nome in os.listdir(diario.diretorio) if nome.endswith(".seg")]
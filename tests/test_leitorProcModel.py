@@ -0,0 +1,97 @@
+import os
+import threading
+
+import pytest
+
+import leitorProcModel
+import procfsModel
+
+
+def _texto(raiz, *partes):
+    with open(os.path.join(raiz, *map(str, partes))) as f:
+        return f.read()
+
+
+# MARK: stat, status e statm
+
+def test_stat_bate_com_o_texto(procfs_falso):
+    for pid in (1, 7, 50):
+        campos = _texto(procfs_falso, pid, "stat").rsplit(")", 1)[1].split()
+        esperado = (int(campos[11]), int(campos[12]), int(campos[19]), int(campos[7]), int(campos[9]))
+        assert leitorProcModel.ler_stat_pid(pid) == esperado
+
+
+def test_stat_com_parenteses_e_espacos_no_nome(tmp_path, monkeypatch):
+    (tmp_path / "42").mkdir()
+    campos = ["S", "1", "42", "42", "0", "-1", "0", "11", "0", "22", "0", "33", "44",
+              "0", "0", "20", "0", "1", "0", "55", "0", "0"]
+    (tmp_path / "42" / "stat").write_text(f"42 (a) (b c) {' '.join(campos)}\n")
+    monkeypatch.setattr(procfsModel, "RAIZ_PROC", str(tmp_path))
+    assert leitorProcModel.ler_stat_pid(42) == (33, 44, 55, 11, 22)
+
+
+def test_status_bate_com_o_texto(procfs_falso):
+    for pid in (1, 25):
+        linhas = dict(linha.split(":", 1) for linha in _texto(procfs_falso, pid, "status").splitlines())
+        status = leitorProcModel.ler_status_pid(pid)
+        assert status["nome"] == linhas["Name"].strip()
+        assert status["estado"] == linhas["State"].strip()
+        assert status["uid"] == int(linhas["Uid"].split()[0])
+        assert status["threads"] == int(linhas["Threads"])
+        assert status["mem_residente_kb"] == int(linhas["VmRSS"].split()[0])
+        assert status["mem_codigo_kb"] == int(linhas["VmExe"].split()[0])
+
+
+def test_status_de_thread_do_kernel_sem_linhas_vm(tmp_path, monkeypatch):
+    (tmp_path / "2").mkdir()
+    (tmp_path / "2" / "status").write_text("Name:\tkthreadd\nState:\tS (sleeping)\nUid:\t0\t0\t0\t0\nThreads:\t1\n")
+    monkeypatch.setattr(procfsModel, "RAIZ_PROC", str(tmp_path))
+    assert leitorProcModel.ler_status_pid(2) == {"nome": "kthreadd", "estado": "S (sleeping)", "uid": 0, "threads": 1}
+
+
+def test_statm(procfs_falso):
+    assert leitorProcModel.ler_statm_pid(3) == int(_texto(procfs_falso, 3, "statm").split()[0])
+
+
+def test_pid_inexistente_levanta(procfs_falso):
+    with pytest.raises(FileNotFoundError):
+        leitorProcModel.ler_stat_pid(999999)
+
+
+# MARK: meminfo e net/*
+
+def test_meminfo(procfs_falso):
+    assert leitorProcModel.ler_meminfo() == {
+        "MemTotal": 16 * 1024**2, "MemAvailable": 9 * 1024**2, "SwapTotal": 4 * 1024**2, "SwapFree": 3 * 1024**2,
+    }
+
+
+def test_sockets_rede_ipv4_e_ipv6(procfs_falso):
+    tcp = leitorProcModel.ler_sockets_rede(procfsModel.caminho_proc("net", "tcp"))
+    tcp6 = leitorProcModel.ler_sockets_rede(procfsModel.caminho_proc("net", "tcp6"))
+
+    # procfsFalso distribui os sockets em rodízio: tcp recebe os de índice 0, 4, 8...
+    assert [inode for _, _, _, inode in tcp] == list(range(100000, 101024, 4))
+    assert tcp[0] == ("127.0.0.1:1024", "0.0.0.0:0", 10, 100000)
+    assert tcp[1][2] == 1
+    assert tcp6[0] == ("::1:1026", ":::0", 1, 100002)
+
+
+def test_arquivo_maior_que_o_buffer_inicial(procfs_falso):
+    caminho = procfsModel.caminho_proc("net", "udp")
+    assert os.path.getsize(caminho) > leitorProcModel.TAMANHO_BUFFER_INICIAL
+    resultado = []
+    # thread nova: o buffer começa no tamanho inicial e precisa crescer no meio da leitura
+    thread = threading.Thread(target=lambda: resultado.append(leitorProcModel.ler_sockets_rede(caminho)))
+    thread.start()
+    thread.join()
+    assert len(resultado[0]) == len(_texto(procfs_falso, "net", "udp").splitlines()) - 1
+
+
+# MARK: /proc de verdade
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="sem /proc")
+def test_stat_do_proprio_processo():
+    with open(f"/proc/{os.getpid()}/stat") as f:
+        campos = f.read().rsplit(")", 1)[1].split()
+    assert leitorProcModel.ler_stat_pid(os.getpid())[2] == int(campos[19]) # starttime não muda
@@ -0,0 +1,180 @@
+import errno
+import os
+import socket
+import struct
+
+import pytest
+
+import socketModel
+from socketModel import _INET_DIAG_MSG, _INET_DIAG_REQ_V2, _NLMSGHDR, _RTATTR, _UNIX_DIAG_MSG
+
+
+# MARK: Mensagens netlink sintéticas
+
+def _mensagem(tipo, payload, seq=1):
+    tamanho = _NLMSGHDR.size + len(payload)
+    return _NLMSGHDR.pack(tamanho, tipo, 0, seq, 0) + payload + bytes(-tamanho % 4)
+
+
+def _inet(familia, estado, local, sport, remoto, dport, inode):
+    src = socket.inet_pton(familia, local).ljust(16, b"\0") # IPv4 ocupa os 4 primeiros bytes
+    dst = socket.inet_pton(familia, remoto).ljust(16, b"\0")
+    return _INET_DIAG_MSG.pack(familia, estado, 0, 0, struct.pack(">H", sport), struct.pack(">H", dport),
+                               src, dst, 0, bytes(8), 0, 0, 0, 1000, inode)
+
+
+def _atributo(tipo, valor):
+    tamanho = _RTATTR.size + len(valor)
+    return _RTATTR.pack(tamanho, tipo) + valor + bytes(-tamanho % 4)
+
+
+def _unix(tipo, estado, inode, nome=None, par=None):
+    msg = _UNIX_DIAG_MSG.pack(socket.AF_UNIX, tipo, estado, inode, bytes(8))
+    if nome is not None:
+        msg += _atributo(socketModel.UNIX_DIAG_NAME, nome)
+    if par is not None:
+        msg += _atributo(socketModel.UNIX_DIAG_PEER, struct.pack("=I", par))
+    return msg
+
+
+def _fim():
+    return _mensagem(socketModel.NLMSG_DONE, struct.pack("=i", 0))
+
+
+def _erro(codigo):
+    return _mensagem(socketModel.NLMSG_ERROR, struct.pack("=i", -codigo) + bytes(_NLMSGHDR.size))
+
+
+class SocketFalso:
+    """Devolve as respostas em pedaços, um por recv_into, como o kernel faz com dumps grandes."""
+
+    def __init__(self, *pedacos):
+        self.pedacos = list(pedacos)
+        self.enviados = []
+
+    def send(self, dados):
+        self.enviados.append(bytes(dados))
+        return len(dados)
+
+    def recv_into(self, buffer):
+        pedaco = self.pedacos.pop(0)
+        buffer[:len(pedaco)] = pedaco
+        return len(pedaco)
+
+
+# MARK: INET_DIAG
+
+def test_decodifica_tcp_ipv4_e_ipv6_em_varios_recv():
+    sock = SocketFalso(
+        _mensagem(20, _inet(socket.AF_INET, 10, "127.0.0.1", 8080, "0.0.0.0", 0, 501))
+        + _mensagem(20, _inet(socket.AF_INET, 6, "10.0.0.1", 40000, "10.0.0.2", 443, 0)), # TIME_WAIT sem dono
+        _mensagem(20, _inet(socket.AF_INET, 1, "10.0.0.1", 40001, "10.0.0.2", 443, 502)) + _fim(),
+    )
+    sockets = socketModel.listar_sockets_inet(sock, socket.AF_INET, socket.IPPROTO_TCP)
+    assert sockets == {
+        501: {"protocolo": "tcp", "local_address": "127.0.0.1:8080", "remote_address": "0.0.0.0:0",
+              "state": "LISTEN", "inode": 501},
+        502: {"protocolo": "tcp", "local_address": "10.0.0.1:40001", "remote_address": "10.0.0.2:443",
+              "state": "ESTABLISHED", "inode": 502},
+    }
+
+    sock6 = SocketFalso(_mensagem(20, _inet(socket.AF_INET6, 7, "::1", 53, "::", 0, 600)) + _fim())
+    sockets6 = socketModel.listar_sockets_inet(sock6, socket.AF_INET6, socket.IPPROTO_UDP)
+    assert sockets6[600]["protocolo"] == "udp6"
+    assert sockets6[600]["local_address"] == "::1:53"
+
+
+def test_pedido_enviado():
+    sock = SocketFalso(_fim())
+    socketModel.listar_sockets_inet(sock, socket.AF_INET6, socket.IPPROTO_TCP, estados=0x400, seq=7)
+    tamanho, tipo, flags, seq, _ = _NLMSGHDR.unpack_from(sock.enviados[0])
+    assert (tamanho, tipo, seq) == (len(sock.enviados[0]), socketModel.SOCK_DIAG_BY_FAMILY, 7)
+    assert flags == socketModel.NLM_F_REQUEST | socketModel.NLM_F_DUMP
+    familia, protocolo, _, estados, _ = _INET_DIAG_REQ_V2.unpack_from(sock.enviados[0], _NLMSGHDR.size)
+    assert (familia, protocolo, estados) == (socket.AF_INET6, socket.IPPROTO_TCP, 0x400)
+
+
+def test_erro_netlink_vira_oserror():
+    with pytest.raises(OSError) as erro:
+        socketModel.listar_sockets_inet(SocketFalso(_erro(errno.ENOENT)), socket.AF_INET, socket.IPPROTO_UDP)
+    assert erro.value.errno == errno.ENOENT
+
+
+# MARK: UNIX_DIAG
+
+def test_decodifica_unix_com_nome_abstrato_caminho_e_par():
+    sock = SocketFalso(
+        _mensagem(20, _unix(socket.SOCK_STREAM, 10, 700, b"/run/app.sock"))
+        + _mensagem(20, _unix(socket.SOCK_DGRAM, 7, 701, b"\0abstrato", par=702))
+        + _mensagem(20, _unix(socket.SOCK_SEQPACKET, 1, 702))
+        + _fim()
+    )
+    sockets = socketModel.listar_sockets_unix(sock)
+    assert sockets[700]["local_address"] == "/run/app.sock"
+    assert sockets[700]["tipo_unix"] == "stream"
+    assert sockets[700]["remote_address"] == "N/A"
+    assert sockets[701]["local_address"] == "@abstrato"
+    assert sockets[701]["remote_address"] == "peer:[702]"
+    assert sockets[702]["local_address"] == "(sem nome)"
+    assert sockets[702]["tipo_unix"] == "seqpacket"
+
+
+# MARK: Inventário completo
+
+class NetlinkFalso(SocketFalso):
+    """Responde cada pedido pela família/protocolo; os de `sem_modulo` falham com ENOENT."""
+
+    def __init__(self, respostas, sem_modulo=()):
+        super().__init__()
+        self.respostas = respostas
+        self.sem_modulo = sem_modulo
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        return False
+
+    def send(self, dados):
+        super().send(dados)
+        chave = dados[_NLMSGHDR.size], dados[_NLMSGHDR.size + 1] # família, protocolo
+        self.pedacos.append(_erro(errno.ENOENT) if chave in self.sem_modulo else self.respostas.get(chave, b"") + _fim())
+        return len(dados)
+
+
+def test_inventario_pula_protocolo_sem_modulo(monkeypatch):
+    respostas = {
+        (socket.AF_INET, socket.IPPROTO_TCP): _mensagem(20, _inet(socket.AF_INET, 10, "0.0.0.0", 22, "0.0.0.0", 0, 1)),
+        (socket.AF_UNIX, 0): _mensagem(20, _unix(socket.SOCK_STREAM, 10, 2, b"/tmp/x")),
+    }
+    falso = NetlinkFalso(respostas, sem_modulo={(socket.AF_INET, socket.IPPROTO_UDP), (socket.AF_INET6, socket.IPPROTO_UDP)})
+    monkeypatch.setattr(socketModel.socket, "socket", lambda *args: falso)
+
+    ausentes = {}
+    sockets = socketModel.inventarioSocketsNetlink(ignorar=("tcp6",), ausentes=ausentes)
+    assert set(sockets) == {1, 2}
+    assert set(ausentes) == {"udp", "udp6"}
+    assert len(falso.enviados) == 4 # tcp6 nem foi pedido
+
+
+def test_inventario_propaga_outros_erros(monkeypatch):
+    falso = NetlinkFalso({})
+    falso.send = lambda dados: falso.pedacos.append(_erro(errno.ENOBUFS))
+    monkeypatch.setattr(socketModel.socket, "socket", lambda *args: falso)
+    with pytest.raises(OSError) as erro:
+        socketModel.inventarioSocketsNetlink()
+    assert erro.value.errno == errno.ENOBUFS
+
+
+def test_inventario_real_encontra_socket_aberto():
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as servidor:
+            servidor.bind(("127.0.0.1", 0))
+            servidor.listen()
+            inode = os.fstat(servidor.fileno()).st_ino
+            porta = servidor.getsockname()[1]
+            sockets = socketModel.inventarioSocketsNetlink(incluir_unix=False)
+    except OSError as e:
+        pytest.skip(f"sock_diag indisponível: {e}")
+    assert sockets[inode]["state"] == "LISTEN"
+    assert sockets[inode]["local_address"] == f"127.0.0.1:{porta}"
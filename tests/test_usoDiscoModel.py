@@ -0,0 +1,86 @@
+import os
+
+import usoDiscoModel
+from usoDiscoModel import AnalisadorUsoDisco
+
+
+def _arvore(raiz):
+    for nome in ("a", "b", "c"):
+        os.makedirs(raiz / nome / "sub" / "folha")
+        (raiz / nome / "sub" / "folha" / "dados").write_bytes(b"x" * 100_000)
+    (raiz / "solto").write_bytes(b"y" * 10_000)
+
+
+def _analisador(tmp_path):
+    return AnalisadorUsoDisco(caminho_cache=str(tmp_path / "cache"), trabalhadores=4)
+
+
+def _du(caminho):
+    total = 0
+    for base, diretorios, arquivos in os.walk(caminho):
+        total += os.lstat(base).st_blocks * 512
+        total += sum(os.lstat(os.path.join(base, nome)).st_blocks * 512 for nome in arquivos)
+    return total
+
+
+def test_total_igual_ao_du(tmp_path):
+    raiz = tmp_path / "arvore"
+    _arvore(raiz)
+    totais = {}
+    resultado = _analisador(tmp_path).analisar(str(raiz), ao_total=totais.__setitem__)
+    assert resultado["total"] == _du(raiz)
+    assert resultado["erros"] == 0
+    assert resultado["diretorios"] == 10
+    # filhos diretos e a própria raiz são repassados a ao_total
+    assert totais == {str(raiz / nome): _du(raiz / nome) for nome in ("a", "b", "c")} | {str(raiz): _du(raiz)}
+
+
+def test_segunda_analise_reaproveita_o_cache(tmp_path):
+    raiz = tmp_path / "arvore"
+    _arvore(raiz)
+    _analisador(tmp_path).analisar(str(raiz))
+    resultado = _analisador(tmp_path).analisar(str(raiz)) # novo analisador: lê o cache do disco
+    assert resultado["reaproveitados"] == 10 and resultado["varridos"] == 0
+    assert resultado["total"] == _du(raiz)
+
+
+def test_erro_num_diretorio_fecha_com_o_total_parcial(tmp_path, monkeypatch):
+    raiz = tmp_path / "arvore"
+    _arvore(raiz)
+    ler = AnalisadorUsoDisco._ler_diretorio
+
+    def falhar_em_b_sub(self, v, cache, no, st):
+        if no.caminho == str(raiz / "b" / "sub"):
+            raise RuntimeError("falha simulada")
+        return ler(self, v, cache, no, st)
+
+    monkeypatch.setattr(AnalisadorUsoDisco, "_ler_diretorio", falhar_em_b_sub)
+    totais = {}
+    resultado = _analisador(tmp_path).analisar(str(raiz), ao_total=totais.__setitem__, completa=True)
+
+    # a análise termina, "b" fecha sem a subárvore que falhou e a raiz ainda é repassada
+    assert resultado["erros"] == 1
+    assert totais[str(raiz / "b")] == os.lstat(raiz / "b").st_blocks * 512
+    assert resultado["total"] == _du(raiz) - _du(raiz / "b" / "sub")
+    assert str(raiz) in totais
+
+
+def test_erro_no_callback_nao_trava_a_analise(tmp_path):
+    raiz = tmp_path / "arvore"
+    _arvore(raiz)
+
+    def callback_quebrado(caminho, total):
+        raise ValueError("interface fechada")
+
+    resultado = _analisador(tmp_path).analisar(str(raiz), ao_total=callback_quebrado)
+    assert resultado["total"] == _du(raiz)
+
+
+def test_fatias_do_cache(tmp_path):
+    raiz = tmp_path / "arvore"
+    _arvore(raiz)
+    analisador = _analisador(tmp_path)
+    analisador.analisar(str(raiz))
+    fatias = os.listdir(tmp_path / "cache")
+    assert fatias and all(nome.endswith(".pickle") for nome in fatias)
+    assert len(fatias) <= usoDiscoModel.FATIAS_CACHE
@@ -0,0 +1,352 @@
+import os
+import stat
+import heapq
+import pickle
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import diagnosticoModel
+
+# Uso de disco por subárvore (como `du -x`), com os totais de cada diretório guardados entre execuções
+CAMINHO_CACHE_PADRAO = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "dashboard-so", "uso_disco"
+)
+FATIAS_CACHE = 256   # o cache em disco é dividido por hash do caminho; só as fatias alteradas são regravadas
+TRABALHADORES_PADRAO = min(32, 4 * (os.cpu_count() or 1)) # scandir/lstat esperam I/O: mais threads que núcleos
+MAIORES_PADRAO = 20  # maiores arquivos guardados por diretório e exibidos na visão "Maiores"
+
+# entrada do cache por diretório:
+# (st_mtime_ns, st_ino, bytes dos arquivos com 1 link, ((ino, bytes) dos arquivos com vários links,),
+#  (nomes dos subdiretórios,), ((bytes, nome) dos maiores arquivos,), quantidade de arquivos)
+
+
+def _fatia(caminho):
+    return zlib.crc32(os.fsencode(caminho)) % FATIAS_CACHE
+
+
+def _bytes_em_disco(st):
+    return st.st_blocks * 512 # espaço alocado, como o du (arquivos esparsos não contam o tamanho aparente)
+
+
+# MARK: Estado de uma análise
+
+class _No:
+    __slots__ = ("caminho", "pai", "pendentes", "total")
+
+    def __init__(self, caminho, pai, total):
+        self.caminho = caminho
+        self.pai = pai
+        self.pendentes = 1 # a própria leitura conta como pendente até terminar (ou falhar)
+        self.total = total
+
+
+class _Varredura:
+    def __init__(self, raiz, dev, ao_total, cancelado, maiores):
+        self.raiz = raiz
+        self.dev = dev
+        self.ao_total = ao_total
+        self.cancelado = cancelado
+        self.maiores = maiores
+        self.lock = threading.Lock()
+        self.tarefas = 0
+        self.terminou = threading.Event()
+        self.vistos = set()          # inodes com vários links já contados
+        self.novo_cache = {}
+        self.totais = {}
+        self.maiores_arquivos = []   # heaps mínimos de tamanho `maiores`: (bytes, caminho)
+        self.maiores_diretorios = []
+        self.total = 0
+        self.varridos = 0
+        self.reaproveitados = 0
+        self.arquivos = 0
+        self.erros = 0
+
+
+def _guardar_maior(heap, limite, item):
+    if len(heap) < limite:
+        heapq.heappush(heap, item)
+    elif item > heap[0]:
+        heapq.heapreplace(heap, item)
+
+
+# MARK: Analisador
+
+class AnalisadorUsoDisco:
+    """
+    Soma o espaço de cada subárvore com vários trabalhadores fazendo scandir em paralelo. Fica num
+    só sistema de arquivos e conta arquivos com vários hard links uma única vez. Para cada diretório
+    guarda a soma dos arquivos diretos, os subdiretórios e o mtime. Numa nova análise, um diretório
+    com o mesmo mtime não é relido: basta um lstat para confirmar e descer nos subdiretórios. Só os
+    diretórios que mudaram passam por scandir de novo.
+
+    O mtime de um diretório só muda quando entradas são criadas, removidas ou renomeadas. Um arquivo
+    que cresce no lugar só é recontado quando o diretório dele mudar, ou com `completa=True`.
+    """
+
+    def __init__(self, caminho_cache=CAMINHO_CACHE_PADRAO, trabalhadores=TRABALHADORES_PADRAO):
+        self.caminho_cache = caminho_cache
+        self.trabalhadores = trabalhadores
+        self._cache = None   # caminho -> entrada (ver acima)
+        self._totais = None  # caminho -> total da subárvore na última análise que passou por ele
+        self._chaves = None  # fatia -> caminhos dela, para regravar uma fatia sem percorrer o cache todo
+        self._sujas = set()  # fatias alteradas na memória e ainda não gravadas (análises canceladas não gravam)
+        self._lock_cache = threading.Lock()
+
+    # --- cache persistente (um arquivo por fatia: `caminho_cache`/NNN.pickle)
+
+    def _arquivo_fatia(self, fatia):
+        return os.path.join(self.caminho_cache, f"{fatia:03d}.pickle")
+
+    def _carregar_cache(self):
+        if self._cache is not None:
+            return
+        self._cache, self._totais = {}, {}
+        self._chaves = [set() for _ in range(FATIAS_CACHE)]
+        if not self.caminho_cache:
+            return
+        for fatia in range(FATIAS_CACHE):
+            try:
+                with open(self._arquivo_fatia(fatia), "rb") as f:
+                    dados = pickle.load(f)
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                print(f"Fatia do cache de uso de disco ignorada ({self._arquivo_fatia(fatia)}): {e}")
+                continue
+            self._cache.update(dados["diretorios"])
+            self._totais.update(dados["totais"])
+            self._chaves[fatia].update(dados["diretorios"])
+
+    def _definir(self, caminho, entrada, total):
+        self._cache[caminho] = entrada
+        if total is not None:
+            self._totais[caminho] = total
+        self._chaves[_fatia(caminho)].add(caminho)
+        self._sujas.add(_fatia(caminho))
+
+    def _remover(self, caminho):
+        del self._cache[caminho]
+        self._totais.pop(caminho, None)
+        self._chaves[_fatia(caminho)].discard(caminho)
+        self._sujas.add(_fatia(caminho))
+
+    def salvar(self):
+        """Regrava só as fatias alteradas desde a última gravação; chamar com _lock_cache tomado."""
+        if not self.caminho_cache or self._cache is None:
+            return
+        try:
+            os.makedirs(self.caminho_cache, exist_ok=True)
+            for fatia in sorted(self._sujas):
+                arquivo = self._arquivo_fatia(fatia)
+                chaves = self._chaves[fatia]
+                if not chaves:
+                    if os.path.exists(arquivo):
+                        os.unlink(arquivo)
+                    continue
+                dados = {
+                    "diretorios": {c: self._cache[c] for c in chaves},
+                    "totais": {c: self._totais[c] for c in chaves if c in self._totais},
+                }
+                with open(arquivo + ".tmp", "wb") as f:
+                    pickle.dump(dados, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(arquivo + ".tmp", arquivo)
+            self._sujas.clear()
+        except OSError as e:
+            print(f"Erro ao salvar o cache de uso de disco: {e}")
+
+    def total_em_cache(self, caminho):
+        """Soma conhecida da última análise que passou por `caminho` (None se nunca analisado)."""
+        with self._lock_cache:
+            self._carregar_cache()
+            return self._totais.get(os.path.normpath(caminho))
+
+    # --- análise
+
+    def analisar(self, raiz, ao_total=None, cancelado=None, maiores=MAIORES_PADRAO, completa=False):
+
+        """
+        Analisa `raiz` e devolve {"raiz", "total", "maiores_arquivos", "maiores_diretorios",
+        "diretorios", "varridos", "reaproveitados", "arquivos", "erros", "segundos", "cancelado"}.
+        `ao_total(caminho, total)` é chamado (de uma thread trabalhadora) assim que o total de um
+        filho direto de `raiz` fica pronto, e por último para a própria raiz.
+        `cancelado` (threading.Event) interrompe a análise.
+        """
+
+        inicio = time.perf_counter()
+        raiz = os.path.normpath(os.path.abspath(raiz))
+        st = os.lstat(raiz)
+        if not stat.S_ISDIR(st.st_mode):
+            raise NotADirectoryError(raiz)
+        with self._lock_cache:
+            self._carregar_cache()
+            cache = {} if completa else self._cache # completa: tudo é relido, e as entradas antigas são substituídas
+
+        v = _Varredura(raiz, st.st_dev, ao_total, cancelado or threading.Event(), maiores)
+        with ThreadPoolExecutor(self.trabalhadores, thread_name_prefix="uso-disco") as pool:
+            v.pool = pool
+            self._agendar(v, cache, raiz, st, None)
+            v.terminou.wait()
+
+        with self._lock_cache:
+            # só as fatias com entradas novas, alteradas ou removidas vão para o disco
+            if not v.cancelado.is_set():
+                # diretórios sob a raiz que não foram visitados não existem mais
+                prefixo = raiz.rstrip(os.sep) + os.sep
+                for caminho in [c for c in self._cache if c == raiz or c.startswith(prefixo)]:
+                    if caminho not in v.novo_cache:
+                        self._remover(caminho)
+            for caminho, entrada in v.novo_cache.items():
+                total = v.totais.get(caminho)
+                if self._cache.get(caminho) != entrada or self._totais.get(caminho) != total:
+                    self._definir(caminho, entrada, total)
+            if not v.cancelado.is_set():
+                self.salvar()
+
+        if diagnosticoModel.ATIVO:
+            diagnosticoModel.registrar("disco.analise", int((time.perf_counter() - inicio) * 1e9))
+            diagnosticoModel.contar("disco.diretorios_varridos", v.varridos)
+            diagnosticoModel.contar("disco.diretorios_reaproveitados", v.reaproveitados)
+        return {
+            "raiz": raiz,
+            "total": v.total,
+            "maiores_arquivos": sorted(v.maiores_arquivos, reverse=True),
+            "maiores_diretorios": sorted(v.maiores_diretorios, reverse=True),
+            "diretorios": v.varridos + v.reaproveitados,
+            "varridos": v.varridos,
+            "reaproveitados": v.reaproveitados,
+            "arquivos": v.arquivos,
+            "erros": v.erros,
+            "segundos": time.perf_counter() - inicio,
+            "cancelado": v.cancelado.is_set(),
+        }
+
+    def _agendar(self, v, cache, caminho, st, pai):
+        with v.lock:
+            v.tarefas += 1
+            if pai is not None:
+                pai.pendentes += 1
+        try:
+            v.pool.submit(self._visitar, v, cache, caminho, st, pai)
+        except Exception:
+            with v.lock:
+                v.tarefas -= 1
+                if pai is not None:
+                    pai.pendentes -= 1
+            raise
+
+    def _visitar(self, v, cache, caminho, st, pai):
+        no = _No(caminho, pai, 0)
+        try:
+            if not v.cancelado.is_set():
+                self._ler_diretorio(v, cache, no, st)
+        except Exception as e:
+            print(f"Erro ao analisar '{caminho}': {e}")
+            with v.lock:
+                v.erros += 1
+        finally:
+            try:
+                # mesmo depois de um erro o nó fecha com o que juntou, senão o pai nunca termina
+                if not v.cancelado.is_set():
+                    self._liberar(v, no)
+            finally:
+                with v.lock:
+                    v.tarefas -= 1
+                    if v.tarefas == 0:
+                        v.terminou.set()
+
+    def _ler_diretorio(self, v, cache, no, st):
+        caminho = no.caminho
+        if st is None: # subdiretório vindo do cache: um lstat confirma se mudou
+            try:
+                st = os.lstat(caminho)
+            except OSError:
+                st = None
+            if st is None or not stat.S_ISDIR(st.st_mode) or st.st_dev != v.dev:
+                return # fecha com total 0
+
+        entrada = cache.get(caminho)
+        if entrada is not None and entrada[0] == st.st_mtime_ns and entrada[1] == st.st_ino:
+            _, _, local, links, subdirs, maiores, arquivos = entrada
+            filhos = [(os.path.join(caminho, nome), None) for nome in subdirs]
+            reaproveitado, erro = True, False
+        else:
+            local, links, subdirs, maiores, arquivos, filhos = 0, [], [], [], 0, []
+            reaproveitado, erro = False, False
+            try:
+                with os.scandir(caminho) as entradas:
+                    for e in entradas:
+                        try:
+                            st_e = e.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        if stat.S_ISDIR(st_e.st_mode):
+                            if st_e.st_dev == v.dev: # não atravessa pontos de montagem
+                                subdirs.append(e.name)
+                                filhos.append((e.path, st_e))
+                            continue
+                        arquivos += 1
+                        tamanho = _bytes_em_disco(st_e)
+                        if st_e.st_nlink > 1 and not stat.S_ISLNK(st_e.st_mode):
+                            links.append((st_e.st_ino, tamanho))
+                        else:
+                            local += tamanho
+                        _guardar_maior(maiores, MAIORES_PADRAO, (tamanho, e.name))
+            except OSError:
+                erro = True # sem permissão: conta só o próprio diretório
+            entrada = (st.st_mtime_ns, st.st_ino, local, tuple(links), tuple(subdirs), tuple(maiores), arquivos)
+
+        with v.lock:
+            v.novo_cache[caminho] = entrada
+            v.reaproveitados += reaproveitado
+            v.varridos += not reaproveitado
+            v.erros += erro
+            for ino, tamanho in links:
+                if ino not in v.vistos:
+                    v.vistos.add(ino)
+                    local += tamanho
+            for tamanho, nome in maiores:
+                _guardar_maior(v.maiores_arquivos, v.maiores, (tamanho, os.path.join(caminho, nome)))
+            v.arquivos += arquivos
+            no.total += local + _bytes_em_disco(st)
+
+        for filho, st_filho in filhos:
+            self._agendar(v, cache, filho, st_filho, no)
+
+    def _liberar(self, v, no):
+        """Encerra a leitura do próprio `no`; fecha o total se os filhos já terminaram todos."""
+        with v.lock:
+            no.pendentes -= 1
+            if no.pendentes:
+                return
+        self._concluir(v, no)
+
+    def _concluir(self, v, no):
+        """Fecha o total de `no` e sobe pelos pais cujos filhos já terminaram todos."""
+        prontos = []
+        with v.lock:
+            while no is not None:
+                v.totais[no.caminho] = no.total
+                if no.pai is not None:
+                    _guardar_maior(v.maiores_diretorios, v.maiores, (no.total, no.caminho))
+                if no.pai is None or no.pai.pai is None:
+                    prontos.append((no.caminho, no.total))
+                if no.pai is None:
+                    v.total = no.total
+                    break
+                pai = no.pai
+                pai.total += no.total
+                pai.pendentes -= 1
+                if pai.pendentes:
+                    break
+                no = pai
+        if v.ao_total is not None:
+            for caminho, total in prontos:
+                try:
+                    v.ao_total(caminho, total)
+                except Exception as e:
+                    print(f"Erro ao repassar o total de '{caminho}': {e}")
+
+
+analisador = AnalisadorUsoDisco()
@@ -1,14 +1,197 @@
+import bisect
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk
 
-from systemModel import getFileSystem
+import diagnosticoModel
+import usoDiscoModel
+from systemModel import tabela_montagens
+from processModel import demanda_recursos, demanda_processos
 
 uso_cpu_label = None
 ociosidade_label = None
 memoria_label = None
-processos_listbox: ttk.Treeview | None = None
-recursos_listbox: ttk.Treeview | None = None
+estados_cpu_label = None
+nucleos_canvas = None      # faixa de calor com o uso de cada núcleo
+tendencia_cpu_canvas = None
+tendencia_mem_canvas = None
+processos_listbox = None  # TabelaVirtual da janela de processos
+recursos_listbox = None   # TabelaVirtual de recursos abertos
 content_listbox = None    
+diagnostico_tree = None    # Treeview da janela de diagnóstico (tempos por etapa)
+agendamento_label = None   # intervalos escolhidos pelo agendador adaptativo
+discos_label = None        # IOPS, vazão e utilização dos discos mais ativos
+rede_label = None          # banda e pacotes das interfaces mais ativas
+DISPOSITIVOS_NO_PAINEL = 4 # linhas por painel de E/S (os mais ativos)
+
+# Nomes exibidos para cada coletor do agendador
+_NOMES_COLETORES = {"cpu": "CPU", "memoria": "Memória", "io": "E/S", "processos": "Processos", "recursos": "FDs/sockets"}
+
+# Estado da última renderização de cada Treeview reconciliado: {nome_widget: {"valores": {iid: values}, "ordem": [iid, ...]}}
+_estado_treeviews = {}
+
+# Contadores da última atualização da interface (operações Tk emitidas)
+estatisticas_interface = {"operacoes_tk_processos": 0, "operacoes_tk_recursos": 0}
+
+# Últimos dados usados para montar o índice de recursos (evita reachatar todos os FDs a cada tick)
+_recursos_fonte = None
+
+
+# MARK: Reconciliação incremental de Treeview
+def _reconciliar_treeview(tv, linhas):
+    """
+    Aplica no Treeview apenas as diferenças em relação à renderização anterior.
+    `linhas` é uma lista ordenada de (iid, values). Insere iids novos, remove os que
+    sumiram, chama item(..., values=...) só nas linhas alteradas e move apenas se a
+    ordem mudou. Retorna o número de operações Tk emitidas.
+    """
+    estado = _estado_treeviews.setdefault(str(tv), {"valores": {}, "ordem": []})
+    valores_anteriores = estado["valores"]
+    nova_ordem = [iid for iid, _ in linhas]
+    novos_valores = dict(linhas)
+    operacoes = 0
+
+    removidos = [iid for iid in estado["ordem"] if iid not in novos_valores]
+    if removidos:
+        tv.delete(*removidos)
+        operacoes += 1
+
+    restantes = [iid for iid in estado["ordem"] if iid in novos_valores]
+    ordem_preservada = restantes == [iid for iid in nova_ordem if iid in valores_anteriores]
+
+    for indice, (iid, values) in enumerate(linhas):
+        if iid not in valores_anteriores:
+            # se a ordem relativa foi preservada, inserir já na posição final dispensa o move
+            tv.insert("", indice if ordem_preservada else "end", iid=iid, values=values)
+            operacoes += 1
+        elif valores_anteriores[iid] != values:
+            tv.item(iid, values=values)
+            operacoes += 1
+
+    if not ordem_preservada:
+        atual = restantes + [iid for iid in nova_ordem if iid not in valores_anteriores]
+        for indice, iid in enumerate(nova_ordem):
+            if atual[indice] != iid:
+                tv.move(iid, "", indice)
+                atual.remove(iid)
+                atual.insert(indice, iid)
+                operacoes += 1
+
+    estado["valores"] = novos_valores
+    estado["ordem"] = nova_ordem
+    return operacoes
+
+
+# MARK: Tabela virtual (renderiza só as linhas visíveis)
+class TabelaVirtual:
+    """
+    Treeview com rolagem virtual: o índice completo de linhas fica em memória (lista ordenada,
+    fatiável em O(janela)) e só as linhas visíveis mais um pequeno buffer viram itens Tk.
+    A barra de rolagem controla o deslocamento no índice, não o Treeview.
+    """
+
+    def __init__(self, parent, colunas, cabecalhos=None, larguras=None, buffer=10):
+        self.frame = tk.Frame(parent)
+        self.tv = ttk.Treeview(self.frame, columns=colunas, show="headings")
+        self.scroll = ttk.Scrollbar(self.frame, orient="vertical", command=self._on_scroll)
+        self.scroll.pack(side="right", fill="y")
+        self.tv.pack(fill="both", expand=True)
+
+        cabecalhos = cabecalhos or {}
+        larguras = larguras or {}
+        for c in colunas:
+            self.tv.heading(c, text=cabecalhos.get(c, c))
+            self.tv.column(c, anchor="w", width=larguras.get(c, 100), stretch=True)
+
+        self.colunas = colunas
+        self.buffer = buffer
+        self.linhas = []     # [(iid, values), ...] já na ordem de exibição
+        self.chaves = None   # chaves de ordenação alinhadas a `linhas` (para busca com bisect)
+        self.inicio = 0
+        self.visiveis = 20
+        self.ao_renderizar = None  # callback chamado quando a janela visível muda (ex.: pedir FDs dessas linhas)
+        altura = ttk.Style().lookup("Treeview", "rowheight")
+        self.altura_linha = int(altura) if altura else 20
+
+        self.tv.bind("<Configure>", self._on_configure)
+        self.tv.bind("<MouseWheel>", self._on_roda)
+        self.tv.bind("<Button-4>", self._on_roda)
+        self.tv.bind("<Button-5>", self._on_roda)
+        self.tv.bind("<Destroy>", lambda e: _estado_treeviews.pop(str(self.tv), None))
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def winfo_exists(self):
+        return self.tv.winfo_exists()
+
+    def selection(self):
+        return self.tv.selection()
+
+    def definir_linhas(self, linhas, chaves=None):
+        """Troca o índice de linhas e redesenha apenas a janela visível. Retorna as operações Tk emitidas."""
+        self.linhas = linhas
+        self.chaves = chaves
+        return self._renderizar()
+
+    def ir_para(self, chave):
+        """Posiciona a janela na primeira linha com chave >= `chave` (requer `chaves`)."""
+        if self.chaves is not None:
+            self.inicio = bisect.bisect_left(self.chaves, chave)
+            self._renderizar()
+
+    def linhas_visiveis(self):
+        """Fatia do índice que está materializada no Treeview."""
+        return self.linhas[self.inicio:self.inicio + self.visiveis + self.buffer]
+
+    def linhas_seguintes(self, n):
+        """As `n` linhas logo abaixo da janela visível (as próximas prováveis ao rolar)."""
+        fim = self.inicio + self.visiveis
+        return self.linhas[fim:fim + n]
+
+    def _renderizar(self):
+        total = len(self.linhas)
+        self.inicio = max(0, min(self.inicio, total - self.visiveis))
+        operacoes = _reconciliar_treeview(self.tv, self.linhas_visiveis())
+        self.tv.yview_moveto(0)
+        if total:
+            self.scroll.set(self.inicio / total, min(1.0, (self.inicio + self.visiveis) / total))
+        else:
+            self.scroll.set(0, 1)
+        if self.ao_renderizar:
+            self.ao_renderizar()
+        return operacoes
+
+    def _rolar(self, linhas):
+        anterior = self.inicio
+        self.inicio = max(0, min(self.inicio + linhas, len(self.linhas) - self.visiveis))
+        if self.inicio != anterior:
+            self._renderizar()
+
+    def _on_scroll(self, *args):
+        if args[0] == "moveto":
+            self.inicio = int(float(args[1]) * len(self.linhas))
+            self._renderizar()
+        elif args[0] == "scroll":
+            passo = int(args[1]) * (self.visiveis if args[2] == "pages" else 1)
+            self._rolar(passo)
+
+    def _on_roda(self, event):
+        if event.num == 4 or event.delta > 0:
+            self._rolar(-3)
+        else:
+            self._rolar(3)
+        return "break"  # impede o Treeview de rolar os itens de buffer por conta própria
+
+    def _on_configure(self, event):
+        visiveis = max(1, (event.height - self.altura_linha) // self.altura_linha)
+        if visiveis != self.visiveis:
+            self.visiveis = visiveis
+            self._renderizar()
+
+
+INTERVALO_MONTAGENS_MS = 1000
 
 def fileSystemView(root):
     win = tk.Toplevel(root)
@@ -30,40 +213,218 @@ def fileSystemView(root):
         tree.heading(col, text=col)
         tree.column(col, width=120, anchor="w")
 
-    partitions = getFileSystem()
-
-    if partitions:
-        current_row = {}
-        for item in partitions:
-            # Junta as duas partes (dispositivo + uso)
-            if "Dispositivo de Bloco" in item:
-                current_row = {
-                    "Dispositivo": item.get("Dispositivo de Bloco", "-"),
-                    "Diretório": item.get("Diretorio", "-"),
-                    "Opções de Montagem": item.get("Opçoes de Montagem", "-")
-                }
-            elif "Tamanho Total (Gb)" in item:
-                current_row.update({
-                    "Tamanho Total (Gb)": item.get("Tamanho Total (Gb)", "-"),
-                    "Espaço Usado (Mb)": item.get("Espaço Usado (Mb)", "-"),
-                    "Espaço Livre (Gb)": item.get("Espaço Livre (Gb)", "-"),
-                    "Disponível (Gb)": item.get("Espaço Disponível (Gb)", "-"),
-                    "Uso (%)": item.get("Percentual de Uso (%)", "-")
-                })
-                tree.insert("", "end", values=(
-                    current_row.get("Dispositivo", "-"),
-                    current_row.get("Diretório", "-"),
-                    current_row.get("Opções de Montagem", "-"),
-                    current_row.get("Tamanho Total (Gb)", "-"),
-                    current_row.get("Espaço Usado (Mb)", "-"),
-                    current_row.get("Espaço Livre (Gb)", "-"),
-                    current_row.get("Disponível (Gb)", "-"),
-                    current_row.get("Uso (%)", "-"),
-                ))
+    tree.bind("<Destroy>", lambda e: _estado_treeviews.pop(str(tree), None))
+
+    # nunca espera statvfs na thread do Tk: montagens ainda sem resposta aparecem com o estado e
+    # a tabela se atualiza sozinha (o mountinfo só é relido quando muda). As linhas são
+    # reconciliadas pelo ponto de montagem, então seleção e rolagem sobrevivem às atualizações.
+    def _atualizar():
+        if not tree.winfo_exists():
+            return
+        linhas = []
+        pendentes = False
+        for montagem in tabela_montagens.montagens():
+            uso = montagem["Uso"] or {}
+            estado = montagem["Estado"]
+            pendentes |= estado == "pendente"
+            linhas.append((montagem["Diretorio"], (
+                montagem["Dispositivo de Bloco"],
+                montagem["Diretorio"],
+                montagem["Opçoes de Montagem"],
+                uso.get("Tamanho Total (Gb)", "-"),
+                uso.get("Espaço Usado (Mb)", "-"),
+                uso.get("Espaço Livre (Gb)", "-"),
+                uso.get("Espaço Disponível (Gb)", "-"),
+                uso.get("Percentual de Uso (%)", "-") if estado == "ok" else estado,
+            )))
+        _reconciliar_treeview(tree, linhas)
+        win.after(100 if pendentes else INTERVALO_MONTAGENS_MS, _atualizar)
+
+    _atualizar()
 
 
 # MARK: View de Diretõrios a partir da root
-def diretoryContentView(root, directoryData, get_directory_data_callback):
+# MARK: Carregamento do diretório em lotes (thread produtora + after() na thread do Tk)
+class CarregadorDiretorio:
+    """
+    Lista um diretório numa thread e insere cada lote no Treeview num callback after(), para que a
+    interface continue respondendo em diretórios com milhões de entradas. Carregar outro caminho
+    (ou cancelar) sinaliza a listagem anterior para parar e descarta os lotes que ainda chegarem.
+    """
+
+    INTERVALO_MS = 10      # intervalo entre lotes inseridos
+    LOTES_NA_FILA = 8      # limita quanto a thread produtora pode se adiantar à interface
+
+    def __init__(self, tv, fonte_lotes, ao_progresso=None):
+        self.tv = tv
+        self.fonte_lotes = fonte_lotes   # fonte_lotes(caminho, cancelado, reler) -> iterável de listas de registros
+        self.ao_progresso = ao_progresso # ao_progresso(caminho, itens, terminou, erro)
+        self._cancelado = None
+        self._fila = None
+        self._agendado = None
+
+    def carregar(self, caminho, reler=False):
+        """`reler=True` (botão Atualizar) lê o diretório de novo em vez de usar a listagem em cache."""
+        self.cancelar()
+        _limpar_conteudo_diretorio(self.tv)
+        self._cancelado = threading.Event()
+        self._fila = queue.Queue(self.LOTES_NA_FILA)
+        self.itens = 0
+        threading.Thread(target=self._produzir, args=(caminho, self._cancelado, self._fila, reler), daemon=True).start()
+        self._agendado = self.tv.after(self.INTERVALO_MS, self._consumir, caminho, self._fila)
+
+    def cancelar(self):
+        if self._cancelado is not None:
+            self._cancelado.set()
+        if self._agendado is not None:
+            self.tv.after_cancel(self._agendado)
+            self._agendado = None
+
+    def _produzir(self, caminho, cancelado, fila, reler):
+        erro = None
+        try:
+            for lote in self.fonte_lotes(caminho, cancelado, reler):
+                while not cancelado.is_set():
+                    try:
+                        fila.put(lote, timeout=0.2)
+                        break
+                    except queue.Full:
+                        continue
+                if cancelado.is_set():
+                    return
+        except OSError as e:
+            erro = e
+        while not cancelado.is_set():
+            try:
+                fila.put(("fim", erro), timeout=0.2)
+                return
+            except queue.Full:
+                continue
+
+    def _consumir(self, caminho, fila):
+        self._agendado = None
+        if fila is not self._fila or not self.tv.winfo_exists():
+            return # listagem antiga (o usuário já navegou) ou janela fechada
+        try:
+            lote = fila.get_nowait()
+        except queue.Empty:
+            lote = None
+        if isinstance(lote, tuple):
+            _, erro = lote
+            if erro is not None:
+                print(f"Erro ao listar o diretório '{caminho}': {erro}")
+            if not self.itens:
+                _inserir_lote_conteudo(self.tv, None)
+            _inserir_particoes(self.tv)
+            if self.ao_progresso:
+                self.ao_progresso(caminho, self.itens, True, erro)
+            return
+        if lote:
+            _inserir_lote_conteudo(self.tv, lote)
+            self.itens += len(lote)
+            if self.ao_progresso:
+                self.ao_progresso(caminho, self.itens, False, None)
+        self._agendado = self.tv.after(self.INTERVALO_MS, self._consumir, caminho, fila)
+
+
+# MARK: Uso de disco (totais das subárvores chegando na coluna "Tamanho Bytes")
+class AcompanhamentoUsoDisco:
+    """
+    Roda o analisador de uso de disco numa thread e, num callback after(), escreve cada total na
+    linha do diretório correspondente (o iid das linhas é o caminho). Uma nova análise ou
+    cancelar() interrompe a anterior; totais atrasados de uma análise antiga são descartados.
+    """
+
+    INTERVALO_MS = 100
+
+    def __init__(self, tv, ao_terminar=None):
+        self.tv = tv
+        self.ao_terminar = ao_terminar # ao_terminar(resultado) na thread do Tk
+        self.resultado = None
+        self._cancelado = None
+        self._fila = None
+        self._agendado = None
+
+    def analisar(self, caminho):
+        self.cancelar()
+        self._cancelado = threading.Event()
+        self._fila = queue.SimpleQueue()
+        threading.Thread(target=self._analisar, args=(caminho, self._cancelado, self._fila), daemon=True).start()
+        self._agendado = self.tv.after(self.INTERVALO_MS, self._consumir, self._fila)
+
+    def cancelar(self):
+        if self._cancelado is not None:
+            self._cancelado.set()
+        if self._agendado is not None:
+            self.tv.after_cancel(self._agendado)
+            self._agendado = None
+        self._fila = None
+
+    def _analisar(self, caminho, cancelado, fila):
+        try:
+            resultado = usoDiscoModel.analisador.analisar(
+                caminho, ao_total=lambda c, total: fila.put((c, total)), cancelado=cancelado)
+        except OSError as e:
+            print(f"Erro ao analisar o uso de disco de '{caminho}': {e}")
+            resultado = None
+        fila.put(("fim", resultado))
+
+    def _consumir(self, fila):
+        self._agendado = None
+        if fila is not self._fila or not self.tv.winfo_exists():
+            return
+        while True:
+            try:
+                caminho, total = fila.get_nowait()
+            except queue.Empty:
+                break
+            if caminho == "fim":
+                self.resultado = total
+                if self.ao_terminar and total is not None and not total["cancelado"]:
+                    self.ao_terminar(total)
+                return
+            if self.tv.exists(caminho):
+                self.tv.set(caminho, "Tamanho Bytes", total)
+        self._agendado = self.tv.after(self.INTERVALO_MS, self._consumir, fila)
+
+
+def maioresView(root, resultado):
+    """Maiores arquivos e diretórios da última análise de uso de disco."""
+    janela = tk.Toplevel(root)
+    janela.title(f"Maiores em {resultado['raiz']}")
+    janela.geometry("700x450")
+
+    tv = ttk.Treeview(janela, columns=("tipo", "tamanho", "caminho"), show="headings")
+    tv.heading("tipo", text="Tipo")
+    tv.heading("tamanho", text="Tamanho (Bytes)")
+    tv.heading("caminho", text="Caminho")
+    tv.column("tipo", width=80, anchor="w")
+    tv.column("tamanho", width=130, anchor="e")
+    tv.column("caminho", width=460, anchor="w")
+    tv.pack(fill="both", expand=True, padx=10, pady=10)
+
+    for tamanho, caminho in resultado["maiores_diretorios"]:
+        tv.insert("", "end", values=("Diretório", tamanho, caminho))
+    for tamanho, caminho in resultado["maiores_arquivos"]:
+        tv.insert("", "end", values=("Arquivo", tamanho, caminho))
+
+
+def _lotes_com_tamanhos(fonte_lotes):
+    """Preenche o tamanho dos diretórios já analisados (totais guardados pelo analisador de uso de disco)."""
+    def lotes(caminho, cancelado, reler=False):
+        for lote in fonte_lotes(caminho, cancelado, reler):
+            # os registros podem vir do cache de listagens: copia em vez de alterar
+            yield [
+                {**info, "Tamanho (Bytes)": total}
+                if info.get("Tipo") == "Diretório"
+                and (total := usoDiscoModel.analisador.total_em_cache(info["Caminho"])) is not None
+                else info
+                for info in lote
+            ]
+    return lotes
+
+
+def diretoryContentView(root, get_directory_data_callback):
     global content_listbox
 
     directoryWindow = tk.Toplevel(root)
@@ -75,7 +436,10 @@ def diretoryContentView(root, directoryData, get_directory_data_callback):
 
     def _on_close():
         global content_listbox
-        content_listbox = None
+        carregador.cancelar()
+        uso_disco.cancelar()
+        if content_listbox is tv: # outra janela de diretório pode ser a mais recente
+            content_listbox = None
         directoryWindow.destroy()
 
     directoryWindow.protocol("WM_DELETE_WINDOW", _on_close)
@@ -85,33 +449,63 @@ def diretoryContentView(root, directoryData, get_directory_data_callback):
 
     columns = (
         "Nome", "Caminho", "Permissões", "Data de Criação",
-        "Data de Modificação", "Tipo", "Tamanho Bytes"
+        "Data de Modificação", "Tipo", "Tamanho Bytes", "Dono"
     )
-    content_listbox = ttk.Treeview(frame_content, columns=columns, show="headings")
-    content_listbox.pack(fill="both", expand=True)
+    # cada janela usa o próprio Treeview; o global só aponta para a mais recente (updateDirectoryContentView)
+    tv = content_listbox = ttk.Treeview(frame_content, columns=columns, show="headings")
+    tv.pack(fill="both", expand=True)
 
     for col in columns:
-        content_listbox.heading(col, text=col)
+        tv.heading(col, text=col)
+
+    status_label = tk.Label(frame_content, text="", anchor="w")
+    status_label.pack(fill="x")
+
+    def _on_progresso(caminho, itens, terminou, erro):
+        if erro is not None:
+            status_label.config(text=f"{caminho}: {erro.strerror or erro}")
+        elif terminou:
+            status_label.config(text=f"{caminho}: {itens} itens")
+        else:
+            status_label.config(text=f"{caminho}: carregando… {itens} itens")
+
+    # get_directory_data_callback(caminho, cancelado, reler) devolve os lotes do diretório
+    carregador = CarregadorDiretorio(tv, _lotes_com_tamanhos(get_directory_data_callback), _on_progresso)
+
+    def _on_uso_disco(resultado):
+        status_label.config(
+            text=f"{resultado['raiz']}: {resultado['total']} bytes em {resultado['diretorios']} diretórios "
+                 f"({resultado['varridos']} relidos) em {resultado['segundos']:.1f} s"
+        )
+
+    uso_disco = AcompanhamentoUsoDisco(tv, _on_uso_disco)
+
+    def _navegar(caminho, reler=False):
+        # navegar cancela a listagem e a análise de uso de disco em andamento
+        uso_disco.cancelar()
+        carregador.carregar(caminho, reler)
 
     button_frame = tk.Frame(frame_content)
     button_frame.pack(anchor="ne", pady=5)
 
     def on_refresh():
-        refreshed_data = get_directory_data_callback(current_directory_path[0])
-        if refreshed_data:
-            updateDirectoryContentView(refreshed_data)
+        _navegar(current_directory_path[0], reler=True) # Atualizar não confia no cache de listagens
+
+    def on_uso_disco():
+        status_label.config(text=f"{current_directory_path[0]}: calculando uso de disco…")
+        uso_disco.analisar(current_directory_path[0])
+
+    def on_maiores():
+        if uso_disco.resultado is not None:
+            maioresView(root, uso_disco.resultado)
         else:
-            print(f"Erro ao atualizar o diretório: {current_directory_path[0]}")
+            print("Nenhuma análise de uso de disco concluída.")
 
     def on_back_to_previous():
         if history_stack:
             previous_path = history_stack.pop()
             current_directory_path[0] = previous_path
-            prev_data = get_directory_data_callback(previous_path)
-            if prev_data:
-                updateDirectoryContentView(prev_data)
-            else:
-                print(f"Erro ao voltar para: {previous_path}")
+            _navegar(previous_path)
         else:
             print("Nenhum diretório anterior no histórico.")
 
@@ -136,34 +530,42 @@ def diretoryContentView(root, directoryData, get_directory_data_callback):
     )
     backPrevButton.pack(side="left", padx=10)
 
+    usoDiscoButton = tk.Button(
+        button_frame, text="Uso de disco",
+        command=on_uso_disco,
+        bg="#d8bfd8", fg="#000000"
+    )
+    usoDiscoButton.pack(side="left", padx=10)
+
+    maioresButton = tk.Button(
+        button_frame, text="Maiores",
+        command=on_maiores,
+        bg="#d8bfd8", fg="#000000"
+    )
+    maioresButton.pack(side="left", padx=10)
+
     def on_item_click(event):
-        selected_item = content_listbox.selection()
+        selected_item = tv.selection()
         if selected_item:
-            item_data = content_listbox.item(selected_item, "values")
+            item_data = tv.item(selected_item, "values")
             item_path = item_data[1]
             if item_data[5] == "Diretório": 
-                new_directory_data = get_directory_data_callback(item_path)
-                if new_directory_data:
-                    history_stack.append(current_directory_path[0])
-                    current_directory_path[0] = item_path 
-                    updateDirectoryContentView(new_directory_data)
-                else:
-                    print(f"Erro ao acessar o diretório: {item_path}")
-                    updateDirectoryContentView(None) 
+                history_stack.append(current_directory_path[0])
+                current_directory_path[0] = item_path 
+                _navegar(item_path)
             else:
                 print(f"Item selecionado não é um diretório: {item_data[0]}")
 
-    content_listbox.bind("<Double-1>", on_item_click)
+    tv.bind("<Double-1>", on_item_click)
 
-    updateDirectoryContentView(directoryData)
+    _navegar(current_directory_path[0])
 
 def _preparar_recursos_treeview(parent):
-    """Cria Treeview para detalhar recursos abertos de um processo, agora com coluna PID."""
+    """Cria a tabela virtual para detalhar recursos abertos dos processos, com coluna PID."""
     cols = (
         "pid", "fd", "tipo", "caminho", "inode", "modo", "tamanho",
         "protocolo", "local_address", "remote_address", "state"
     )
-    tv = ttk.Treeview(parent, columns=cols, show="headings")
     headers = {
         "pid": "PID", "fd": "FD", "tipo": "Tipo", "caminho": "Caminho",
         "inode": "Inode", "modo": "Modo", "tamanho": "Tamanho",
@@ -174,89 +576,113 @@ def _preparar_recursos_treeview(parent):
         "inode": 80, "modo": 80, "tamanho": 80,
         "protocolo": 80, "local_address": 140, "remote_address": 140, "state": 100
     }
-    for c in cols:
-        tv.heading(c, text=headers[c])
-        tv.column(c, anchor="w", width=widths[c], stretch=True)
-    vsb = ttk.Scrollbar(parent, orient="vertical", command=tv.yview)
-    tv.configure(yscrollcommand=vsb.set)
-    vsb.pack(side="right", fill="y")
-    return tv
-
-# MARK: Popular recursos abertos de TODOS os processos
-def _popular_recursos(all_procs_data: dict): 
-    """Preenche recursos_listbox com recursos combinados de TODOS os processos."""
-    global recursos_listbox
-    if recursos_listbox is None or not recursos_listbox.winfo_exists():
-        return
-
-    recursos_listbox.delete(*recursos_listbox.get_children())
-
-    all_combined_resources = []
-    for pid_str, proc_info in all_procs_data.items(): # Itera sobre TODOS os processos
-        recursos_do_proc = proc_info.get("recursos_abertos", {})
+    return TabelaVirtual(parent, cols, headers, widths)
+
+# MARK: Índice de recursos abertos dos processos inventariados
+def _indexar_recursos(recursos_por_pid: dict):
+    """Achata os recursos {pid: recursos} num índice ordenado por (PID, FD): (chaves, linhas)."""
+    indice = []
+    for pid_str, recursos_do_proc in recursos_por_pid.items():
+        recursos_do_proc = recursos_do_proc or {}
+        pid = int(pid_str)
         for categoria in (
             "arquivos_regulares", "sockets", "pipes", "dispositivos",
             "semaphores_posix", "links_quebrados_ou_inacessiveis", "outros"
         ):
-            items_da_categoria = recursos_do_proc.get(categoria, [])
-            for item in items_da_categoria:
-                item_com_pid = item.copy()
-                item_com_pid['pid'] = int(pid_str) # Adiciona o PID do processo ao recurso
-                all_combined_resources.append(item_com_pid)
-    
-    # Opcional: Ordenar a lista global (ex: por PID, depois FD)
-    try:
-        all_combined_resources.sort(key=lambda x: (x.get('pid', 0), int(x.get("fd", "0")))) # '0' para fd para evitar erro se não houver
-    except Exception:
-        pass # Ignora erros de ordenação
-
-    if not all_combined_resources:
-        recursos_listbox.insert("", "end", values=("Sem recursos abertos no sistema.", *("",) * (len(recursos_listbox['columns']) - 1)))
+            for d in recursos_do_proc.get(categoria, []):
+                fd = d.get("fd", "—")
+                tipo = d.get("tipo", "—")
+
+                # Ajuste para sockets e semáforos como na sua última versão (sem as colunas 0/1)
+                protocolo_display = d.get("protocolo", "N/A")
+                local_address_display = d.get("local_address", "N/A")
+                remote_address_display = d.get("remote_address", "N/A")
+                state_display = d.get("state", "N/A")
+
+                if tipo == "Socket Unix":
+                    protocolo_display = f"UNIX/{d.get('tipo_unix', '?')}"
+                elif "Socket" in tipo and "Unix" in tipo:
+                    protocolo_display = "UNIX"
+                    local_address_display = d.get("caminho", "N/A")
+                    remote_address_display = "N/A"
+                    state_display = "N/A"
+                elif "Semaphore" in tipo:
+                    protocolo_display = "N/A"
+                    local_address_display = "N/A"
+                    remote_address_display = "N/A"
+                    state_display = "N/A"
+
+                try:
+                    chave = (pid, int(fd))
+                except (TypeError, ValueError):
+                    chave = (pid, -1)
+
+                indice.append((chave, (
+                    f"{pid}:{fd}",
+                    (
+                        pid, fd, tipo,
+                        d.get("caminho", "—"),
+                        d.get("inode", "—"),
+                        d.get("modo", "—"),
+                        d.get("tamanho", "—"),
+                        protocolo_display,
+                        local_address_display,
+                        remote_address_display,
+                        state_display
+                    )
+                )))
+
+    indice.sort(key=lambda x: x[0])
+    return [c for c, _ in indice], [linha for _, linha in indice]
+
+
+def _mesmos_dados(anterior, atual):
+    """Compara dois dicionários de processos por identidade dos registros (o controller só troca o dicionário a cada ciclo)."""
+    if anterior is None or len(anterior) != len(atual):
+        return False
+    return all(a is b for a, b in zip(anterior.values(), atual.values()))
+
+# MARK: Popular recursos abertos dos processos inventariados
+def _popular_recursos(all_procs_data: dict, recursos=None): 
+    """
+    Atualiza o índice da tabela virtual de recursos; só a janela visível vira item do Treeview.
+    `recursos` ({pid: recursos}) vem do inventário sob demanda; sem ele (ex.: capturas antigas)
+    usa os "recursos_abertos" embutidos nos registros dos processos.
+    """
+    global _recursos_fonte
+    if recursos_listbox is None or not recursos_listbox.winfo_exists():
         return
 
-    for d in all_combined_resources:
-        # Prepara valores para as colunas
-        pid = d.get("pid", "—") # Pega o PID que foi adicionado
-        fd = d.get("fd", "—")
-        tipo = d.get("tipo", "—")
-        caminho = d.get("caminho", "—")
-        inode = d.get("inode", "—")
-        modo = d.get("modo", "—")
-        tamanho = d.get("tamanho", "—")
-        
-        # Ajuste para sockets e semáforos como na sua última versão (sem as colunas 0/1)
-        protocolo_display = d.get("protocolo", "N/A")
-        local_address_display = d.get("local_address", "N/A")
-        remote_address_display = d.get("remote_address", "N/A")
-        state_display = d.get("state", "N/A")
-
-        if "Socket" in tipo and "Unix" in tipo:
-            protocolo_display = "UNIX"
-            local_address_display = d.get("caminho", "N/A")
-            remote_address_display = "N/A"
-            state_display = "N/A"
-        elif "Semaphore" in tipo:
-            protocolo_display = "N/A"
-            local_address_display = "N/A"
-            remote_address_display = "N/A"
-            state_display = "N/A"
-
-        recursos_listbox.insert(
-            "", "end",
-            values=(
-                pid, # <--- AGORA USA O PID DO RECURSO COMBINADO
-                fd,
-                tipo,
-                caminho,
-                inode,
-                modo,
-                tamanho,
-                protocolo_display,
-                local_address_display,
-                remote_address_display,
-                state_display
-            )
-        )
+    # o índice só é reconstruído quando chega um novo inventário (ou ciclo de coleta)
+    if recursos is not None:
+        if recursos is _recursos_fonte:
+            return
+        _recursos_fonte = recursos
+    else:
+        if _mesmos_dados(_recursos_fonte, all_procs_data):
+            return
+        _recursos_fonte = all_procs_data
+        recursos = {pid: info["recursos_abertos"] for pid, info in all_procs_data.items() if info.get("recursos_abertos")}
+
+    chaves, linhas = _indexar_recursos(recursos)
+    if not linhas:
+        texto = "Selecione ou role até um processo para ver os recursos abertos." if not recursos else "Sem recursos abertos."
+        linhas = [("sem_recursos", (texto, *("",) * (len(recursos_listbox.colunas) - 1)))]
+        chaves = None
+
+    estatisticas_interface["operacoes_tk_recursos"] = recursos_listbox.definir_linhas(linhas, chaves)
+
+# MARK: Demanda de inventário: processo selecionado, linhas visíveis e prefetch
+def _pedir_recursos_visiveis():
+    """Pede ao coletor sob demanda os FDs do selecionado e das linhas visíveis, e as próximas linhas em segundo plano."""
+    tabela = processos_listbox
+    if tabela is None or not tabela.winfo_exists():
+        return
+    prioritarios = list(tabela.selection())
+    prioritarios += [iid for iid, _ in tabela.linhas[tabela.inicio:tabela.inicio + tabela.visiveis]]
+    prefetch = [iid for iid, _ in tabela.linhas_seguintes(tabela.visiveis)]
+    prefetch += [iid for iid, _ in tabela.linhas[max(0, tabela.inicio - tabela.buffer):tabela.inicio]]
+    demanda_recursos.definir(dict.fromkeys(p for p in prioritarios if p.isdigit()), [p for p in prefetch if p.isdigit()])
 
 def processView(root: tk.Tk, cpu: dict, mem: dict, procs: dict):
     """Janela que mostra lista de processos + recursos do selecionado."""
@@ -266,11 +692,15 @@ def processView(root: tk.Tk, cpu: dict, mem: dict, procs: dict):
     win.title("Processos em Execução")
     win.geometry("1200x600")
     win.grab_set()
+    demanda_processos.abrir() # liga a varredura por PID enquanto a janela estiver aberta
 
     def _on_close():
-        global processos_listbox, recursos_listbox
+        global processos_listbox, recursos_listbox, _recursos_fonte
         processos_listbox = None
         recursos_listbox = None
+        _recursos_fonte = None
+        demanda_recursos.definir(()) # nada visível: o inventário de FDs para
+        demanda_processos.fechar()
         win.destroy()
 
     win.protocol("WM_DELETE_WINDOW", _on_close)
@@ -285,19 +715,19 @@ def processView(root: tk.Tk, cpu: dict, mem: dict, procs: dict):
     proc_cols = (
         "pid", "usuario", "nome", "cpu", "cpu%", "threads", "total", "heap", "stack", "codigo", "paginas"
     )
-    processos_listbox = ttk.Treeview(frame_top, columns=proc_cols, show="headings")
+    processos_listbox = TabelaVirtual(
+        frame_top, proc_cols,
+        {c: c.upper() if c != "pid" else "PID" for c in proc_cols},
+        {c: 100 if c != "nome" else 200 for c in proc_cols},
+    )
     processos_listbox.pack(fill="both", expand=True)
-    for c in proc_cols:
-        processos_listbox.heading(c, text=c.upper() if c != "pid" else "PID")
-        processos_listbox.column(c, anchor="w", width=100 if c != "nome" else 200, stretch=True)
-    # Scroll
-    vsb_p = ttk.Scrollbar(frame_top, orient="vertical", command=processos_listbox.yview)
-    processos_listbox.configure(yscrollcommand=vsb_p.set)
-    vsb_p.pack(side="right", fill="y")
+    processos_listbox.ao_renderizar = _pedir_recursos_visiveis
+    processos_listbox.tv.bind("<<TreeviewSelect>>", lambda e: _pedir_recursos_visiveis())
 
     # -------------- Recursos (inferior) -------------------------------------
     frame_bot = tk.LabelFrame(paned, text="Recursos Abertos", padx=10, pady=10) 
     paned.add(frame_bot, weight=2)
+    tk.Button(frame_bot, text="Varrer todos", command=demanda_recursos.solicitar_varredura_completa).pack(anchor="e")
     recursos_listbox = _preparar_recursos_treeview(frame_bot)
     recursos_listbox.pack(fill="both", expand=True)
     _popular_recursos(procs) 
@@ -312,9 +742,11 @@ def dashboard_view(root, cpu, memoria, processos, get_directory_data_callback):
         widget.destroy()
 
     global uso_cpu_label, ociosidade_label, memoria_label, processos_listbox
+    global estados_cpu_label, nucleos_canvas, tendencia_cpu_canvas, tendencia_mem_canvas, agendamento_label
+    global discos_label, rede_label
 
     root.title("Dashboard do Sistema Operacional")
-    root.geometry("900x400")
+    root.geometry("900x600")
 
     # --- Frame de opções ------------------------------------------------------
     frame_opcoes = tk.LabelFrame(root, text="Opções", padx=10, pady=10)
@@ -328,10 +760,16 @@ def dashboard_view(root, cpu, memoria, processos, get_directory_data_callback):
 
     directoryButton = tk.Button(
         frame_opcoes, text="Diretório",
-        command=lambda: diretoryContentView(root, get_directory_data_callback("/"), get_directory_data_callback)  # Chama a função de callback para obter o conteúdo do diretório
+        command=lambda: diretoryContentView(root, get_directory_data_callback)  # o callback fornece os lotes de cada diretório
     )
     directoryButton.pack(side="left", padx=5, pady=5)
 
+    diagnosticoButton = tk.Button(frame_opcoes, text="Diagnóstico", command=lambda: diagnosticoView(root))
+    diagnosticoButton.pack(side="left", padx=5, pady=5)
+
+    agendamento_label = tk.Label(frame_opcoes, text="", anchor="e", justify="right", fg="#555555")
+    agendamento_label.pack(side="right", padx=5)
+
     # --- Frame CPU -----------------------------------------------------------
     frame_cpu = tk.LabelFrame(root, text="Uso da CPU", padx=10, pady=10)
     frame_cpu.pack(fill="x", padx=10, pady=5)
@@ -342,6 +780,15 @@ def dashboard_view(root, cpu, memoria, processos, get_directory_data_callback):
     ociosidade_label = tk.Label(frame_cpu, text="Tempo Ocioso: ")
     ociosidade_label.pack(anchor="w")
 
+    estados_cpu_label = tk.Label(frame_cpu, text="", anchor="w", justify="left")
+    estados_cpu_label.pack(anchor="w")
+
+    nucleos_canvas = tk.Canvas(frame_cpu, height=14, highlightthickness=0)
+    nucleos_canvas.pack(fill="x", pady=(4, 0))
+
+    tendencia_cpu_canvas = tk.Canvas(frame_cpu, height=30, highlightthickness=0, bg="#f8f8f8")
+    tendencia_cpu_canvas.pack(fill="x", pady=(4, 0))
+
     # --- Frame Memória -------------------------------------------------------
     frame_mem = tk.LabelFrame(root, text="Uso da Memória", padx=10, pady=10)
     frame_mem.pack(fill="x", padx=10, pady=5)
@@ -350,16 +797,158 @@ def dashboard_view(root, cpu, memoria, processos, get_directory_data_callback):
         frame_mem, text="Informações de Memória", anchor="w", justify="left"
     )
     memoria_label.pack(anchor="w")
+
+    tendencia_mem_canvas = tk.Canvas(frame_mem, height=30, highlightthickness=0, bg="#f8f8f8")
+    tendencia_mem_canvas.pack(fill="x", pady=(4, 0))
+
+    # --- Frames de E/S (discos e rede lado a lado) ---------------------------
+    frame_io = tk.Frame(root)
+    frame_io.pack(fill="x", padx=10, pady=5)
+
+    frame_discos = tk.LabelFrame(frame_io, text="Discos", padx=10, pady=10)
+    frame_discos.pack(side="left", fill="both", expand=True, padx=(0, 5))
+    discos_label = tk.Label(frame_discos, text="Calculando…", anchor="w", justify="left", font="TkFixedFont")
+    discos_label.pack(anchor="w")
+
+    frame_rede = tk.LabelFrame(frame_io, text="Rede", padx=10, pady=10)
+    frame_rede.pack(side="left", fill="both", expand=True, padx=(5, 0))
+    rede_label = tk.Label(frame_rede, text="Calculando…", anchor="w", justify="left", font="TkFixedFont")
+    rede_label.pack(anchor="w")
     
     # Garante que o ponteiro global aponta para None até a janela de processos abrir
     processos_listbox = None
 
     atualizar_interface(cpu, memoria, processos)
 
+# MARK: Janela de diagnóstico (tempos por etapa de coleta e renderização)
+def diagnosticoView(root):
+    global diagnostico_tree
+
+    janela = tk.Toplevel(root)
+    janela.title("Diagnóstico")
+    janela.geometry("760x420")
+
+    frame_botoes = tk.Frame(janela)
+    frame_botoes.pack(fill="x", padx=10, pady=5)
+
+    ativo = tk.BooleanVar(value=diagnosticoModel.ATIVO)
+    tk.Checkbutton(frame_botoes, text="Instrumentação ativa", variable=ativo,
+                   command=lambda: diagnosticoModel.ativar(ativo.get())).pack(side="left")
+    tk.Button(frame_botoes, text="Zerar", command=diagnosticoModel.zerar).pack(side="left", padx=5)
+    tk.Button(frame_botoes, text="Salvar JSON", command=lambda: _salvar_diagnostico(janela)).pack(side="left", padx=5)
+
+    colunas = ("Etapa", "Amostras", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Máx (ms)", "Total (ms)")
+    diagnostico_tree = ttk.Treeview(janela, columns=colunas, show="headings")
+    for coluna in colunas:
+        diagnostico_tree.heading(coluna, text=coluna)
+        diagnostico_tree.column(coluna, width=220 if coluna == "Etapa" else 80, anchor="w" if coluna == "Etapa" else "e")
+    diagnostico_tree.pack(fill="both", expand=True, padx=10, pady=5)
+
+    _popular_diagnostico()
+
+def _popular_diagnostico():
+    resumo = diagnosticoModel.resumo()
+    linhas = [
+        (f"etapa:{nome}", (nome, d["amostras"], f"{d['p50_ms']:.2f}", f"{d['p95_ms']:.2f}",
+                           f"{d['p99_ms']:.2f}", f"{d['max_ms']:.2f}", f"{d['total_ms']:.0f}"))
+        for nome, d in resumo["etapas"].items()
+    ]
+    linhas += [(f"contador:{nome}", (nome, valor, "", "", "", "", "")) for nome, valor in sorted(resumo["contadores"].items())]
+    _reconciliar_treeview(diagnostico_tree, linhas)
+
+def _salvar_diagnostico(janela):
+    from tkinter import filedialog
+    caminho = filedialog.asksaveasfilename(parent=janela, defaultextension=".json", initialfile="diagnostico.json")
+    if caminho:
+        diagnosticoModel.despejar(caminho)
+
+# MARK: Faixa de calor por núcleo
+def _cor_uso(uso):
+    """Verde (ocioso) -> amarelo -> vermelho (100%)."""
+    uso = max(0.0, min(100.0, float(uso)))
+    if uso < 50:
+        return f"#{int(255 * uso / 50):02x}c000"
+    return f"#ff{int(192 * (100 - uso) / 50):02x}00"
+
+def _desenhar_nucleos(nucleos):
+    """Desenha um retângulo por núcleo; os itens do Canvas são reaproveitados entre atualizações."""
+    itens = nucleos_canvas.find_withtag("nucleo")
+    n = len(nucleos)
+    if len(itens) != n:
+        nucleos_canvas.delete("nucleo")
+        itens = [nucleos_canvas.create_rectangle(0, 0, 0, 0, width=0, tags=("nucleo",)) for _ in range(n)]
+    passo = max(nucleos_canvas.winfo_width(), 1) / n # a largura só é conhecida depois do layout
+    for i, (item, uso) in enumerate(zip(itens, nucleos.values())):
+        nucleos_canvas.coords(item, i * passo, 0, (i + 1) * passo, 14)
+        nucleos_canvas.itemconfig(item, fill=_cor_uso(uso))
+
+# MARK: Gráfico de tendência (0-100%)
+def _desenhar_tendencia(canvas, valores, cor):
+    """Desenha a série como uma linha única; o item do Canvas é reaproveitado entre atualizações."""
+    largura = max(canvas.winfo_width(), 1)
+    altura = max(canvas.winfo_height(), 1)
+    if len(valores) < 2:
+        return
+    passo = largura / (len(valores) - 1)
+    coords = []
+    for i, v in enumerate(valores):
+        coords.append(i * passo)
+        coords.append(altura - 1 - (altura - 2) * max(0.0, min(100.0, v)) / 100)
+    linhas = canvas.find_withtag("tendencia")
+    if linhas:
+        canvas.coords(linhas[0], *coords)
+    else:
+        canvas.create_line(*coords, fill=cor, width=1, tags=("tendencia",))
+
 # MARK: Atualização da interface com dados mais recentes
-def atualizar_interface(cpu, memoria, processos):
+def _formatar_taxa(bytes_por_segundo):
+    for unidade in ("B/s", "KB/s", "MB/s", "GB/s"):
+        if bytes_por_segundo < 1024 or unidade == "GB/s":
+            return f"{bytes_por_segundo:.1f} {unidade}"
+        bytes_por_segundo /= 1024
+
+def _texto_discos(discos):
+    if not discos:
+        return "Calculando…"
+    # mais ativos primeiro; no empate (ociosos), discos reais antes de loop/ram
+    ativos = sorted(discos.items(), key=lambda d: (d[1]["leitura_bps"] + d[1]["escrita_bps"], d[1]["utilizacao"],
+                                                    not d[0].startswith(("loop", "ram", "zram"))), reverse=True)
+    linhas = [
+        f"{nome:<10} {t['iops']:>8.1f} IOPS  L {_formatar_taxa(t['leitura_bps']):>11}  "
+        f"E {_formatar_taxa(t['escrita_bps']):>11}  {t['utilizacao']:>5.1f}% ocupado"
+        for nome, t in ativos[:DISPOSITIVOS_NO_PAINEL]
+    ]
+    if len(ativos) > DISPOSITIVOS_NO_PAINEL:
+        linhas.append(f"… mais {len(ativos) - DISPOSITIVOS_NO_PAINEL} discos")
+    return "\n".join(linhas)
+
+def _texto_rede(rede):
+    if not rede:
+        return "Calculando…"
+    ativos = sorted(rede.items(), key=lambda i: i[1]["rx_bps"] + i[1]["tx_bps"], reverse=True)
+    # o total soma só as placas físicas: lo, veth e bridges repetem os mesmos bytes
+    somadas = [t for t in rede.values() if t.get("fisica")]
+    rotulo = "físicas"
+    if not somadas: # ex.: contêiner, onde até a eth0 é um veth
+        somadas = [t for nome, t in rede.items() if nome != "lo"]
+        rotulo = "sem lo"
+    total_rx = sum(t["rx_bps"] for t in somadas)
+    total_tx = sum(t["tx_bps"] for t in somadas)
+    linhas = [f"{'total':<10} ↓ {_formatar_taxa(total_rx):>11}  ↑ {_formatar_taxa(total_tx):>11}  "
+              f"({len(somadas)} de {len(rede)} interfaces, {rotulo})"]
+    linhas += [
+        f"{nome:<10} ↓ {_formatar_taxa(t['rx_bps']):>11}  ↑ {_formatar_taxa(t['tx_bps']):>11}  "
+        f"{t['rx_pps'] + t['tx_pps']:>8.1f} pct/s" + (f"  {t['descartes_ps']:.1f} desc/s" if t["descartes_ps"] else "")
+        for nome, t in ativos[:DISPOSITIVOS_NO_PAINEL]
+    ]
+    return "\n".join(linhas)
+
+def atualizar_interface(cpu, memoria, processos, recursos=None, io=None):
     """Atualiza labels & treeviews com os dados mais recentes."""
-    global uso_cpu_label, ociosidade_label, memoria_label, processos_listbox, recursos_listbox
+    global recursos_listbox
+
+    t_total = diagnosticoModel.inicio()
+    t0 = t_total
 
     # --- CPU -----------------------------------------------------------------
     if uso_cpu_label and ociosidade_label:
@@ -373,13 +962,38 @@ def atualizar_interface(cpu, memoria, processos):
             ociosidade_label.config(
                 text=(
                     f"Tempo Ocioso: {cpu.get('ocioso', 'N/A')}%     |   "
-                    f"Total de Threads: {cpu.get('total_threads', 'N/A')}"
+                    f"Total de Threads: {cpu.get('total_threads', 'N/A')}     |   "
+                    f"Executando: {cpu.get('executando', 'N/A')}  Bloqueados: {cpu.get('bloqueados', 'N/A')}     |   "
+                    f"Forks/s: {cpu.get('forks_por_s', 'N/A')}"
                 )
             )
         else:
             uso_cpu_label.config(text="Uso da CPU: Calculando…")
             ociosidade_label.config(text="Tempo Ocioso: Calculando…")
 
+    if estados_cpu_label and cpu.get("estados"):
+        estados = cpu["estados"]
+        estados_cpu_label.config(text="   ".join(
+            f"{nome}: {estados.get(nome, 0)}%"
+            for nome in ("user", "nice", "system", "iowait", "irq", "softirq", "steal")
+        ))
+
+    if agendamento_label and cpu.get("agendamento"):
+        agenda = cpu["agendamento"]
+        agendamento_label.config(text=(
+            "Intervalos: " + "  ".join(f"{_NOMES_COLETORES.get(nome, nome)} {c['intervalo_s']:g}s"
+                                       for nome, c in agenda["coletores"].items())
+            + f"\nCPU dos coletores: {agenda['participacao_total'] * 100:.1f}% (orçamento {agenda['orcamento'] * 100:g}%)"
+        ))
+
+    if nucleos_canvas and cpu.get("nucleos"):
+        _desenhar_nucleos(cpu["nucleos"])
+
+    if tendencia_cpu_canvas and cpu.get("tendencia_cpu"):
+        _desenhar_tendencia(tendencia_cpu_canvas, cpu["tendencia_cpu"], "#1f77b4")
+    if tendencia_mem_canvas and cpu.get("tendencia_mem"):
+        _desenhar_tendencia(tendencia_mem_canvas, cpu["tendencia_mem"], "#2ca02c")
+
     # --- Memória -------------------------------------------------------------
     if memoria_label:
         texto_mem = (
@@ -387,15 +1001,23 @@ def atualizar_interface(cpu, memoria, processos):
             if memoria else "Sem dados de memória ainda"
         )
         memoria_label.config(text=texto_mem)
+    diagnosticoModel.fim("interface.cpu_memoria", t0)
+
+    # --- Discos e rede -------------------------------------------------------
+    t0 = diagnosticoModel.inicio()
+    if discos_label and rede_label and io is not None:
+        discos_label.config(text=_texto_discos(io.get("discos")))
+        rede_label.config(text=_texto_rede(io.get("rede")))
+    diagnosticoModel.fim("interface.io", t0)
 
    # -------- Processos (Treeview Superior) ------
+    t0 = diagnosticoModel.inicio()
     if processos_listbox is not None and processos_listbox.winfo_exists():
-        processos_listbox.delete(*processos_listbox.get_children())
         if processos:
-            for pid, info in processos.items():
-                processos_listbox.insert(
-                    "", "end",
-                    values=(
+            linhas = [
+                (
+                    str(pid),
+                    (
                         pid,
                         info.get("usuario", "root"),
                         info.get("nome", "-"),
@@ -408,37 +1030,43 @@ def atualizar_interface(cpu, memoria, processos):
                         f"{info.get('mem_codigo_kb', 0)}kB",
                         info.get("total_pagina", "-"),
                     ),
-                    iid=str(pid)
                 )
+                for pid, info in processos.items()
+            ]
         else:
-            processos_listbox.insert("", "end", values=("Sem dados", *("" for _ in range(10))))
-        if processos_listbox.get_children() and not processos_listbox.selection():
-            processos_listbox.selection_set(processos_listbox.get_children()[0])
+            linhas = [("sem_dados", ("Sem dados", *("" for _ in range(10))))]
+        # só a janela visível é reconciliada (a maioria dos ticks de 1s não traz dados novos)
+        estatisticas_interface["operacoes_tk_processos"] = processos_listbox.definir_linhas(linhas)
+        if processos_listbox.tv.get_children() and not processos_listbox.selection():
+            processos_listbox.tv.selection_set(processos_listbox.tv.get_children()[0])
+        diagnosticoModel.contar("interface.operacoes_tk", estatisticas_interface["operacoes_tk_processos"])
+    diagnosticoModel.fim("interface.processos", t0)
             
     # -------- Recursos (Treeview Inferior) --------
+    t0 = diagnosticoModel.inicio()
     if recursos_listbox is not None and recursos_listbox.winfo_exists():
-        _popular_recursos(processos) 
+        _popular_recursos(processos, recursos) 
     else:
         recursos_listbox = None
+    diagnosticoModel.fim("interface.recursos", t0)
 
-# MARK: Atualiza a view de conteúdo do diretório
-def updateDirectoryContentView(content):
-    global content_listbox
-
-    # ❷ Evita atualização se a janela já foi fechada
-    if content_listbox is None or not content_listbox.winfo_exists():
-        content_listbox = None
-        return
+    # -------- Diagnóstico (se a janela estiver aberta) --------
+    if diagnostico_tree is not None and diagnostico_tree.winfo_exists():
+        _popular_diagnostico()
+    diagnosticoModel.fim("interface.total", t_total)
 
-    # Limpa linhas antigas
-    for item in content_listbox.get_children():
-        content_listbox.delete(item)
+# MARK: Atualiza a view de conteúdo do diretório
+def _limpar_conteudo_diretorio(tv):
+    if tv is not None and tv.winfo_exists():
+        tv.delete(*tv.get_children())
 
+def _inserir_lote_conteudo(tv, content):
+    """Acrescenta ao Treeview `tv` um lote de registros do diretório (ou a linha "Sem dados" se None/vazio)."""
     if content and isinstance(content, list):
         for info in content:
           if isinstance(info, dict):
-            content_listbox.insert(
-                "", "end",
+            tv.insert(
+                "", "end", iid=info.get("Caminho"), # iid = caminho: o uso de disco atualiza a linha pelo caminho
                 values=(
                     info.get("Nome", "Desconhecido"),
                     info.get("Caminho", "/"),
@@ -447,39 +1075,49 @@ def updateDirectoryContentView(content):
                     info.get("Data de Modificação", "N/A"),
                     info.get("Tipo", "N/A"),
                     info.get("Tamanho (Bytes)", "0"),
+                    info.get("Dono", "N/A"),
                 ),
             )
-        else:
-            content_listbox.insert(
-                "", "end", values=("Sem dados", *("" for _ in range(6)))
-            )
     else:
-        content_listbox.insert(
-            "", "end", values=("Sem dados", *("" for _ in range(6)))
+        tv.insert(
+            "", "end", values=("Sem dados", *("" for _ in range(7)))
         )
-        # --- [EXTRA] Adiciona informações do getFileSystem como linhas extras ---
-    try:
-        partitions = getFileSystem()
 
-        for idx in range(0, len(partitions), 2):
-            parte1 = partitions[idx]
-            parte2 = partitions[idx + 1] if idx + 1 < len(partitions) else {}
+def _inserir_particoes(tv):
+        # --- [EXTRA] Adiciona as montagens como linhas extras ---
+    try:
+        for montagem in tabela_montagens.montagens(): # sem esperar statvfs (montagens mortas)
+            uso = montagem["Uso"] or {}
 
-            content_listbox.insert(
+            tv.insert(
                 "", "end",
                 values=(
-                    f"[DISCO] {parte1.get('Dispositivo de Bloco', '-')}",
-                    parte1.get("Diretorio", "-"),
-                    parte1.get("Opçoes de Montagem", "-"),
+                    f"[DISCO] {montagem['Dispositivo de Bloco']}",
+                    montagem["Diretorio"],
+                    montagem["Opçoes de Montagem"],
                     "-", "-",  # Criação, Modificação
                     "Partição",
-                    f"{parte2.get('Percentual de Uso (%)', '-')}",
+                    f"{uso.get('Percentual de Uso (%)', '-')}" if montagem["Estado"] == "ok" else montagem["Estado"],
+                    "-",
                 ),
                 tags=("disco",)
             )
 
-        content_listbox.tag_configure("disco", background="#f0f8ff", foreground="#00008b")
+        tv.tag_configure("disco", background="#f0f8ff", foreground="#00008b")
 
     except Exception as e:
         print("Erro ao adicionar partições na content_listbox:", e)
 
+def updateDirectoryContentView(content):
+    """Substitui o conteúdo de uma vez (lista já pronta); a janela de diretório usa o CarregadorDiretorio."""
+    global content_listbox
+
+    # ❷ Evita atualização se a janela já foi fechada
+    if content_listbox is None or not content_listbox.winfo_exists():
+        content_listbox = None
+        return
+
+    _limpar_conteudo_diretorio(content_listbox)
+    _inserir_lote_conteudo(content_listbox, content)
+    _inserir_particoes(content_listbox)
+